@@ -1,6 +1,11 @@
 import tkinter as tk
 import os
 from functions.data_manager import DataManager
+from functions.enrichment_cache import EnrichmentCache
+from functions.event_bus import EventBus
+from functions.http_pool import HTTPPool
+from functions.request_scheduler import RequestScheduler
+from functions.task_executor import TaskExecutor
 from modules.timer import TimerModule
 from modules.editor import EditorModule
 from modules.osint import OSINTModule
@@ -14,6 +19,7 @@ from modules.root_cause import RootCauseModule
 from modules.app_title import AppTitleModule
 from modules.footer import FooterModule
 from modules.time_updater import TimeUpdater
+from modules.autosave import AutosaveManager
 from menu.menu_manager import MenuManager
 
 
@@ -27,8 +33,19 @@ class AutomaTEAApp(tk.Tk):
 
         self.title("AutomaTEA Ticket Software")
         self.minsize(1280, 720)
-        self.data_manager = DataManager()
+        # E/S en segundo plano; los resultados vuelven al hilo de Tk por una única bomba after()
+        self.executor = TaskExecutor()
+        self.executor.attach(self)
+        # Los eventos de DataManager (publicados desde los workers) se entregan en el hilo de Tk
+        self.events = EventBus(dispatch=self.executor.call_in_ui)
+        self.data_manager = DataManager(events=self.events)
+        self.data_manager.migrate_ticket_content()  # Solo actúa la primera vez
+        # Caché persistente de consultas OSINT, compartida entre sesiones
+        self.enrichment_cache = EnrichmentCache(os.path.join(self.data_manager.data_folder, "osint_cache.db"))
+        self.http_pool = HTTPPool()
+        self.osint_scheduler = RequestScheduler()  # Cuotas por proveedor configuradas en osint.json
         self.time_updater = None
+        self.autosave = None
 
         try:
             self.create_main_layout()
@@ -40,6 +57,8 @@ class AutomaTEAApp(tk.Tk):
 
         if self.time_updater:
             self.time_updater.update_time()
+        if self.autosave:
+            self.autosave.start()  # Ofrece recuperar la sesión anterior si no cerró bien
 
         self.deiconify()  # Mostrar la ventana después de configurarla
 
@@ -66,10 +85,12 @@ class AutomaTEAApp(tk.Tk):
         timer_mod = TimerModule(self, row_start=1, col_start=0, col_span=1, row_span=6)
         timer_mod.build()
 
-        history = HistoryModule(self, row_start=17, col_start=2, col_span=12, row_span=1, data_manager=self.data_manager)
+        history = HistoryModule(self, row_start=17, col_start=2, col_span=12, row_span=1,
+                                data_manager=self.data_manager, executor=self.executor)
         history.build()
 
-        NotesModule(self, row_start=17, col_start=0, col_span=1, row_span=1, data_manager=self.data_manager).build()
+        NotesModule(self, row_start=17, col_start=0, col_span=1, row_span=1,
+                    data_manager=self.data_manager, executor=self.executor).build()
 
         editor = EditorModule(
             self,
@@ -78,8 +99,8 @@ class AutomaTEAApp(tk.Tk):
             col_span=12,
             row_span=15,
             data_manager=self.data_manager,
-            history_module=history,
             timer_module=timer_mod,
+            executor=self.executor,
         )
         editor.build()
 
@@ -87,20 +108,36 @@ class AutomaTEAApp(tk.Tk):
                     editor_module=editor, data_manager=self.data_manager, timer_module=timer_mod).build()
 
         QueriesModule(self, row_start=10, col_start=0, col_span=1, row_span=5,
-                      data_manager=self.data_manager).build()
+                      data_manager=self.data_manager, executor=self.executor).build()
 
-        OSINTModule(self, row_start=8, col_start=16, col_span=4, row_span=4, json_path="data/osint.json").build()
+        OSINTModule(self, row_start=8, col_start=16, col_span=4, row_span=4, json_path="data/osint.json",
+                    editor_module=editor, executor=self.executor, cache=self.enrichment_cache,
+                    http_pool=self.http_pool, scheduler=self.osint_scheduler,
+                    ip_ranges_path=os.path.join(self.data_manager.data_folder, "ip_ranges.bin")).build()
 
         ExtractFieldsModule(self, row_start=14, col_start=16, col_span=4, row_span=3, editor_module=editor).build()
 
         RootCauseModule(self, row_start=17, col_start=16, col_span=4, row_span=1,
                         editor_module=editor, json_path="data/template_5w.json").build()
 
-        FooterModule(self, row_start=20, col_start=0, col_span=20).build()
+        FooterModule(self, row_start=20, col_start=0, col_span=20, executor=self.executor).build()
 
         self.time_updater = TimeUpdater(self, row_start=19, col_start=0, col_span=20)
         self.time_updater.build()
 
+        # Journal de recuperación del editor y del timer ante cierres inesperados
+        self.autosave = AutosaveManager(self, editor_module=editor, timer_module=timer_mod, executor=self.executor)
+
+    def destroy(self):
+        self.executor.shutdown()  # Espera a que terminen los guardados pendientes
+        if self.autosave:
+            self.autosave.close()  # Cierre limpio: no hay nada que recuperar
+        self.enrichment_cache.close()
+        self.osint_scheduler.close()
+        self.http_pool.close()
+        self.data_manager.close()  # Compacta el journal de tickets antes de salir
+        super().destroy()
+
     def create_menu(self):
         self.menu_manager = MenuManager(self)
         self.menu_manager.create_menu()
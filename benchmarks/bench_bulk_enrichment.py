@@ -0,0 +1,66 @@
+"""Bulk enrichment: one lookup at a time vs. concurrent asyncio fan-out.
+
+Starts the local OSINT stub (``osint_stub_server.py``) with a fixed latency
+per request and enriches a ticket's worth of IPs against three stub
+providers, first sequentially (like repeated "ISP Info" clicks) and then
+with ``BulkEnricher`` wired as in the app: a ``RequestScheduler`` with the
+default workers and a shared ``HTTPPool``.
+
+Usage: python benchmarks/bench_bulk_enrichment.py [indicators] [delay_seconds]
+"""
+import os
+import sys
+import time
+import urllib.request
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.osint_stub_server import start_stub_server  # noqa: E402
+from functions.bulk_enrichment import BulkEnricher, plan_lookups  # noqa: E402
+from functions.http_pool import HTTPPool  # noqa: E402
+from functions.osint_parsers import parser_for  # noqa: E402
+from functions.osint_urls import build_url  # noqa: E402
+from functions.request_scheduler import RequestScheduler  # noqa: E402
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+    delay = float(sys.argv[2]) if len(sys.argv) > 2 else 0.2
+    server, base_url = start_stub_server(delay=delay)
+    tools = [
+        {"name": "StubAbuse", "generate_url": f"{base_url}/check/", "kinds": ["ip"], "parser": "abuseipdb"},
+        {"name": "StubReport", "generate_url": f"{base_url}/report/", "kinds": ["ip"], "concurrency": 8},
+        {"name": "StubSlow", "generate_url": f"{base_url}/other/", "kinds": ["ip"], "concurrency": 2},
+    ]
+    indicators = [("ipv4", f"198.51.100.{i}") for i in range(count)]
+    lookups = plan_lookups(indicators, tools)
+    print(f"{len(lookups)} lookups ({count} IPs x {len(tools)} providers), {delay * 1000:.0f} ms per request")
+
+    start = time.perf_counter()
+    for tool, kind, indicator in lookups:
+        with urllib.request.urlopen(build_url(tool, indicator, kind)) as response:
+            parser_for(tool)(response.read().decode("utf-8"))
+    sequential = time.perf_counter() - start
+    print(f"{'sequential':<12} {sequential:>8.2f} s")
+
+    first = []
+    scheduler = RequestScheduler()
+    scheduler.configure(tools)
+    pool = HTTPPool()
+    enricher = BulkEnricher(
+        on_result=lambda result: first or first.append(time.perf_counter()), scheduler=scheduler, http_pool=pool
+    )
+    start = time.perf_counter()
+    results = enricher.run(lookups)
+    concurrent = time.perf_counter() - start
+    ok = sum(result["status"] == "ok" for result in results)
+    print(f"{'scheduled':<12} {concurrent:>8.2f} s  ({ok}/{len(results)} ok, first result after "
+          f"{(first[0] - start) * 1000:.0f} ms, {sequential / concurrent:.1f}x faster, "
+          f"{scheduler.workers} workers, {pool.stats['connections']} connections)")
+    scheduler.close()
+    pool.close()
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
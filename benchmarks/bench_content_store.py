@@ -0,0 +1,92 @@
+"""Ticket body storage: raw vs. zlib vs. zlib/zstd with a trained dictionary.
+
+Generates tickets that follow the app's template (TICKET DETAILS header,
+INVESTIGATION DETAILS section, a few log lines), stores them with each codec
+and reports the on-disk size and the per-ticket read (decompression) latency.
+
+Usage: python benchmarks/bench_content_store.py [tickets]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from functions import content_store  # noqa: E402
+from functions.content_store import CODEC_ZLIB, CODEC_ZSTD, ContentStore, train_dictionary  # noqa: E402
+
+TEMPLATE_HEADER = """######## TICKET DETAILS ########
+Ticket Number: {number}
+Account: {client}
+Short Description: {description}
+TUC: {tuc}
+Severity: {severity}
+Assigned To: analyst{analyst}
+######## INVESTIGATION DETAILS ########
+
+Time/Timezone: 2025-01-{day:02d} {hour:02d}:{minute:02d} UTC-3
+"""
+
+DESCRIPTIONS = ("Suspicious login from new country", "Phishing email reported", "Malware detected on endpoint",
+                "Brute force against VPN", "Outbound traffic to known C2")
+ACTIONS = ("Blocked IP at perimeter firewall", "Alerted client SOC by email", "Isolated host through EDR",
+           "Reset user credentials", "Escalated to tier 2", "Closed as false positive after review")
+
+
+def make_ticket(i, rng):
+    body = TEMPLATE_HEADER.format(
+        number=f"INC{i:07d}", client=f"Client {i % 40}", description=rng.choice(DESCRIPTIONS),
+        tuc=f"TUC-{i % 25:03d}", severity=1 + i % 4, analyst=i % 12,
+        day=1 + i % 28, hour=i % 24, minute=i % 60,
+    )
+    lines = [
+        f"src_ip=10.{rng.randrange(256)}.{rng.randrange(256)}.{rng.randrange(256)} "
+        f"dst=203.0.113.{rng.randrange(256)} user=user{rng.randrange(500)}@corp.example.com action=deny"
+        for _ in range(rng.randrange(3, 15))
+    ]
+    actions = "\n".join(f"{n}. {action}" for n, action in enumerate(rng.sample(ACTIONS, 3), start=1))
+    return body + "\nEvidence:\n" + "\n".join(lines) + "\n\n## Actions Taken\n" + actions + "\n"
+
+
+def measure(name, texts, dictionary=None, codec=CODEC_ZLIB, disable_compression=False):
+    with tempfile.TemporaryDirectory() as directory:
+        store = ContentStore(os.path.join(directory, "content.blob"))
+        if dictionary:
+            store.add_dictionary(codec, dictionary)
+        elif codec == CODEC_ZSTD:
+            store.codec = CODEC_ZSTD
+        if disable_compression:
+            store._compress = lambda data: (0, data)
+        refs = [store.put(text, sync=False) for text in texts]
+        size = store.size()
+        start = time.perf_counter()
+        for ref in refs:
+            store.get(ref)
+        read_us = (time.perf_counter() - start) / len(refs) * 1_000_000
+        store.close()
+    raw = sum(len(text.encode("utf-8")) for text in texts)
+    print(f"{name:<22} {size / 1024:>10.1f} {raw / size:>7.2f} {read_us:>9.1f}")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    rng = random.Random(0)
+    texts = [make_ticket(i, rng) for i in range(count)]
+    samples = texts[::max(1, count // 2000)]
+
+    print(f"{count} tickets, {sum(len(t) for t in texts) / 1_000_000:.1f} MB of text")
+    print(f"{'codec':<22} {'disk KB':>10} {'ratio':>7} {'read us':>9}")
+    measure("raw", texts, disable_compression=True)
+    measure("zlib", texts)
+    measure("zlib + dictionary", texts, train_dictionary(samples, codec=CODEC_ZLIB)[1])
+    if content_store.zstandard:
+        measure("zstd", texts, codec=CODEC_ZSTD)
+        measure("zstd + dictionary", texts, train_dictionary(samples, codec=CODEC_ZSTD)[1], codec=CODEC_ZSTD)
+    else:
+        print("zstd: not installed (pip install zstandard)")
+
+
+if __name__ == "__main__":
+    main()
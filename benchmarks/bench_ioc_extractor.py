@@ -0,0 +1,109 @@
+"""IOC extraction throughput on pasted log dumps of 1, 5 and 20 MB.
+
+Compares the single-pass engine against running one regex per indicator kind.
+
+Usage: python benchmarks/bench_ioc_extractor.py
+"""
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from functions.ioc_extractor import extract_iocs, parse_fields  # noqa: E402
+
+SIZES_MB = (1, 5, 20)
+
+# Campos que deben seguir reconociéndose como con los regex anteriores del editor
+FIELD_CASES = (
+    ("Ticket Number: 123\nAccount: ACME\n", {"Ticket Number": ["123"], "Account": ["ACME"]}),
+    ("Ticket Number:123\nAccount:ACME\n", {"Ticket Number": ["123"], "Account": ["ACME"]}),
+    ("  # Status :\tOpen  \nEmpty:\n", {"Status": ["Open"]}),
+)
+
+# Un regex por tipo, como haría una extracción ingenua (una pasada por tipo)
+NAIVE_PATTERNS = [
+    re.compile(pattern, re.IGNORECASE)
+    for pattern in (
+        r"h(?:tt|xx)ps?://\S+",
+        r"\b[\w.%+-]+(?:@|\[at\])[\w.-]+\.[a-z]{2,}\b",
+        r"\b\d{1,3}(?:(?:\.|\[\.\])\d{1,3}){3}(?:/\d{1,2})?\b",
+        r"\b[a-f0-9]{64}\b",
+        r"\b[a-f0-9]{40}\b",
+        r"\b[a-f0-9]{32}\b",
+        r"\bCVE-\d{4}-\d{4,7}\b",
+        r"\b(?:[a-f0-9]{1,4}:){2,7}[a-f0-9]{1,4}\b",
+        r"\b[a-z]:\\[^\s]+",
+        r"\b(?:[a-z0-9-]+(?:\.|\[\.\]))+[a-z]{2,24}\b",
+    )
+]
+
+
+def make_log(size_mb, seed=0):
+    rng = random.Random(seed)
+    users = [f"user{i}" for i in range(200)]
+    lines = []
+    total = 0
+    i = 0
+    while total < size_mb * 1_000_000:
+        kind = i % 5
+        if kind == 0:
+            line = (
+                f"2025-01-15T10:{i % 60:02d}:{i % 60:02d}Z fw01 DENY tcp src=10.{i % 256}.{(i * 7) % 256}.{i % 250} "
+                f"dst=203.0.113.{i % 250}:443 rule=outbound-block"
+            )
+        elif kind == 1:
+            line = (
+                f"2025-01-15T10:{i % 60:02d}:00Z proxy GET hxxps://cdn{i % 400}[.]bad-domain[.]com/p/{i}.php "
+                f"user={rng.choice(users)}@corp.example.com status=403"
+            )
+        elif kind == 2:
+            line = (
+                f"2025-01-15T10:{i % 60:02d}:00Z edr process=C:\\Users\\{rng.choice(users)}\\AppData\\Local\\Temp\\x{i}.exe "
+                f"sha256={rng.getrandbits(256):064x} md5={rng.getrandbits(128):032x}"
+            )
+        elif kind == 3:
+            line = f"2025-01-15T10:{i % 60:02d}:00Z ids alert {'CVE-2021-44228' if i % 7 else 'CVE-2023-4966'} from 2001:db8::{i % 9999:x}"
+        else:
+            line = f"2025-01-15T10:{i % 60:02d}:00Z sshd[{i}]: Failed password for invalid user {rng.choice(users)} port {1024 + i % 60000} ssh2"
+        lines.append(line)
+        total += len(line) + 1
+        i += 1
+    return "\n".join(lines)
+
+
+def naive_extract(text):
+    return [set(pattern.findall(text)) for pattern in NAIVE_PATTERNS]
+
+
+def timed(func, text):
+    start = time.perf_counter()
+    result = func(text)
+    return time.perf_counter() - start, result
+
+
+def check_fields():
+    for text, expected in FIELD_CASES:
+        fields = parse_fields(text)
+        assert fields == expected, f"parse_fields({text!r}) = {fields}, expected {expected}"
+
+
+def main():
+    check_fields()
+    print(f"{'size MB':>8} {'engine s':>9} {'MB/s':>7} {'naive s':>9} {'MB/s':>7} {'unique IOCs':>12}")
+    for size in SIZES_MB:
+        text = make_log(size)
+        megabytes = len(text) / 1_000_000
+        engine_time, found = timed(extract_iocs, text)
+        naive_time, _ = timed(naive_extract, text)
+        unique = sum(len(values) for values in found.values())
+        print(
+            f"{megabytes:>8.1f} {engine_time:>9.2f} {megabytes / engine_time:>7.1f} "
+            f"{naive_time:>9.2f} {megabytes / naive_time:>7.1f} {unique:>12}"
+        )
+
+
+if __name__ == "__main__":
+    main()
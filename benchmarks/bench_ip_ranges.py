@@ -0,0 +1,83 @@
+"""Offline IP range database: import, file size and lookup speed.
+
+Writes a synthetic ip2asn-style CSV (consecutive IPv4 ranges of random
+sizes plus some IPv6 prefixes), imports it with ``import_csv`` and times
+single ``lookup`` calls against one ``lookup_many`` batch over the
+memory-mapped file. Compare with an "ISP Info" click, which costs a
+network round trip per IP.
+
+Usage: python benchmarks/bench_ip_ranges.py [ranges] [batch_size]
+"""
+import ipaddress
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from functions import ip_ranges  # noqa: E402
+from functions.ip_ranges import IPRangeDB, import_csv  # noqa: E402
+
+
+def write_csv(path, count, rng):
+    with open(path, "w", encoding="utf-8") as file:
+        file.write("start_ip,end_ip,asn,country,org\n")
+        start = int(ipaddress.IPv4Address("1.0.0.0"))
+        for i in range(count):
+            size = rng.choice((256, 512, 1024, 4096))
+            asn = rng.randint(1, count // 4)
+            file.write(f"{ipaddress.IPv4Address(start)},{ipaddress.IPv4Address(start + size - 1)},{asn},US,Org {asn}\n")
+            start += size + rng.choice((0, 0, 0, 256))  # Algunos huecos sin asignar
+        for i in range(count // 20):
+            file.write(f"2001:db8:{i:x}::,2001:db8:{i:x}:ffff:ffff:ffff:ffff:ffff,{64512 + i % 1000},DE,V6 Org\n")
+        return start
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500000
+    batch = int(sys.argv[2]) if len(sys.argv) > 2 else 100000
+    rng = random.Random(25)
+    folder = tempfile.mkdtemp()
+    csv_path = os.path.join(folder, "ranges.csv")
+    db_path = os.path.join(folder, "ip_ranges.bin")
+    last = write_csv(csv_path, count, rng)
+
+    summary = import_csv(csv_path, db_path)
+    print(f"import: {summary['rows']} rows -> {summary['ipv4_ranges']} IPv4 / {summary['ipv6_ranges']} IPv6 ranges, "
+          f"{summary['records']} records in {summary['seconds']:.1f} s; "
+          f"CSV {os.path.getsize(csv_path) / 1e6:.1f} MB -> file {summary['bytes'] / 1e6:.1f} MB")
+
+    first = int(ipaddress.IPv4Address("1.0.0.0"))
+    ips = [str(ipaddress.IPv4Address(rng.randint(first, last))) for i in range(batch)]
+
+    start = time.perf_counter()
+    db = IPRangeDB(db_path)
+    print(f"open:   {(time.perf_counter() - start) * 1e6:.0f} us (memory-mapped, nothing loaded)")
+
+    # Direcciones al azar (casi ninguna comparte rango) y agrupadas en pocas redes, como en un ticket
+    clustered = [ip.rsplit(".", 1)[0] + f".{rng.randint(0, 255)}" for ip in ips[:500] for i in range(batch // 500)]
+    engine = "numpy" if ip_ranges.numpy is not None else "bisect"
+    for name, batch_ips in (("random", ips), ("clustered", clustered)):
+        start = time.perf_counter()
+        singles = [db.lookup(ip) for ip in batch_ips]
+        single = time.perf_counter() - start
+        start = time.perf_counter()
+        many = db.lookup_many(batch_ips)
+        batched = time.perf_counter() - start
+        assert all(many[ip] == result for ip, result in zip(batch_ips, singles))
+        found = sum(result is not None for result in singles)
+        print(f"{name:<10} lookup {single / len(batch_ips) * 1e6:5.1f} us/IP, lookup_many "
+              f"{batched / len(batch_ips) * 1e6:5.1f} us/IP ({engine}, {single / batched:.1f}x), "
+              f"{found}/{len(batch_ips)} found")
+    v6 = "2001:db8:3::1"
+    start = time.perf_counter()
+    for i in range(10000):
+        db.lookup(v6)
+    print(f"IPv6 lookup: {(time.perf_counter() - start) / 10000 * 1e6:6.1f} us per IP")
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+""""ISP Info" lookup: curl subprocess + six regex passes vs. pooled streaming client.
+
+Runs the local OSINT stub (``osint_stub_server.py``) in a separate process
+so its CPU is not counted, then performs the same AbuseIPDB-style lookups
+through the old path (one ``curl`` process per lookup, whole page decoded,
+one ``re.search`` per field) and through ``HTTPPool`` + ``AbuseIPDBParser``
+(keep-alive, gzip, reading stops once the info table is parsed). Reports
+wall-clock latency and CPU time (this process plus its children) per lookup.
+
+Usage: python benchmarks/bench_isp_lookup.py [lookups]
+"""
+import os
+import re
+import resource
+import shutil
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from functions.http_pool import HTTPPool  # noqa: E402
+from functions.osint_parsers import AbuseIPDBParser  # noqa: E402
+
+PORT = 8766
+STUB = os.path.join(os.path.dirname(os.path.abspath(__file__)), "osint_stub_server.py")
+
+
+def parse_six_passes(html):
+    # Parser anterior: una búsqueda completa sobre la página por cada campo
+    patterns = {
+        "ISP": r"<th>ISP<\/th>\s*<td>\s*(.*?)\s*<\/td>",
+        "Usage Type": r"<th>Usage Type<\/th>\s*<td>\s*(.*?)\s*<\/td>",
+        "ASN": r"<th>ASN<\/th>\s*<td>\s*(.*?)\s*<\/td>",
+        "Domain Name": r"<th>Domain Name<\/th>\s*<td>\s*(.*?)\s*<\/td>",
+        "Country": r"<th>Country<\/th>\s*<td>\s*(.*?)\s*<\/td>",
+        "City": r"<th>City<\/th>\s*<td>\s*(.*?)\s*<\/td>",
+    }
+    parsed = {}
+    for key, pattern in patterns.items():
+        match = re.search(pattern, html, re.IGNORECASE | re.DOTALL)
+        parsed[key] = match.group(1).strip() if match else "N/A"
+    return parsed
+
+
+def lookup_curl(url):
+    output = subprocess.check_output(["curl", "-s", url], stderr=subprocess.STDOUT).decode("utf-8")
+    return parse_six_passes(output)
+
+
+def lookup_pool(pool, url):
+    parser = AbuseIPDBParser()
+    pool.fetch_text(url, feed=parser.feed)
+    return parser.result()
+
+
+def cpu_seconds():
+    own = resource.getrusage(resource.RUSAGE_SELF)
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return own.ru_utime + own.ru_stime + children.ru_utime + children.ru_stime
+
+
+def measure(name, lookup, urls):
+    latencies = []
+    cpu_start = cpu_seconds()
+    for url in urls:
+        start = time.perf_counter()
+        result = lookup(url)
+        latencies.append(time.perf_counter() - start)
+        assert result and result["ISP"] != "N/A", result
+    cpu = cpu_seconds() - cpu_start
+    latencies.sort()
+    print(
+        f"{name:<18} {statistics.mean(latencies) * 1000:>8.2f} {latencies[len(latencies) // 2] * 1000:>8.2f} "
+        f"{latencies[int(len(latencies) * 0.95)] * 1000:>8.2f} {cpu / len(urls) * 1000:>9.2f}"
+    )
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    stub = subprocess.Popen([sys.executable, STUB, "--port", str(PORT), "--delay", "0"], stdout=subprocess.DEVNULL)
+    base_url = f"http://127.0.0.1:{PORT}/check/"
+    try:
+        for _ in range(50):
+            try:
+                urllib.request.urlopen(base_url + "127.0.0.1").read()
+                break
+            except OSError:
+                time.sleep(0.1)
+        urls = [f"{base_url}203.0.113.{i % 256}" for i in range(count)]
+        print(f"{count} lookups against a local stub (no added latency)")
+        print(f"{'path':<18} {'avg ms':>8} {'p50 ms':>8} {'p95 ms':>8} {'cpu ms':>9}")
+        if shutil.which("curl"):
+            measure("curl + 6 regexes", lookup_curl, urls)
+        else:
+            print("curl: not installed")
+        pool = HTTPPool()
+        measure("pooled stream", lambda url: lookup_pool(pool, url), urls)
+        print(f"pool: {pool.stats}")
+        pool.close()
+    finally:
+        stub.terminate()
+        stub.wait()
+
+
+if __name__ == "__main__":
+    main()
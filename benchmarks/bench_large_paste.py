@@ -0,0 +1,75 @@
+"""Paste latency of the ticket editor for 1, 10 and 50 MB logs.
+
+For each size it reports:
+  - direct: a single Text.insert plus layout, which blocks the UI for its whole duration;
+  - chunked: ChunkedPaste, total time and longest slice (the worst UI stall);
+  - attachment: hashing and writing the payload to the attachment store
+    (runs on a worker thread in the app; the UI only inserts a placeholder).
+
+Needs a display (Tk). Usage: python benchmarks/bench_large_paste.py
+"""
+import os
+import sys
+import tempfile
+import time
+import tkinter as tk
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_ioc_extractor import make_log  # noqa: E402
+from functions.attachments import AttachmentStore  # noqa: E402
+from modules.large_paste import ChunkedPaste  # noqa: E402
+
+SIZES_MB = (1, 10, 50)
+
+
+def new_text(root):
+    text = tk.Text(root, wrap="word", undo=True, maxundo=100)
+    text.pack()
+    root.update()
+    return text
+
+
+def direct_paste(root, payload):
+    text = new_text(root)
+    start = time.perf_counter()
+    text.insert("insert", payload)
+    text.update_idletasks()
+    elapsed = time.perf_counter() - start
+    text.destroy()
+    return elapsed
+
+
+def chunked_paste(root, payload):
+    text = new_text(root)
+    result = {}
+    paste = ChunkedPaste(text, payload, on_done=lambda elapsed, max_slice: result.update(elapsed=elapsed, max_slice=max_slice))
+    paste.start()
+    while not result:
+        root.update()
+    text.destroy()
+    return result["elapsed"], result["max_slice"]
+
+
+def attachment_paste(payload):
+    with tempfile.TemporaryDirectory() as directory:
+        start = time.perf_counter()
+        AttachmentStore(directory).save(payload)
+        return time.perf_counter() - start
+
+
+def main():
+    root = tk.Tk()
+    print(f"{'size MB':>8} {'direct s':>9} {'chunked s':>10} {'max slice ms':>13} {'attach s':>9}")
+    for size in SIZES_MB:
+        payload = make_log(size)
+        megabytes = len(payload) / 1_000_000
+        direct = direct_paste(root, payload)
+        chunked, max_slice = chunked_paste(root, payload)
+        attached = attachment_paste(payload)
+        print(f"{megabytes:>8.1f} {direct:>9.2f} {chunked:>10.2f} {max_slice * 1000:>13.1f} {attached:>9.2f}")
+    root.destroy()
+
+
+if __name__ == "__main__":
+    main()
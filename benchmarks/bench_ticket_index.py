@@ -0,0 +1,64 @@
+"""Ticket primary-key index vs. linear scan, from 1k to 1M tickets.
+
+Random lookups get slower as the index grows even though each one is a
+single hash probe: at 1M tickets the table, the key tuples and their
+strings are far larger than the CPU caches, so most probes miss. The
+"dict ns" column (a bare ``dict.get`` with the same keys) and the "hot ns"
+column (the same key over and over, always cached) separate that memory
+cost from the index's own overhead, which stays flat.
+
+Usage: python benchmarks/bench_ticket_index.py
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from functions.ticket_index import TicketIndex  # noqa: E402
+
+SIZES = (1_000, 10_000, 100_000, 1_000_000)
+OPERATIONS = 20_000
+
+
+def make_tickets(count):
+    return [
+        {"ticket_number": f"INC{i:07d}", "client": f"Client {i % 50}", "short_description": "bench"}
+        for i in range(count)
+    ]
+
+
+def per_op_ns(func, keys):
+    start = time.perf_counter_ns()
+    for key in keys:
+        func(key)
+    return (time.perf_counter_ns() - start) / len(keys)
+
+
+def linear_find(tickets, key):
+    return next((t for t in tickets if (t["ticket_number"], t["client"]) == key), None)
+
+
+def main():
+    print(f"{'tickets':>10} {'lookup ns':>10} {'dict ns':>10} {'hot ns':>10} {'upsert ns':>10} {'delete ns':>10} "
+          f"{'scan us':>12}")
+    for size in SIZES:
+        tickets = make_tickets(size)
+        index = TicketIndex()
+        index.rebuild(tickets)
+        sample = random.sample(tickets, min(OPERATIONS, size))
+        keys = [(t["ticket_number"], t["client"]) for t in sample]
+
+        lookup = per_op_ns(index.get, keys)
+        bare = per_op_ns(index.entries.get, keys)
+        hot = per_op_ns(index.get, keys[:1] * len(keys))
+        upsert = per_op_ns(lambda key: index.upsert({"ticket_number": key[0], "client": key[1]}), keys)
+        delete = per_op_ns(index.delete, keys)
+        scan = per_op_ns(lambda key: linear_find(tickets, key), keys[:20]) / 1000
+
+        print(f"{size:>10} {lookup:>10.0f} {bare:>10.0f} {hot:>10.0f} {upsert:>10.0f} {delete:>10.0f} {scan:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
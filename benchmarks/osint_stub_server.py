@@ -0,0 +1,127 @@
+"""Local stand-in for the OSINT providers, for benchmarks and manual testing.
+
+Serves AbuseIPDB-like check pages under ``/check/<ip>`` (with the same
+``<th>ISP</th><td>...</td>`` table the parser reads) and a generic page with
+a ``<title>`` for any other path. ``--delay`` adds latency per request,
+``--fail-rate`` answers that fraction of requests with 503 and
+``/slow/...`` paths never answer within a normal timeout. Connections are
+kept alive (HTTP/1.1) and bodies are gzipped when the client accepts it.
+
+Point osint.json at it to try bulk enrichment offline, e.g.
+``{"name": "Stub", "generate_url": "http://127.0.0.1:8765/check/", "kinds": ["ip"], "parser": "abuseipdb"}``.
+
+Usage: python benchmarks/osint_stub_server.py [--port 8765] [--delay 0.2] [--fail-rate 0]
+"""
+import argparse
+import gzip
+import hashlib
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ABUSEIPDB_PAGE = """<!DOCTYPE html>
+<html><head><title>{ip} | AbuseIPDB</title></head><body>
+<h1>{ip} was found in our database!</h1>
+<table class="table">
+<tr><th>ISP</th><td>
+    {isp}
+</td></tr>
+<tr><th>Usage Type</th><td>{usage}</td></tr>
+<tr><th>ASN</th><td>AS{asn}</td></tr>
+<tr><th>Domain Name</th><td>{domain}</td></tr>
+<tr><th>Country</th><td>{country}</td></tr>
+<tr><th>City</th><td>{city}</td></tr>
+</table>
+{padding}
+</body></html>
+"""
+ISPS = ("Example Telecom", "Hosting Corp", "Cloud Provider LLC", "Residential ISP SA")
+USAGES = ("Data Center/Web Hosting/Transit", "Fixed Line ISP", "Commercial")
+COUNTRIES = (("Argentina", "Buenos Aires"), ("United States", "Ashburn"), ("Germany", "Frankfurt"))
+# Relleno para que la página tenga un tamaño parecido al real (~40 KB)
+PADDING = "<div class=\"comment\">" + "Reported for port scanning and brute force. " * 900 + "</div>"
+
+
+def fake_record(indicator):
+    seed = int(hashlib.md5(indicator.encode("utf-8")).hexdigest(), 16)
+    country, city = COUNTRIES[seed % len(COUNTRIES)]
+    return {
+        "isp": ISPS[seed % len(ISPS)],
+        "usage": USAGES[seed % len(USAGES)],
+        "asn": 64512 + seed % 1000,
+        "domain": f"host{seed % 97}.example.net",
+        "country": country,
+        "city": city,
+    }
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True  # Como un servidor real: sin esperas de 40 ms en conexiones keep-alive
+    delay = 0.0
+    fail_rate = 0.0
+    requests = 0
+    lock = threading.Lock()
+
+    def do_GET(self):
+        with StubHandler.lock:
+            StubHandler.requests += 1
+        if self.path.startswith("/slow/"):
+            time.sleep(60)
+        if self.delay:
+            time.sleep(self.delay)
+        if self.fail_rate and random.random() < self.fail_rate:
+            self.reply(503, "<html><title>Service Unavailable</title></html>", {"Retry-After": "1"})
+            return
+        if self.path.startswith("/check/"):
+            ip = self.path[len("/check/"):]
+            body = ABUSEIPDB_PAGE.format(ip=ip, padding=PADDING, **fake_record(ip))
+        else:
+            body = f"<html><head><title>Report for {self.path.rsplit('/', 1)[-1]}</title></head><body>ok</body></html>"
+        self.reply(200, body)
+
+    def reply(self, status, body, headers=None):
+        data = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        if "gzip" in self.headers.get("Accept-Encoding", ""):
+            data = gzip.compress(data, compresslevel=5)
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_stub_server(port=0, delay=0.0, fail_rate=0.0):
+    """Start the stub in a daemon thread; returns ``(server, base_url)``. Stop it with ``server.shutdown()``."""
+    StubHandler.delay = delay
+    StubHandler.fail_rate = fail_rate
+    server = ThreadingHTTPServer(("127.0.0.1", port), StubHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--delay", type=float, default=0.2)
+    parser.add_argument("--fail-rate", type=float, default=0.0)
+    args = parser.parse_args()
+    server, base_url = start_stub_server(args.port, args.delay, args.fail_rate)
+    print(f"OSINT stub listening on {base_url} (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+import hashlib
+import os
+import re
+
+# Marcador que ocupa en el ticket el lugar del contenido guardado aparte
+ATTACHMENT_RE = re.compile(r"\[\[attachment: (?P<name>[0-9a-f]{16}\.log) \| (?P<size>[^|\]]+) \| (?P<lines>[\d,]+) lines\]\]")
+
+
+def format_size(size):
+    for unit in ("B", "KB", "MB"):
+        if size < 1024 or unit == "MB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+
+
+class AttachmentStore:
+    """Large pasted payloads kept as files next to the tickets.
+
+    Files are named after the SHA-1 of their content, so pasting the same log
+    twice reuses one file. The ticket only keeps a placeholder line
+    (``placeholder``) that ``ATTACHMENT_RE`` can find again.
+    """
+
+    def __init__(self, directory="./tickets/attachments"):
+        self.directory = directory
+
+    def path(self, name):
+        return os.path.join(self.directory, os.path.basename(name))
+
+    def save(self, payload):
+        """Write ``payload`` and return its placeholder text."""
+        data = payload.encode("utf-8")
+        name = hashlib.sha1(data).hexdigest()[:16] + ".log"
+        path = self.path(name)
+        if not os.path.exists(path):
+            os.makedirs(self.directory, exist_ok=True)
+            temp_path = path + ".tmp"
+            with open(temp_path, "wb") as file:
+                file.write(data)
+            os.replace(temp_path, path)
+        return self.placeholder(name, len(data), payload.count("\n") + 1)
+
+    @staticmethod
+    def placeholder(name, size, lines):
+        return f"[[attachment: {name} | {format_size(size)} | {lines:,} lines]]"
+
+    def preview(self, name, max_lines=200, max_chars=64 * 1024):
+        """First lines of an attachment and whether there is more after them."""
+        lines = []
+        chars = 0
+        with open(self.path(name), "r", encoding="utf-8", errors="replace") as file:
+            for line in file:
+                if len(lines) >= max_lines or chars + len(line) > max_chars:
+                    return "".join(lines), True
+                lines.append(line)
+                chars += len(line)
+        return "".join(lines), False
+
+    def read(self, name):
+        with open(self.path(name), "r", encoding="utf-8") as file:
+            return file.read()
@@ -0,0 +1,138 @@
+import asyncio
+import http.client
+import threading
+import time
+
+from functions.http_pool import HTTPPool, HTTPStatusError
+from functions.ioc_extractor import iter_iocs
+from functions.osint_parsers import STREAM_PARSERS, parser_for, summarize
+from functions.osint_urls import build_url, expand_kinds
+from functions.request_scheduler import BULK
+
+DEFAULT_CONCURRENCY = 4  # Por proveedor
+DEFAULT_TIMEOUT = 10.0
+TOTAL_CONCURRENCY = 32
+
+
+def bulk_providers(tools):
+    """Tools of osint.json that take part in bulk enrichment: the ones that declare ``kinds``."""
+    return [tool for tool in tools if tool.get("kinds")]
+
+
+def fetch_parsed(http_pool, tool, indicator, kind=None):
+    """Download and parse one lookup with the pooled client, streaming when the parser supports it."""
+    url = build_url(tool, indicator, kind)
+    stream_parser = STREAM_PARSERS.get(tool.get("parser"))
+    if stream_parser is not None:
+        parser = stream_parser()
+        http_pool.fetch_text(url, feed=parser.feed, timeout=tool.get("timeout", DEFAULT_TIMEOUT))
+        return parser.result()
+    return parser_for(tool)(http_pool.fetch_text(url, timeout=tool.get("timeout", DEFAULT_TIMEOUT)))
+
+
+def ticket_indicators(text):
+    """Distinct ``(kind, value)`` indicators of ``text`` in first-seen order."""
+    return list(dict.fromkeys((kind, value) for kind, value, start, end in iter_iocs(text)))
+
+
+def plan_lookups(indicators, tools):
+    """``(tool, kind, indicator)`` for every indicator and every provider whose ``kinds`` include its kind."""
+    kinds = [(tool, expand_kinds(tool.get("kinds", ()))) for tool in tools]
+    return [(tool, kind, value) for kind, value in indicators for tool, accepted in kinds if kind in accepted]
+
+
+class BulkEnricher:
+    """Fans indicator lookups out to several OSINT providers concurrently.
+
+    ``run`` drives an asyncio loop on the calling (worker) thread. Every
+    provider gets its own semaphore (``concurrency`` in osint.json, default
+    4) and timeout (``timeout``, seconds); ``total_concurrency`` caps the
+    sockets open at once. Each finished lookup is handed to ``on_result``
+    immediately, so the caller can stream it into a table. With an
+    ``EnrichmentCache`` cached answers are returned without a request and
+    fresh ones are stored. Requests go through ``http_pool`` (``fetch_parsed``,
+    the same client as the interactive lookups). With a ``RequestScheduler``
+    they are sent as low-priority jobs, so they respect the providers' rate
+    limits and are coalesced with identical lookups; the timeout then
+    applies to the request itself and not to the time spent waiting for
+    quota. Without one they run on the loop's default thread pool.
+    """
+
+    def __init__(self, cache=None, on_result=None, total_concurrency=TOTAL_CONCURRENCY, scheduler=None, http_pool=None):
+        self.cache = cache
+        self.on_result = on_result
+        self.scheduler = scheduler
+        self.http_pool = http_pool or HTTPPool()
+        self.total_concurrency = total_concurrency
+        self.loop = None
+        self.task = None
+        self.cancelled = threading.Event()
+
+    def run(self, lookups):
+        """Run ``(tool, kind, indicator)`` lookups; returns the list of results (also streamed)."""
+        return asyncio.run(self._run(lookups))
+
+    def cancel(self):
+        """Stop a running ``run`` from any thread; lookups in flight are abandoned."""
+        self.cancelled.set()
+        if self.loop is not None and self.task is not None:
+            self.loop.call_soon_threadsafe(self.task.cancel)
+
+    async def _run(self, lookups):
+        self.loop = asyncio.get_running_loop()
+        self.task = asyncio.current_task()
+        total = asyncio.Semaphore(self.total_concurrency)
+        limits = {}
+        for tool, kind, indicator in lookups:
+            if tool["name"] not in limits:
+                limits[tool["name"]] = asyncio.Semaphore(tool.get("concurrency", DEFAULT_CONCURRENCY))
+        results = []
+        if self.cancelled.is_set():
+            return results
+        pending = [
+            asyncio.ensure_future(self._lookup(tool, kind, indicator, limits[tool["name"]], total))
+            for tool, kind, indicator in lookups
+        ]
+        try:
+            for future in asyncio.as_completed(pending):
+                result = await future
+                results.append(result)
+                if self.on_result:
+                    self.on_result(result)
+        except asyncio.CancelledError:
+            for future in pending:
+                future.cancel()
+        return results
+
+    async def _lookup(self, tool, kind, indicator, limit, total):
+        provider = tool["name"]
+        result = {"indicator": indicator, "kind": kind, "provider": provider, "elapsed": 0.0, "data": None}
+        if self.cache is not None:
+            found, data, age = self.cache.get(provider, indicator)
+            if found:
+                result.update(status="cached", data=data, summary=summarize(data))
+                return result
+
+        async with limit, total:
+            start = time.perf_counter()
+            try:
+                data = await self._fetch(tool, kind, indicator)
+            except (asyncio.TimeoutError, TimeoutError):
+                result.update(status="timeout", summary=f"No answer in {tool.get('timeout', DEFAULT_TIMEOUT)} s")
+            except (OSError, ValueError, HTTPStatusError, http.client.HTTPException) as error:
+                result.update(status="error", summary=str(error) or type(error).__name__)
+            else:
+                result.update(status="ok" if data else "no data", data=data, summary=summarize(data))
+                if self.cache is not None:
+                    self.cache.put(provider, indicator, data)
+            result["elapsed"] = time.perf_counter() - start
+        return result
+
+    async def _fetch(self, tool, kind, indicator):
+        def fetch():
+            return fetch_parsed(self.http_pool, tool, indicator, kind)
+
+        if self.scheduler is not None:
+            future = self.scheduler.submit(tool["name"], build_url(tool, indicator, kind), fetch, BULK)
+            return await asyncio.wrap_future(future)
+        return await asyncio.get_running_loop().run_in_executor(None, fetch)
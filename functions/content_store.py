@@ -0,0 +1,270 @@
+import glob
+import mmap
+import os
+import re
+import threading
+import time
+import zlib
+from collections import Counter
+
+try:
+    import zstandard
+except ImportError:  # zstd es opcional; sin él se usa zlib con diccionario
+    zstandard = None
+
+CODEC_RAW = 0
+CODEC_ZLIB = 1
+CODEC_ZSTD = 2
+CODEC_NAMES = {CODEC_RAW: "raw", CODEC_ZLIB: "zlib", CODEC_ZSTD: "zstd"}
+
+DICT_SIZE = 32 * 1024  # zlib solo aprovecha los últimos 32 KB del diccionario
+ZLIB_LEVEL = 6
+
+
+def train_dictionary(samples, size=DICT_SIZE, codec=None):
+    """Build a compression dictionary from sample texts; returns ``(codec, bytes)``.
+
+    With zstandard installed its trainer is used. Otherwise a zlib preset
+    dictionary is assembled from the lines that repeat across samples
+    (template headers, field names, boilerplate), weighted by how many bytes
+    they would save; the most valuable lines go last, where zlib's window
+    reaches them from any position.
+    """
+    samples = [sample.encode("utf-8") if isinstance(sample, str) else sample for sample in samples if sample]
+    if codec is None:
+        codec = CODEC_ZSTD if zstandard else CODEC_ZLIB
+    if codec == CODEC_ZSTD:
+        return CODEC_ZSTD, zstandard.train_dictionary(size, samples).as_bytes()
+
+    counts = Counter()
+    for sample in samples:
+        counts.update(set(sample.splitlines(keepends=True)))
+    scored = sorted(
+        ((count * len(line), line) for line, count in counts.items() if count > 1 and len(line) > 3),
+        reverse=True,
+    )
+    chosen = []
+    total = 0
+    for score, line in scored:
+        if total + len(line) > size:
+            continue
+        chosen.append(line)
+        total += len(line)
+    return CODEC_ZLIB, b"".join(reversed(chosen))
+
+
+class ContentStore:
+    """Append-only blob files for ticket bodies, read back by offset through mmap.
+
+    ``put`` returns a reference that is stored in the ticket metadata instead of
+    the body: ``[offset, length, codec, dict_id, segment]``. Bodies are
+    compressed with zlib (or zstd when installed), using the newest trained
+    dictionary when there is one, and kept raw when that does not save space.
+    Legacy two-element references ``[offset, length]`` point at raw text in
+    segment 0 (``path`` itself).
+
+    Segments ``<name>.<n><ext>`` let ``recompress`` write a fresh file while
+    every existing reference stays valid; old segments are removed with
+    ``drop_segments`` only once nothing points at them.
+    """
+
+    SEGMENT_RE = re.compile(r"\.(\d+)$")
+    DICT_RE = re.compile(r"\.dict(\d+)$")
+
+    def __init__(self, path):
+        self.path = path
+        self.base, self.ext = os.path.splitext(path)
+        self.lock = threading.Lock()
+        self.segments = {}  # id -> [archivo, tamaño, mmap]
+        self.dictionaries = {}  # id -> (codec, bytes)
+        self._compressors = {}
+        self._decompressors = {}
+
+        segment_ids = [0]
+        for segment_path in glob.glob(f"{glob.escape(self.base)}.*{self.ext}"):
+            match = self.SEGMENT_RE.search(os.path.splitext(segment_path)[0])
+            if match:
+                segment_ids.append(int(match.group(1)))
+        for segment in sorted(set(segment_ids)):
+            self._open_segment(segment)
+        self.active = max(self.segments)
+
+        for dict_path in glob.glob(f"{glob.escape(self.base)}.dict*"):
+            match = self.DICT_RE.search(dict_path)
+            if not match:
+                continue
+            dict_id = int(match.group(1))
+            with open(dict_path, "rb") as file:
+                raw = file.read()
+            self.dictionaries[dict_id] = (raw[0], raw[1:])
+        self.dict_id = max(self.dictionaries) if self.dictionaries else 0
+        self.codec = self.dictionaries[self.dict_id][0] if self.dict_id else (CODEC_ZSTD if zstandard else CODEC_ZLIB)
+
+    def segment_path(self, segment):
+        return self.path if segment == 0 else f"{self.base}.{segment}{self.ext}"
+
+    def _open_segment(self, segment):
+        path = self.segment_path(segment)
+        if not os.path.exists(path):
+            open(path, "wb").close()
+        file = open(path, "r+b")
+        file.seek(0, os.SEEK_END)
+        self.segments[segment] = [file, file.tell(), None]
+
+    # Compresión
+    def _compress(self, data):
+        dict_id = self.dict_id
+        if self.codec == CODEC_ZSTD:
+            compressor = self._compressors.get(dict_id)
+            if compressor is None:
+                dict_data = zstandard.ZstdCompressionDict(self.dictionaries[dict_id][1]) if dict_id else None
+                compressor = self._compressors[dict_id] = zstandard.ZstdCompressor(level=9, dict_data=dict_data)
+            return CODEC_ZSTD, compressor.compress(data)
+        # Un compresor "plantilla" por diccionario: copy() evita recargar el zdict en cada put
+        template = self._compressors.get(dict_id)
+        if template is None:
+            zdict = self.dictionaries[dict_id][1] if dict_id else None
+            template = zlib.compressobj(ZLIB_LEVEL, zdict=zdict) if zdict else zlib.compressobj(ZLIB_LEVEL)
+            self._compressors[dict_id] = template
+        compressor = template.copy()
+        return CODEC_ZLIB, compressor.compress(data) + compressor.flush()
+
+    def _decompress(self, codec, dict_id, data):
+        if codec == CODEC_RAW:
+            return data
+        key = (codec, dict_id)
+        if codec == CODEC_ZSTD:
+            decompressor = self._decompressors.get(key)
+            if decompressor is None:
+                dict_data = zstandard.ZstdCompressionDict(self.dictionaries[dict_id][1]) if dict_id else None
+                decompressor = self._decompressors[key] = zstandard.ZstdDecompressor(dict_data=dict_data)
+            return decompressor.decompress(data)
+        template = self._decompressors.get(key)
+        if template is None:
+            zdict = self.dictionaries[dict_id][1] if dict_id else None
+            template = self._decompressors[key] = zlib.decompressobj(zdict=zdict) if zdict else zlib.decompressobj()
+        decompressor = template.copy()
+        return decompressor.decompress(data) + decompressor.flush()
+
+    # Lectura y escritura
+    def put(self, text, sync=True):
+        """Append ``text`` and return its reference.
+
+        The segment is fsynced before returning, so a reference that the
+        journal or SQLite persists never points past the end of the blob after
+        a power loss. Batch writers pass ``sync=False`` and call ``sync()``
+        once before saving the references.
+        """
+        data = text.encode("utf-8")
+        with self.lock:
+            codec, dict_id = CODEC_RAW, 0
+            if data:
+                codec, packed = self._compress(data)
+                dict_id = self.dict_id
+                if len(packed) >= len(data):
+                    codec, dict_id, packed = CODEC_RAW, 0, data
+            else:
+                packed = data
+            segment_id = self.active
+            segment = self.segments[segment_id]
+            file, offset = segment[0], segment[1]
+            file.seek(offset)
+            file.write(packed)
+            file.flush()
+            if sync:
+                os.fsync(file.fileno())
+            segment[1] += len(packed)
+        return [offset, len(packed), codec, dict_id, segment_id]
+
+    def get(self, ref):
+        offset, length = ref[0], ref[1]
+        if not length:
+            return ""
+        codec, dict_id, segment_id = (ref[2], ref[3], ref[4]) if len(ref) > 2 else (CODEC_RAW, 0, 0)
+        with self.lock:
+            segment = self.segments[segment_id]
+            # El archivo creció desde el último mapeo: se vuelve a mapear
+            if segment[2] is None or offset + length > len(segment[2]):
+                if segment[2] is not None:
+                    segment[2].close()
+                segment[2] = mmap.mmap(segment[0].fileno(), 0, access=mmap.ACCESS_READ)
+            data = segment[2][offset:offset + length]
+            return self._decompress(codec, dict_id, data).decode("utf-8")
+
+    # Diccionarios y segmentos
+    def add_dictionary(self, codec, raw):
+        """Persist a trained dictionary and use it for every following ``put``."""
+        with self.lock:
+            dict_id = max(self.dictionaries, default=0) + 1
+            temp_path = f"{self.base}.dict{dict_id}.tmp"
+            with open(temp_path, "wb") as file:
+                file.write(bytes([codec]) + raw)
+            os.replace(temp_path, f"{self.base}.dict{dict_id}")
+            self.dictionaries[dict_id] = (codec, raw)
+            self.dict_id = dict_id
+            self.codec = codec
+        return dict_id
+
+    def start_segment(self):
+        """Direct new writes to a fresh segment file; returns its id."""
+        with self.lock:
+            segment = max(self.segments) + 1
+            self._open_segment(segment)
+            self.active = segment
+        return segment
+
+    def drop_segments(self, keep):
+        """Delete segment files whose id is not in ``keep`` (callers ensure they are unreferenced)."""
+        with self.lock:
+            for segment_id in [segment for segment in self.segments if segment not in keep]:
+                file, size, mapped = self.segments.pop(segment_id)
+                if mapped is not None:
+                    mapped.close()
+                file.close()
+                if segment_id == 0:
+                    # El segmento 0 es la ruta base: se deja vacío en lugar de borrarlo
+                    open(self.path, "wb").close()
+                    self._open_segment(0)
+                else:
+                    os.remove(self.segment_path(segment_id))
+
+    def sync(self):
+        with self.lock:
+            for file, size, mapped in self.segments.values():
+                os.fsync(file.fileno())
+
+    def size(self):
+        return sum(segment[1] for segment in self.segments.values())
+
+    def stats(self, refs=(), sample=200):
+        """On-disk size, compression ratio and read latency over up to ``sample`` references."""
+        refs = [ref for ref in refs if ref and ref[1]]
+        step = max(1, len(refs) // sample) if refs else 1
+        measured = refs[::step][:sample]
+        raw_bytes = 0
+        timings = []
+        for ref in measured:
+            start = time.perf_counter()
+            raw_bytes += len(self.get(ref).encode("utf-8"))
+            timings.append(time.perf_counter() - start)
+        stored_bytes = sum(ref[1] for ref in measured)
+        timings.sort()
+        codecs = Counter(CODEC_NAMES[ref[2] if len(ref) > 2 else CODEC_RAW] for ref in refs)
+        return {
+            "disk_bytes": self.size(),
+            "segments": len(self.segments),
+            "codec": CODEC_NAMES[self.codec],
+            "dictionary": self.dict_id,
+            "bodies": len(refs),
+            "codecs": dict(codecs),
+            "ratio": raw_bytes / stored_bytes if stored_bytes else 1.0,
+            "read_ms_avg": 1000 * sum(timings) / len(timings) if timings else 0.0,
+            "read_ms_p95": 1000 * timings[int(len(timings) * 0.95)] if timings else 0.0,
+        }
+
+    def close(self):
+        with self.lock:
+            for file, size, mapped in self.segments.values():
+                if mapped is not None:
+                    mapped.close()
+                file.close()
@@ -1,10 +1,30 @@
-import json
 import os
+import threading
+
+from functions.content_store import ContentStore, train_dictionary
+from functions.event_bus import (
+    ClientAdded,
+    CollectionChanged,
+    EventBus,
+    NoteAdded,
+    TicketDeleted,
+    TicketsReloaded,
+    TicketUpserted,
+    TucAdded,
+)
+from functions.revision_store import RevisionStore
+from functions.search_index import TEXT_FIELDS, SearchIndex
+from functions.snapshot_cache import SnapshotCache, freeze
+from functions.storage import TICKETS_FILE, create_storage, ticket_key
+from functions.ticket_filters import TicketFilterIndex
+from functions.ticket_index import TicketIndex
 
 
 class DataManager:
-    def __init__(self):
-        self.data_folder = "./data/"
+    def __init__(self, data_folder="./data/", backend="auto", split_content=True, events=None):
+        self.data_folder = data_folder
+        # Notificaciones de cambios para que los módulos se actualicen de forma incremental
+        self.events = events or EventBus()
         self.files = {
             "osint": "osint.json",
             "queries": "queries.json",
@@ -12,20 +32,65 @@ class DataManager:
             "tucs": "tucs.json",
             "clients": "clients.json",
             "notes": "notes.json",
-            "tickets": "tickets.json",
+            "tickets": TICKETS_FILE,
         }
+        # Motor de almacenamiento intercambiable: JSON, journal de tickets o SQLite
+        self.storage = create_storage(data_folder, backend)
+        # Caché de lectura: las colecciones sin cambios se devuelven sin volver a parsear
+        self.cache = SnapshotCache()
+        # Índice hash (ticket_number, client) -> ticket, mantenido en cada escritura
+        self.ticket_index = TicketIndex()
+        # Los índices se consultan también desde hilos de trabajo (búsqueda en vivo).
+        # index_lock protege el índice por clave y los filtros (también los usa el hilo de Tk)
+        # y solo se toma por poco tiempo; search_lock serializa la construcción del índice
+        # invertido y las búsquedas, que corren solo en hilos de trabajo.
+        self.index_lock = threading.RLock()
+        self.search_lock = threading.RLock()
+        # Índice invertido para la búsqueda de History, construido en el primer uso
+        self.search_index = SearchIndex(text_loader=self._ticket_search_text)
+        # Bitmaps por cliente/TUC/categoría y orden por fecha para los filtros de History
+        self.filter_index = TicketFilterIndex()
+        # Cuerpos de los tickets fuera de la metadata, leídos bajo demanda vía mmap
+        self.content_store = ContentStore(os.path.join(data_folder, "ticket_content.blob")) if split_content else None
+        # Historial de versiones del contenido de cada ticket (deltas comprimidos)
+        self.revisions = RevisionStore(os.path.join(data_folder, "ticket_revisions.log"))
+
+    def _cache_key(self, filename):
+        return (self.storage.path(filename), filename)
 
     def _load_json(self, filename):
-        path = os.path.join(self.data_folder, filename)
-        if os.path.exists(path):
-            with open(path, "r", encoding="utf-8") as file:
-                return json.load(file)
-        return []
+        """Return an immutable snapshot of ``filename`` (tuples and read-only dicts)."""
+        return self.cache.get(
+            self._cache_key(filename),
+            self.storage.signature(filename),
+            lambda: self.storage.load(filename),
+        )
+
+    def _save_json(self, filename, data, source=None):
+        if filename == self.files["tickets"]:
+            # Un único fsync del blob antes de guardar las referencias
+            data = [self._split_content(ticket, sync=False) for ticket in data]
+            if self.content_store is not None:
+                self.content_store.sync()
+        self.storage.save(filename, data)
+        self._invalidate(filename)
+        if filename == self.files["tickets"]:
+            self.events.publish(TicketsReloaded(source=source))
+        else:
+            self.events.publish(CollectionChanged(os.path.splitext(filename)[0], source=source))
+
+    def _invalidate(self, filename):
+        self.cache.invalidate(self._cache_key(filename))
+
+    def cache_stats(self):
+        return self.cache.stats()
 
-    def _save_json(self, filename, data):
-        path = os.path.join(self.data_folder, filename)
-        with open(path, "w", encoding="utf-8") as file:
-            json.dump(data, file, indent=4)
+    def close(self):
+        """Flush pending journal records and release the storage engine."""
+        self.storage.close()
+        if self.content_store:
+            self.content_store.close()
+        self.revisions.close()
 
     # Métodos para cargar datos
     def get_templates(self):
@@ -41,46 +106,299 @@ class DataManager:
         return self._load_json(self.files["notes"])
 
     def get_tickets(self):
+        """Return every ticket with its ``content`` body loaded."""
+        return tuple(self._hydrate(ticket) for ticket in self.get_ticket_summaries())
+
+    def get_ticket_summaries(self):
+        """Return ticket metadata only; bodies are fetched with ``get_ticket_content``."""
         return self._load_json(self.files["tickets"])
 
+    def get_ticket_content(self, ticket):
+        ref = ticket.get("content_ref")
+        if ref is not None and self.content_store:
+            return self.content_store.get(ref)
+        return ticket.get("content", "")
+
+    def _hydrate(self, ticket):
+        if "content_ref" not in ticket:
+            return ticket
+        hydrated = {key: value for key, value in ticket.items() if key != "content_ref"}
+        hydrated["content"] = self.get_ticket_content(ticket)
+        return hydrated
+
+    def _split_content(self, ticket, sync=True):
+        """Move ``content`` into the blob store and keep only its reference (``sync``: see ContentStore.put)."""
+        if self.content_store is None or "content" not in ticket:
+            return ticket
+        stored = dict(ticket)
+        content = stored.pop("content") or ""
+        previous = self.ticket_index.get(ticket_key(ticket))
+        ref = stored.get("content_ref") or (previous.get("content_ref") if previous else None)
+        if ref is None or self.content_store.get(ref) != content:
+            ref = self.content_store.put(content, sync=sync)
+        stored["content_ref"] = ref
+        return stored
+
+    def migrate_ticket_content(self):
+        """Move bodies still stored inline in the tickets into the blob store.
+
+        Also removes blob segments that no ticket references any more (left by
+        ``recompress_ticket_content`` or by an interrupted one); this runs at
+        startup, when no reader can hold an old reference.
+        """
+        tickets = self.get_ticket_summaries()
+        inline = sum(1 for ticket in tickets if "content" in ticket)
+        if inline and self.content_store:
+            self._save_json(self.files["tickets"], [dict(ticket) for ticket in tickets])
+            tickets = self.get_ticket_summaries()
+        if self.content_store:
+            referenced = {self._ref_segment(ticket.get("content_ref")) for ticket in tickets}
+            self.content_store.drop_segments(referenced | {self.content_store.active})
+        return inline
+
+    @staticmethod
+    def _ref_segment(ref):
+        if not ref:
+            return None
+        return ref[4] if len(ref) > 4 else 0
+
+    def recompress_ticket_content(self, sample_size=2000):
+        """Train a dictionary on templates + tickets and rewrite every body with it.
+
+        Bodies are written to a new blob segment and the tickets are saved with
+        the new references; the old segment stays valid until the next start,
+        when ``migrate_ticket_content`` deletes it. Returns the size before and after.
+        """
+        if self.content_store is None:
+            return None
+        with self.index_lock:
+            tickets = self.get_ticket_summaries()
+            before = self.content_store.stats([ticket.get("content_ref") for ticket in tickets])
+
+            step = max(1, len(tickets) // sample_size)
+            samples = [template.get("content", "") for template in self.get_templates()]
+            samples += [self.get_ticket_content(ticket) for ticket in tickets[::step]]
+            codec, dictionary = train_dictionary(samples)
+            if dictionary:
+                self.content_store.add_dictionary(codec, dictionary)
+
+            self.content_store.start_segment()
+            rewritten = []
+            for ticket in tickets:
+                stored = {key: value for key, value in ticket.items() if key != "content"}
+                stored["content_ref"] = self.content_store.put(self.get_ticket_content(ticket), sync=False)
+                rewritten.append(stored)
+            self.content_store.sync()
+            self._save_json(self.files["tickets"], rewritten)
+            after = self.content_store.stats([ticket["content_ref"] for ticket in rewritten])
+        return {"before": before, "after": after}
+
+    def content_stats(self, sample=200):
+        """Size on disk, compression ratio and read latency of the ticket bodies."""
+        if self.content_store is None:
+            return None
+        refs = [ticket.get("content_ref") for ticket in self.get_ticket_summaries()]
+        return self.content_store.stats(refs, sample)
+
     def get_clients(self):
         return self._load_json(self.files["clients"])
 
     def get_tucs(self):
         return self._load_json(self.files["tucs"])
 
+    def _ticket_index(self):
+        """Return the ticket index, rebuilding it only if tickets changed externally."""
+        filename = self.files["tickets"]
+        with self.index_lock:
+            signature = self.storage.signature(filename)
+            if signature is None or signature != self.ticket_index.signature:
+                self.ticket_index.rebuild(self._load_json(filename), signature)
+            return self.ticket_index
+
+    def _ticket_written(self, stored=None, old_key=None, content=None):
+        """Apply a ticket write to the in-memory indexes and resync their signatures."""
+        filename = self.files["tickets"]
+        with self.index_lock:
+            before = self.ticket_index.signature
+            frozen = freeze(stored) if stored is not None else None
+            # Versiones que reemplaza la escritura: la clave anterior y, si se renombró sobre otro, el destino
+            replaced = {}
+            for key in (old_key, ticket_key(frozen) if frozen is not None else None):
+                if key is not None and key in self.ticket_index:
+                    replaced[tuple(key)] = self.ticket_index.get(key)
+            if frozen is not None:
+                self.ticket_index.upsert(frozen, old_key)
+            elif old_key is not None:
+                self.ticket_index.delete(old_key)
+            self._invalidate(filename)
+            after = self.ticket_index.signature = self.storage.signature(filename)
+
+            filters = self.filter_index
+            if filters.signature is not None and filters.signature[0] == before:
+                for ticket in replaced.values():
+                    filters.remove(ticket)
+                if frozen is not None:
+                    filters.add(frozen)
+                filters.signature = (after, filters.signature[1])
+
+        # El índice invertido se actualiza después, sin bloquear a quien consulta el índice por clave
+        with self.search_lock:
+            if self.search_index.signature is None or self.search_index.signature != before:
+                return  # Sin construir o desactualizado: se reconstruye en la próxima búsqueda
+            if old_key is not None:
+                self.search_index.remove(tuple(old_key))
+            if frozen is not None:
+                if content is None:
+                    content = self.get_ticket_content(frozen)
+                self.search_index.add(ticket_key(frozen), frozen, content)
+            self.search_index.signature = after
+
+    def _search_index(self):
+        """Return the full-text index, building it on first use or after external changes.
+
+        The ticket index is only locked to take a snapshot of its entries; the
+        (slow) build reads the contents into a new index that replaces the old
+        one when it is complete.
+        """
+        with self.search_lock:
+            with self.index_lock:
+                index = self._ticket_index()
+                signature = index.signature
+                if signature is not None and self.search_index.signature == signature:
+                    return self.search_index
+                entries = list(index.entries.items())
+            search_index = SearchIndex(text_loader=self._ticket_search_text)
+            for key, ticket in entries:
+                search_index.add(key, ticket, self.get_ticket_content(ticket))
+            search_index.signature = signature
+            self.search_index = search_index
+            return search_index
+
+    def ticket_filters(self):
+        """Return the History filter index.
+
+        Ticket writes update it in place (see ``_ticket_written``); it is only
+        rebuilt when the tickets changed externally or the TUC categories changed.
+        """
+        with self.index_lock:
+            index = self._ticket_index()
+            filters = self.filter_index
+            signature = (index.signature, self.storage.signature(self.files["tucs"]))
+            if index.signature is None or signature != filters.signature:
+                categories = {tuc.get("name"): tuc.get("category") for tuc in self.get_tucs() if tuc.get("category")}
+                # Con SQLite la firma de las TUCs cambia con cualquier escritura: solo cuenta si cambian las categorías
+                tickets_current = index.signature is not None and filters.signature is not None and filters.signature[0] == index.signature
+                if tickets_current and categories == filters.tuc_categories:
+                    filters.signature = signature
+                else:
+                    filters.rebuild(index.entries.values(), categories, signature)
+            return filters
+
+    def _ticket_search_text(self, key):
+        ticket = self.ticket_index.get(key)
+        if ticket is None:
+            return ""
+        fields = "\n".join(str(ticket.get(field) or "") for field in TEXT_FIELDS)
+        return fields + "\n" + self.get_ticket_content(ticket)
+
+    def search_tickets(self, query, limit=None, candidates=None, cancelled=None):
+        """Ranked full-text search over ticket metadata and content.
+
+        Returns ticket metadata records; see ``SearchIndex`` for the query syntax.
+        Safe to call from a worker thread.
+        """
+        with self.search_lock:
+            keys = self._search_index().search(query, limit=limit, candidates=candidates, cancelled=cancelled)
+        return [self.ticket_index.get(key) for key in keys]
+
+    def find_ticket(self, ticket_number, client):
+        return self._ticket_index().get((ticket_number, client))
+
+    def has_ticket(self, ticket_number, client):
+        return (ticket_number, client) in self._ticket_index()
+
     # Métodos para agregar datos
     def add_ticket(self, ticket):
-        tickets = self.get_tickets()
-        tickets.append(ticket)
-        self._save_json(self.files["tickets"], tickets)
+        self._ticket_index()
+        content = ticket.get("content")
+        ticket = self._split_content(ticket)
+        self.storage.append(self.files["tickets"], ticket)
+        self._ticket_written(ticket, content=content)
+        if content is not None:
+            self.revisions.record(ticket_key(ticket), content)
+        self.events.publish(TicketUpserted(self.ticket_index.get(ticket_key(ticket)), None))
+
+    def update_ticket(self, ticket, key=None):
+        """Merge ``ticket`` into the stored ticket identified by ``key``.
+
+        ``key`` defaults to the ticket's own (ticket_number, client); pass the old
+        key when the ticket number or client is being renamed.
+        """
+        key = tuple(key) if key else ticket_key(ticket)
+        existing = self._ticket_index().get(key)
+        merged = dict(existing) if existing else {}
+        merged.update(ticket)
+        content = ticket.get("content")
+        if content is not None and existing and not self.revisions.has_revisions(key):
+            # Tickets anteriores al historial: su contenido actual pasa a ser la revisión 0
+            self.revisions.record(key, self.get_ticket_content(existing))
+        merged = self._split_content(merged)
+        self.storage.upsert_ticket(merged, key)
+        self._ticket_written(merged, old_key=key, content=content)
+        self.revisions.rename(key, ticket_key(merged))
+        if content is not None:
+            self.revisions.record(ticket_key(merged), content)
+        self.events.publish(TicketUpserted(self.ticket_index.get(ticket_key(merged)), key))
+        return merged
+
+    # Historial de revisiones
+    def ticket_revisions(self, ticket_number, client):
+        """Saved revisions of a ticket's content, oldest first."""
+        return self.revisions.revisions((ticket_number, client))
+
+    def get_ticket_revision(self, ticket_number, client, rev):
+        return self.revisions.get((ticket_number, client), rev)
+
+    def diff_ticket_revisions(self, ticket_number, client, old_rev, new_rev):
+        """Unified diff lines between two revisions of a ticket."""
+        return self.revisions.diff((ticket_number, client), old_rev, new_rev)
+
+    def delete_ticket(self, ticket_number, client):
+        self._ticket_index()
+        self.storage.delete_ticket((ticket_number, client))
+        self._ticket_written(old_key=(ticket_number, client))
+        self.revisions.drop((ticket_number, client))
+        self.events.publish(TicketDeleted((ticket_number, client)))
 
     def add_note(self, note):
-        notes = self.get_notes()
-        notes.append(note)
-        self._save_json(self.files["notes"], notes)
+        self.storage.append(self.files["notes"], note)
+        self._invalidate(self.files["notes"])
+        self.events.publish(NoteAdded(note))
 
     def add_client(self, client_name):
         clients = self.get_clients()
         if client_name not in [client["name"] for client in clients]:
-            clients.append({"name": client_name})
-            self._save_json(self.files["clients"], clients)
+            self.storage.append(self.files["clients"], {"name": client_name})
+            self._invalidate(self.files["clients"])
+            self.events.publish(ClientAdded(client_name))
 
     def add_tuc(self, tuc_name):
         tucs = self.get_tucs()
         if tuc_name not in [tuc["name"] for tuc in tucs]:
-            tucs.append({"name": tuc_name})
-            self._save_json(self.files["tucs"], tucs)
+            self.storage.append(self.files["tucs"], {"name": tuc_name})
+            self._invalidate(self.files["tucs"])
+            self.events.publish(TucAdded(tuc_name))
 
     def add_osint_tool(self, tool_name, tool_url):
         tools = self.get_osint()
         if tool_name not in [tool["name"] for tool in tools]:
-            tools.append({"name": tool_name, "url": tool_url})
-            self._save_json(self.files["osint"], tools)
+            self.storage.append(self.files["osint"], {"name": tool_name, "url": tool_url})
+            self._invalidate(self.files["osint"])
+            self.events.publish(CollectionChanged("osint"))
 
     def add_template(self, template_name, content):
         templates = self.get_templates()
         if template_name not in [template["name"] for template in templates]:
-            templates.append({"name": template_name, "content": content})
-            self._save_json(self.files["templates"], templates)
-    
\ No newline at end of file
+            self.storage.append(self.files["templates"], {"name": template_name, "content": content})
+            self._invalidate(self.files["templates"])
+            self.events.publish(CollectionChanged("templates"))
@@ -0,0 +1,111 @@
+import re
+
+from functions.ioc_extractor import URL_TRAILING, iter_iocs, refang
+
+# Estilos de defang: separador de dominio, arroba y "://" de las URLs
+STYLES = {
+    "brackets": {"dot": "[.]", "at": "[@]", "sep": "[:]//"},
+    "parens": {"dot": "(.)", "at": "(at)", "sep": "://"},
+    "words": {"dot": "[dot]", "at": "[at]", "sep": "://"},
+}
+DEFAULT_STYLE = "brackets"
+CHUNK_SIZE = 1 << 16
+
+SCHEME_RE = re.compile(r"^(?:(h)tt(ps?)|(f)tp)$", re.IGNORECASE)
+WHITESPACE = (" ", "\n", "\t", "\r")
+
+
+def defang_ioc(kind, raw, style=DEFAULT_STYLE):
+    """Defanged form of one indicator as it appears in the text (any defang notation is accepted)."""
+    marks = STYLES[style]
+    value = refang(raw)
+    if kind == "url":
+        core = value.rstrip(URL_TRAILING)
+        trailing = value[len(core):]
+        scheme, sep, rest = core.partition("://")
+        scheme = SCHEME_RE.sub(lambda m: f"{m.group(1)}xx{m.group(2)}" if m.group(1) else f"{m.group(3)}xp", scheme)
+        host, slash, tail = rest.partition("/")
+        host = host.replace(".", marks["dot"]).replace("@", marks["at"])
+        return f"{scheme}{marks['sep']}{host}{slash}{tail}{trailing}"
+    if kind == "email":
+        local, at, domain = value.rpartition("@")
+        return f"{local}{marks['at']}{domain.replace('.', marks['dot'])}"
+    if kind in ("domain", "ipv4", "cidr"):
+        return value.replace(".", marks["dot"])
+    # Hashes, CVE, rutas e IPv6 no son navegables: se dejan como están
+    return raw
+
+
+def refang_ioc(kind, raw):
+    """Clickable form of one indicator; the inverse of ``defang_ioc``."""
+    return refang(raw)
+
+
+def iter_chunks(source, chunk_size=CHUNK_SIZE):
+    """Split ``source`` (a string, a text file or any iterable of strings) into chunks."""
+    if isinstance(source, str):
+        for start in range(0, len(source), chunk_size):
+            yield source[start:start + chunk_size]
+    elif hasattr(source, "read"):
+        for chunk in iter(lambda: source.read(chunk_size), ""):
+            yield chunk
+    else:
+        yield from source
+
+
+def iter_transform(source, transform, chunk_size=CHUNK_SIZE):
+    """Stream ``source`` and yield it back with every indicator replaced by ``transform(kind, raw)``.
+
+    Text is processed in chunks that are cut at the last whitespace, so an
+    indicator never straddles two chunks; everything outside indicators is
+    yielded as slices of the input and never rewritten.
+    """
+    pending = ""
+    for chunk in iter_chunks(source, chunk_size):
+        buffer = pending + chunk if pending else chunk
+        cut = max(buffer.rfind(char) for char in WHITESPACE) + 1
+        if cut == 0 and len(buffer) < 4 * chunk_size:
+            # Sin espacios todavía: se espera al siguiente trozo
+            pending = buffer
+            continue
+        if cut == 0:
+            cut = len(buffer)
+        yield from _transform_segment(buffer[:cut], transform)
+        pending = buffer[cut:]
+    if pending:
+        yield from _transform_segment(pending, transform)
+
+
+def _transform_segment(segment, transform):
+    position = 0
+    for kind, value, start, end in iter_iocs(segment):
+        raw = segment[start:end]
+        replacement = transform(kind, raw)
+        if replacement == raw:
+            continue
+        if start > position:
+            yield segment[position:start]
+        yield replacement
+        position = end
+    if position == 0:
+        yield segment
+    elif position < len(segment):
+        yield segment[position:]
+
+
+def defang_text(source, style=DEFAULT_STYLE, chunk_size=CHUNK_SIZE):
+    """Defang only the recognized indicators in ``source``; prose, versions and file names are kept."""
+    return "".join(iter_transform(source, lambda kind, raw: defang_ioc(kind, raw, style), chunk_size))
+
+
+def refang_text(source, chunk_size=CHUNK_SIZE):
+    """Restore every defanged indicator in ``source``."""
+    return "".join(iter_transform(source, refang_ioc, chunk_size))
+
+
+def defang_file(source_path, target_path, style=DEFAULT_STYLE, refang_mode=False):
+    """Defang (or refang) a text file into another without loading it whole."""
+    transform = refang_ioc if refang_mode else (lambda kind, raw: defang_ioc(kind, raw, style))
+    with open(source_path, "r", encoding="utf-8") as source, open(target_path, "w", encoding="utf-8") as target:
+        for piece in iter_transform(source, transform):
+            target.write(piece)
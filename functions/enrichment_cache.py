@@ -0,0 +1,216 @@
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from functions.ioc_extractor import refang
+
+DEFAULT_TTL = 24 * 3600  # Datos de ISP/ASN cambian poco: un día
+DEFAULT_NEGATIVE_TTL = 3600  # "Sin datos" se vuelve a consultar antes
+
+
+def normalize_indicator(indicator):
+    """Cache key form of an indicator: refanged, trimmed, lower-case unless it has a path."""
+    value = refang(indicator).strip()
+    return value if "/" in value else value.lower()
+
+
+class EnrichmentCache:
+    """Persistent (provider, indicator) -> result cache for OSINT lookups.
+
+    Entries live in a SQLite file (WAL, so several app instances can share it)
+    with an expiry per provider (``ttls`` / ``negative_ttls``, seconds). A
+    lookup that found nothing is stored as a negative entry (``None``) with its
+    own, shorter TTL so it does not burn quota either. The file is bounded to
+    ``max_entries`` by evicting the least recently used rows; the hottest
+    entries are also kept in memory. Hit/miss counters are kept per provider.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS enrichment (
+            provider TEXT NOT NULL,
+            indicator TEXT NOT NULL,
+            value TEXT,
+            stored_at REAL NOT NULL,
+            expires_at REAL NOT NULL,
+            accessed_at REAL NOT NULL,
+            PRIMARY KEY (provider, indicator)
+        );
+        CREATE INDEX IF NOT EXISTS idx_enrichment_accessed ON enrichment (accessed_at);
+    """
+    SELECT_ENTRY = "SELECT value, stored_at, expires_at FROM enrichment WHERE provider = ? AND indicator = ?"
+    UPSERT_ENTRY = (
+        "INSERT OR REPLACE INTO enrichment (provider, indicator, value, stored_at, expires_at, accessed_at) "
+        "VALUES (?, ?, ?, ?, ?, ?)"
+    )
+    TOUCH_ENTRY = "UPDATE enrichment SET accessed_at = ? WHERE provider = ? AND indicator = ?"
+    EVICT_LRU = (
+        "DELETE FROM enrichment WHERE rowid IN "
+        "(SELECT rowid FROM enrichment ORDER BY accessed_at LIMIT ?)"
+    )
+
+    def __init__(self, path, max_entries=20000, memory_entries=512, ttls=None, negative_ttls=None,
+                 default_ttl=DEFAULT_TTL, default_negative_ttl=DEFAULT_NEGATIVE_TTL, clock=time.time):
+        self.path = path
+        self.max_entries = max_entries
+        self.memory_entries = memory_entries
+        self.ttls = dict(ttls or {})
+        self.negative_ttls = dict(negative_ttls or {})
+        self.default_ttl = default_ttl
+        self.default_negative_ttl = default_negative_ttl
+        self.clock = clock
+        self.lock = threading.Lock()
+        self.memory = OrderedDict()  # (proveedor, indicador) -> (valor, guardado, expira)
+        self.touched = {}  # Accesos pendientes de escribir: se vuelcan junto con la próxima escritura
+        self.counters = {}  # proveedor -> {"hits", "negative_hits", "misses", "expired"}
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(self.SCHEMA)
+        self.row_count = self.connection.execute("SELECT COUNT(*) FROM enrichment").fetchone()[0]
+
+    def configure(self, provider, ttl=None, negative_ttl=None):
+        """Set the TTLs of ``provider`` (``None`` keeps the default)."""
+        with self.lock:
+            for table, value in ((self.ttls, ttl), (self.negative_ttls, negative_ttl)):
+                if value is None:
+                    table.pop(provider, None)
+                else:
+                    table[provider] = value
+
+    def _count(self, provider, counter):
+        counters = self.counters.setdefault(provider, {"hits": 0, "negative_hits": 0, "misses": 0, "expired": 0})
+        counters[counter] += 1
+
+    # Lectura
+    def get(self, provider, indicator):
+        """``(found, value, age)``: a negative entry is ``(True, None, age)``."""
+        key = (provider, normalize_indicator(indicator))
+        now = self.clock()
+        with self.lock:
+            entry = self.memory.get(key)
+            if entry is None:
+                row = self.connection.execute(self.SELECT_ENTRY, key).fetchone()
+                if row is not None:
+                    entry = (json.loads(row[0]) if row[0] is not None else None, row[1], row[2])
+            if entry is None:
+                self._count(provider, "misses")
+                return False, None, None
+            value, stored_at, expires_at = entry
+            if expires_at <= now:
+                self.memory.pop(key, None)
+                self._count(provider, "expired")
+                self._count(provider, "misses")
+                return False, None, None
+            self._remember(key, entry)
+            self.touched[key] = now
+            self._count(provider, "hits" if value is not None else "negative_hits")
+            return True, value, now - stored_at
+
+    def lookup(self, provider, indicator, fetch):
+        """Cached value of ``fetch(indicator)``; returns ``(value, age)`` with ``age`` None when just fetched.
+
+        A ``None`` result is cached as negative; exceptions are not cached.
+        """
+        found, value, age = self.get(provider, indicator)
+        if found:
+            return value, age
+        value = fetch(indicator)
+        self.put(provider, indicator, value)
+        return value, None
+
+    # Escritura
+    def put(self, provider, indicator, value, ttl=None):
+        key = (provider, normalize_indicator(indicator))
+        now = self.clock()
+        if ttl is None:
+            if value is None:
+                ttl = self.negative_ttls.get(provider, self.default_negative_ttl)
+            else:
+                ttl = self.ttls.get(provider, self.default_ttl)
+        entry = (value, now, now + ttl)
+        with self.lock, self.connection:
+            self._flush_touched()
+            cursor = self.connection.execute("SELECT 1 FROM enrichment WHERE provider = ? AND indicator = ?", key)
+            if cursor.fetchone() is None:
+                self.row_count += 1
+            self.connection.execute(
+                self.UPSERT_ENTRY, key + (json.dumps(value) if value is not None else None, now, now + ttl, now)
+            )
+            if self.row_count > self.max_entries:
+                # Se desaloja un 10 % de golpe para no borrar en cada inserción
+                excess = self.row_count - self.max_entries + self.max_entries // 10
+                self.connection.execute(self.EVICT_LRU, (excess,))
+                self.row_count = self.connection.execute("SELECT COUNT(*) FROM enrichment").fetchone()[0]
+                self.memory.clear()
+            self._remember(key, entry)
+
+    def _remember(self, key, entry):
+        self.memory[key] = entry
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.memory_entries:
+            self.memory.popitem(last=False)
+
+    def _flush_touched(self):
+        if self.touched:
+            self.connection.executemany(
+                self.TOUCH_ENTRY, ((accessed, provider, indicator) for (provider, indicator), accessed in self.touched.items())
+            )
+            self.touched.clear()
+
+    def invalidate(self, provider=None, indicator=None):
+        """Drop the entries of one indicator, one provider, or everything."""
+        conditions, params = [], []
+        if provider is not None:
+            conditions.append("provider = ?")
+            params.append(provider)
+        if indicator is not None:
+            conditions.append("indicator = ?")
+            params.append(normalize_indicator(indicator))
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        with self.lock, self.connection:
+            self.connection.execute(f"DELETE FROM enrichment{where}", params)
+            self.row_count = self.connection.execute("SELECT COUNT(*) FROM enrichment").fetchone()[0]
+            self.memory.clear()
+            self.touched.clear()
+
+    def purge_expired(self):
+        """Delete expired rows; returns how many were removed."""
+        with self.lock, self.connection:
+            removed = self.connection.execute("DELETE FROM enrichment WHERE expires_at <= ?", (self.clock(),)).rowcount
+            self.row_count -= removed
+            self.memory.clear()
+        return removed
+
+    # Estadísticas
+    def stats(self):
+        """Per-provider counters of this session plus the stored entries, and the overall hit rate."""
+        with self.lock:
+            rows = self.connection.execute(
+                "SELECT provider, COUNT(*), SUM(value IS NULL) FROM enrichment GROUP BY provider"
+            ).fetchall()
+            providers = {name: dict(counters) for name, counters in self.counters.items()}
+        for provider, entries, negative in rows:
+            counters = providers.setdefault(provider, {"hits": 0, "negative_hits": 0, "misses": 0, "expired": 0})
+            counters["entries"] = entries
+            counters["negative_entries"] = negative or 0
+        hits = misses = 0
+        for counters in providers.values():
+            counters.setdefault("entries", 0)
+            counters.setdefault("negative_entries", 0)
+            lookups = counters["hits"] + counters["negative_hits"] + counters["misses"]
+            counters["hit_rate"] = (counters["hits"] + counters["negative_hits"]) / lookups if lookups else 0.0
+            hits += counters["hits"] + counters["negative_hits"]
+            misses += counters["misses"]
+        return {
+            "providers": providers,
+            "entries": sum(counters["entries"] for counters in providers.values()),
+            "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+        }
+
+    def close(self):
+        with self.lock:
+            with self.connection:
+                self._flush_touched()
+            self.connection.close()
@@ -0,0 +1,88 @@
+import threading
+
+
+class Event:
+    """Base class of the change events published by DataManager."""
+
+    fields = ()
+
+    def __init__(self, *args, source=None):
+        for name, value in zip(self.fields, args):
+            setattr(self, name, value)
+        self.source = source  # Quien originó el cambio (para ignorar los propios)
+
+    def __repr__(self):
+        values = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.fields)
+        return f"{type(self).__name__}({values})"
+
+
+class TicketUpserted(Event):
+    """A ticket was created or updated; ``old_key`` is set when its key changed."""
+
+    fields = ("ticket", "old_key")
+
+
+class TicketDeleted(Event):
+    fields = ("key",)
+
+
+class TicketsReloaded(Event):
+    """The whole ticket collection was rewritten; subscribers must reload."""
+
+
+class NoteAdded(Event):
+    fields = ("note",)
+
+
+class TucAdded(Event):
+    fields = ("name",)
+
+
+class ClientAdded(Event):
+    fields = ("name",)
+
+
+class CollectionChanged(Event):
+    """A whole collection (notes, queries, osint, templates...) was saved."""
+
+    fields = ("collection",)
+
+
+class EventBus:
+    """Minimal publish/subscribe hub keyed by event class.
+
+    Subscribing to a base class also receives its subclasses (``Event``
+    receives everything). With ``dispatch`` set, callbacks are handed to it as
+    ``dispatch(callback, event)`` instead of being called in place; the app
+    uses ``TaskExecutor.call_in_ui`` so events published by worker threads
+    reach the widgets on the Tk thread, in publication order.
+    """
+
+    def __init__(self, dispatch=None):
+        self.dispatch = dispatch
+        self.subscribers = {}
+        self.lock = threading.Lock()
+
+    def subscribe(self, event_type, callback):
+        with self.lock:
+            self.subscribers.setdefault(event_type, []).append(callback)
+        return lambda: self.unsubscribe(event_type, callback)
+
+    def unsubscribe(self, event_type, callback):
+        with self.lock:
+            callbacks = self.subscribers.get(event_type, [])
+            if callback in callbacks:
+                callbacks.remove(callback)
+
+    def publish(self, event):
+        with self.lock:
+            callbacks = [
+                callback
+                for event_type in type(event).__mro__
+                for callback in self.subscribers.get(event_type, ())
+            ]
+        for callback in callbacks:
+            if self.dispatch:
+                self.dispatch(callback, event)
+            else:
+                callback(event)
@@ -0,0 +1,134 @@
+import codecs
+import http.client
+import ssl
+import threading
+import zlib
+from urllib.parse import urlsplit
+
+USER_AGENT = "Mozilla/5.0 (AutomaTEA)"
+CHUNK_SIZE = 16 * 1024
+MAX_BODY = 4 * 1024 * 1024
+DRAIN_LIMIT = 64 * 1024  # Tras cortar la lectura, un resto menor se descarta para reutilizar la conexión
+
+
+class HTTPStatusError(Exception):
+    def __init__(self, status, reason, url, headers=None):
+        super().__init__(f"HTTP {status} {reason} for {url}")
+        self.status = status
+        self.headers = headers or {}
+
+
+class HTTPPool:
+    """Keep-alive ``http.client`` connections shared by every OSINT lookup.
+
+    Connections are pooled per (scheme, host, port), up to ``max_idle`` idle
+    ones per host, and reused while the server keeps them open (a stale one
+    is retried once on a fresh connection). Responses are requested with
+    gzip and decoded incrementally; ``fetch_text`` hands the text to a
+    ``feed`` callback chunk by chunk and stops reading as soon as it returns
+    True. The rest of the body is then drained when it is small (so the
+    connection can be reused) and the connection is closed otherwise.
+    """
+
+    def __init__(self, timeout=15.0, max_idle=4):
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self.lock = threading.Lock()
+        self.idle = {}  # (esquema, host, puerto) -> [conexión, ...]
+        self.ssl_context = ssl.create_default_context()
+        self.stats = {"requests": 0, "connections": 0, "reused": 0, "early_stops": 0}
+
+    def _connect(self, key):
+        with self.lock:
+            connections = self.idle.get(key)
+            if connections:
+                self.stats["reused"] += 1
+                return connections.pop(), True
+            self.stats["connections"] += 1
+        scheme, host, port = key
+        if scheme == "https":
+            return http.client.HTTPSConnection(host, port, timeout=self.timeout, context=self.ssl_context), False
+        return http.client.HTTPConnection(host, port, timeout=self.timeout), False
+
+    def _release(self, key, connection):
+        with self.lock:
+            connections = self.idle.setdefault(key, [])
+            if len(connections) < self.max_idle:
+                connections.append(connection)
+                return
+        connection.close()
+
+    def _request(self, url, headers, timeout):
+        parts = urlsplit(url)
+        key = (parts.scheme, parts.hostname, parts.port or (443 if parts.scheme == "https" else 80))
+        path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        request_headers = {"User-Agent": USER_AGENT, "Accept-Encoding": "gzip", "Accept": "text/html,*/*"}
+        request_headers.update(headers or {})
+        with self.lock:
+            self.stats["requests"] += 1
+        while True:
+            connection, reused = self._connect(key)
+            connection.timeout = timeout or self.timeout
+            if connection.sock is not None:
+                connection.sock.settimeout(connection.timeout)
+            try:
+                connection.request("GET", path, headers=request_headers)
+                return key, connection, connection.getresponse()
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                connection.close()
+                if not reused:
+                    raise
+                # El servidor cerró la conexión ociosa: se reintenta con una nueva
+            except Exception:
+                connection.close()
+                raise
+
+    def fetch_text(self, url, feed=None, headers=None, max_bytes=MAX_BODY, timeout=None):
+        """GET ``url`` and return its text; with ``feed``, stream it and stop once ``feed(chunk)`` is True."""
+        key, connection, response = self._request(url, headers, timeout)
+        finished = False
+        try:
+            if response.status >= 400:
+                raise HTTPStatusError(response.status, response.reason, url, dict(response.getheaders()))
+            gzipped = response.getheader("Content-Encoding", "").lower() == "gzip"
+            inflater = zlib.decompressobj(16 + zlib.MAX_WBITS) if gzipped else None
+            content_type = response.getheader("Content-Type", "")
+            charset = content_type.partition("charset=")[2].split(";")[0].strip() or "utf-8"
+            decoder = codecs.getincrementaldecoder(charset)(errors="replace")
+            parts = []
+            received = 0
+            stopped = False
+            while received < max_bytes:
+                # read() al final deja la respuesta cerrada y la conexión lista para reutilizarse
+                raw = response.read1(CHUNK_SIZE) or response.read()
+                if not raw:
+                    break
+                received += len(raw)
+                text = decoder.decode(inflater.decompress(raw) if inflater else raw)
+                parts.append(text)
+                if feed is not None and feed(text):
+                    stopped = True
+                    break
+            if stopped or received >= max_bytes:
+                with self.lock:
+                    self.stats["early_stops"] += 1
+                if response.length is not None and response.length <= DRAIN_LIMIT:
+                    response.read()
+                    finished = not response.will_close
+            else:
+                parts.append(decoder.decode(inflater.flush() if inflater else b"", final=True))
+                finished = not response.will_close
+            return "".join(parts)
+        finally:
+            if finished:
+                self._release(key, connection)
+            else:
+                connection.close()
+
+    def close(self):
+        with self.lock:
+            connections = [connection for idle in self.idle.values() for connection in idle]
+            self.idle.clear()
+        for connection in connections:
+            connection.close()
+
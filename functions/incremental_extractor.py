@@ -0,0 +1,98 @@
+from collections import Counter
+
+from functions.ioc_extractor import FIELD_RE, KIND_LABELS, iter_iocs
+
+
+def extract_line(line):
+    """Fields and indicators found on one line, as a tuple of (label, value)."""
+    found = [(match.group("key").strip(), match.group("value")) for match in FIELD_RE.finditer(line)]
+    found.extend((KIND_LABELS[kind], value) for kind, value, start, end in iter_iocs(line))
+    return tuple(found)
+
+
+class IncrementalExtractor:
+    """Per-line cache of extraction results for a document that is edited in place.
+
+    ``lines[i]`` holds what line ``i`` produced, or None while it is dirty.
+    ``splice`` mirrors an edit (some lines replaced by others) and only records
+    the dirty range; ``take_dirty_ranges`` + ``update`` extract those lines
+    again. Aggregated counts are kept per label, and the labels whose values
+    changed are collected until ``take_changes`` is called, so the cost of an
+    edit depends on the lines it touched and not on the document size.
+    """
+
+    def __init__(self):
+        self.lines = []
+        self.dirty = []
+        self.counts = {}
+        self.changed = set()
+
+    def reset(self, text):
+        """Extract a whole document from scratch."""
+        self.changed.update(self.counts)
+        self.counts = {}
+        self.dirty = []
+        lines = text.split("\n")
+        self.lines = [None] * len(lines)
+        self.update(0, lines)
+
+    def splice(self, start, old_count, new_count):
+        """Replace ``old_count`` lines at ``start`` with ``new_count`` dirty lines."""
+        old_end = start + old_count
+        for entry in self.lines[start:old_end]:
+            if entry:
+                self._apply(entry, -1)
+        self.lines[start:old_end] = [None] * new_count
+
+        # Los rangos sucios pendientes se desplazan o se funden con el nuevo
+        shift = new_count - old_count
+        new_start, new_end = start, start + new_count
+        ranges = []
+        for low, high in self.dirty:
+            if high < start:
+                ranges.append((low, high))
+            elif low > old_end:
+                ranges.append((low + shift, high + shift))
+            else:
+                new_start = min(new_start, low)
+                new_end = max(new_end, high + shift if high > old_end else new_end)
+        ranges.append((new_start, new_end))
+        self.dirty = sorted(ranges)
+
+    def take_dirty_ranges(self):
+        """Pending dirty line ranges as (start, end) pairs, end exclusive."""
+        ranges, self.dirty = self.dirty, []
+        return [(low, high) for low, high in ranges if high > low]
+
+    def update(self, start, lines):
+        """Store fresh results for ``lines``, which begin at line ``start``."""
+        for offset, line in enumerate(lines):
+            entry = extract_line(line)
+            previous = self.lines[start + offset]
+            if previous:
+                self._apply(previous, -1)
+            self.lines[start + offset] = entry
+            if entry:
+                self._apply(entry, 1)
+
+    def _apply(self, entry, delta):
+        counts = self.counts
+        for label, value in entry:
+            values = counts.get(label)
+            if values is None:
+                values = counts[label] = Counter()
+            values[value] += delta
+            if values[value] <= 0:
+                del values[value]
+                if not values:
+                    del counts[label]
+            self.changed.add(label)
+
+    def take_changes(self):
+        """Labels changed since the last call, mapped to ``{value: count}`` (empty if gone)."""
+        changed, self.changed = self.changed, set()
+        return {label: dict(self.counts.get(label, {})) for label in changed}
+
+    def results(self):
+        """Every label with its distinct values and how often each occurs."""
+        return {label: dict(values) for label, values in self.counts.items()}
@@ -0,0 +1,177 @@
+import ipaddress
+import re
+from collections import Counter
+
+# Separadores en forma normal o "defang": 1[.]2[.]3[.]4, user[at]mail[.]com, hxxp[:]//
+DOT = r"(?:\[\.\]|\(\.\)|\{\.\}|\[dot\]|\(dot\)|\.)"
+AT = r"(?:\[@\]|\[at\]|\(at\)|@)"
+SCHEME = r"(?:h(?:tt|xx|\[tt\]|\[xx\])ps?|s?ftp|fxp)(?:\[:\]|:)//"
+
+OCTET = r"(?:25[0-5]|2[0-4]\d|1\d\d|[1-9]?\d)"
+IPV4 = rf"{OCTET}(?:{DOT}{OCTET}){{3}}"
+IPV6 = (
+    r"(?:[0-9a-f]{1,4}:){7}[0-9a-f]{1,4}"
+    r"|(?:[0-9a-f]{1,4}:){1,7}:(?:[0-9a-f]{1,4}(?::[0-9a-f]{1,4}){0,5})?"
+    r"|::[0-9a-f]{1,4}(?::[0-9a-f]{1,4}){0,6}"
+)
+LABEL = r"[a-z0-9](?:[a-z0-9-]{0,61}[a-z0-9])?"
+DOMAIN = rf"(?:{LABEL}{DOT})+[a-z]{{2,24}}"
+
+# Un único patrón con grupos nombrados: el texto se recorre una sola vez. Solo se
+# prueban las alternativas al inicio de una palabra, y las variantes que comparten
+# forma (IPv4/CIDR, MD5/SHA1/SHA256) van en un mismo grupo y se separan después.
+IOC_RE = re.compile(
+    rf"""
+    (?<!\w)(?:
+      (?P<url>{SCHEME}[^\s"'<>`]+)
+    | (?P<ipv4>(?<!\.){IPV4}(?:/(?:3[0-2]|[12]?\d))?(?!\w|\.\d))
+    | (?P<hash>[a-f0-9]{{32}}(?:[a-f0-9]{{8}}(?:[a-f0-9]{{24}})?)?\b)
+    | (?P<cve>CVE-\d{{4}}-\d{{4,7}}\b)
+    | (?P<ipv6>(?<!:)(?:{IPV6})(?:/\d{{1,3}})?(?![\w:]|\.\d))
+    | (?P<path>[a-z]:\\[^\s"'<>|*?]+|(?<![/.:])/(?:[\w.-]+/)+[\w.-]+)
+    | (?P<email>[a-z0-9._%+-]+{AT}{DOMAIN}\b)
+    | (?P<domain>(?<![@.-]){DOMAIN}\b(?![.-]?\w|\[\.\]|\(\.\)))
+    )
+    """,
+    re.IGNORECASE | re.VERBOSE,
+)
+HASH_KINDS = {32: "md5", 40: "sha1", 64: "sha256"}
+
+DEFANG_TOKEN_RE = re.compile(r"\[\.\]|\(\.\)|\{\.\}|\[dot\]|\(dot\)|\[@\]|\[at\]|\(at\)|\[:\]|\[tt\]|\[xx\]|hxxp|fxp", re.IGNORECASE)
+DEFANG_TOKENS = {
+    "[.]": ".", "(.)": ".", "{.}": ".", "[dot]": ".", "(dot)": ".",
+    "[@]": "@", "[at]": "@", "(at)": "@", "[:]": ":", "[tt]": "tt", "[xx]": "tt",
+    "hxxp": "http", "fxp": "ftp",
+}
+URL_TRAILING = ".,;:!?)]}'\""
+
+# Extensiones de archivo que el patrón de dominio confundiría con un TLD
+FILE_EXTENSIONS = frozenset(
+    "exe dll sys bat cmd ps1 psm1 vbs js jse hta lnk msi scr txt log csv tsv json xml yml yaml ini cfg conf "
+    "tmp bak dat db doc docx xls xlsx xlsm ppt pptx pdf rtf zip rar gz tgz tar 7z iso img png jpg jpeg gif "
+    "bmp svg htm html php asp aspx jsp py sh rb pl jar class so dylib evtx pcap eml msg".split()
+)
+
+KINDS = ("url", "email", "ipv4", "ipv6", "cidr", "domain", "md5", "sha1", "sha256", "cve", "path")
+KIND_LABELS = {
+    "url": "URL",
+    "email": "Email",
+    "ipv4": "IPv4",
+    "ipv6": "IPv6",
+    "cidr": "CIDR",
+    "domain": "Domain",
+    "md5": "MD5",
+    "sha1": "SHA1",
+    "sha256": "SHA256",
+    "cve": "CVE",
+    "path": "File Path",
+}
+
+# Campos "clave: valor" al inicio de línea (Ticket Number: ..., Account: ...)
+FIELD_RE = re.compile(r"^[ \t#]*(?P<key>[^\n:#][^\n:]{0,79}?)[ \t]*:[ \t]*(?P<value>\S[^\n]*?)[ \t]*$", re.MULTILINE)
+
+
+def refang(text):
+    """Undo defang notation (``[.]``, ``[at]``, ``hxxp`` ...)."""
+    return DEFANG_TOKEN_RE.sub(lambda m: DEFANG_TOKENS[m.group(0).lower()], text)
+
+
+def normalize_ioc(kind, raw):
+    """Canonical form of an indicator, or None if it turns out not to be valid."""
+    value = refang(raw)
+    if kind == "url":
+        value = value.rstrip(URL_TRAILING)
+        scheme, sep, rest = value.partition("://")
+        host, slash, tail = rest.partition("/")
+        return f"{scheme.lower()}{sep}{host.lower()}{slash}{tail}"
+    if kind in ("domain", "email"):
+        value = value.lower().rstrip(".")
+        if kind == "domain" and value.rsplit(".", 1)[-1] in FILE_EXTENSIONS:
+            return None
+        return value
+    if kind in ("md5", "sha1", "sha256"):
+        return value.lower()
+    if kind == "cve":
+        return value.upper()
+    if kind == "ipv6":
+        # "a::b", "Foo::add" y demás nombres de C++/Ruby/Perl son hex válido: se exige algún dígito
+        if not any(char.isdigit() for char in value.partition("/")[0]):
+            return None
+        try:
+            if "/" in value:
+                return str(ipaddress.IPv6Network(value, strict=False))
+            return str(ipaddress.IPv6Address(value))
+        except ValueError:
+            return None
+    if kind == "cidr":
+        try:
+            return str(ipaddress.IPv4Network(value, strict=False))
+        except ValueError:
+            return None
+    if kind == "path":
+        return value.rstrip(URL_TRAILING)
+    return value
+
+
+def iter_iocs(text):
+    """Yield ``(kind, value, start, end)`` for every indicator in ``text``, in order.
+
+    ``value`` is normalized (refanged, lowercased where case does not matter);
+    ``start``/``end`` delimit the raw match in ``text``.
+    """
+    # Los logs repiten mucho los mismos indicadores: se normaliza cada forma una sola vez
+    normalized = {}
+    for match in IOC_RE.finditer(text):
+        group = match.lastgroup
+        raw = match.group(group)
+        cached = normalized.get(raw)
+        if cached is None:
+            kind = group
+            if kind == "hash":
+                kind = HASH_KINDS[len(raw)]
+            elif kind == "ipv4" and "/" in raw:
+                kind = "cidr"
+            cached = normalized[raw] = (kind, normalize_ioc(kind, raw))
+        kind, value = cached
+        if value:
+            yield kind, value, match.start(), match.end()
+
+
+def classify_indicator(text):
+    """``(kind, value)`` of the indicator typed in ``text``, or None.
+
+    An indicator spanning the whole (trimmed) text wins; otherwise the first
+    one found, so "IP: 1.2.3.4" still classifies as IPv4.
+    """
+    text = text.strip()
+    found = None
+    for kind, value, start, end in iter_iocs(text):
+        if start == 0 and end == len(text):
+            return kind, value
+        if found is None:
+            found = (kind, value)
+    return found
+
+
+def extract_iocs(text):
+    """Deduplicated indicators by kind: ``{kind: [value, ...]}`` in first-seen order."""
+    found = {}
+    for kind, value, start, end in iter_iocs(text):
+        found.setdefault(kind, {})[value] = None
+    return {kind: list(values) for kind, values in found.items()}
+
+
+def count_iocs(text):
+    """Occurrences per indicator: ``{kind: Counter(value -> count)}``."""
+    counts = {}
+    for kind, value, start, end in iter_iocs(text):
+        counts.setdefault(kind, Counter())[value] += 1
+    return counts
+
+
+def parse_fields(text):
+    """``key: value`` lines as ``{key: [value, ...]}``; keys keep their first-seen order."""
+    fields = {}
+    for match in FIELD_RE.finditer(text):
+        fields.setdefault(match.group("key").strip(), []).append(match.group("value"))
+    return fields
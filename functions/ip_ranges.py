@@ -0,0 +1,420 @@
+import csv
+import ipaddress
+import mmap
+import os
+import socket
+import struct
+import sys
+import time
+from bisect import bisect_right
+
+try:
+    import numpy
+except ImportError:  # numpy es opcional: sin él los lotes buscan IP por IP con bisect
+    numpy = None
+
+MAGIC = b"IPRANGE2"
+# magic, rangos v4, rangos v6, asignaciones v4, asignaciones v6, registros, bytes de texto, fecha
+HEADER = struct.Struct("<8sIIIIIIQ")
+RECORD = struct.Struct("<I2sxxII")  # ASN, país, desplazamiento y largo de la organización
+V6_KEY = 16
+
+START_COLUMNS = ("start_ip", "range_start", "ip_start", "first_ip", "start")
+END_COLUMNS = ("end_ip", "range_end", "ip_end", "last_ip", "end")
+NETWORK_COLUMNS = ("network", "cidr", "prefix", "subnet")
+ASN_COLUMNS = ("asn", "as_number", "autonomous_system_number", "as")
+ORG_COLUMNS = ("org", "organization", "as_description", "as_name", "autonomous_system_organization", "isp", "name")
+COUNTRY_COLUMNS = ("country", "country_code", "cc")
+
+
+def _parse_ip(text):
+    """``(version, integer)`` of an address; inet_pton is several times faster than ipaddress."""
+    text = text.strip()
+    try:
+        return 4, int.from_bytes(socket.inet_pton(socket.AF_INET, text), "big")
+    except OSError:
+        pass
+    try:
+        return 6, int.from_bytes(socket.inet_pton(socket.AF_INET6, text.partition("%")[0]), "big")
+    except OSError:
+        raise ValueError(f"'{text}' is not an IP address.") from None
+
+
+def _network_text(family, start, end):
+    """``start/prefix`` when the range is exactly one CIDR block, ``start - end`` otherwise."""
+    bits = 32 if family == socket.AF_INET else 128
+    first = socket.inet_ntop(family, start.to_bytes(bits // 8, "big"))
+    size = end - start + 1
+    if size & (size - 1) == 0 and start % size == 0:
+        return f"{first}/{bits - size.bit_length() + 1}"
+    return f"{first} - {socket.inet_ntop(family, end.to_bytes(bits // 8, 'big'))}"
+
+
+def _column(header, names):
+    for name in names:
+        if name in header:
+            return header.index(name)
+    return None
+
+
+def _parse_asn(value):
+    value = value.strip().upper()
+    if value.startswith("AS"):
+        value = value[2:]
+    return int(value) if value.isdigit() else 0
+
+
+def read_ranges(csv_path):
+    """Yield ``(version, start, end, asn, country, org)`` from an IP range CSV/TSV.
+
+    With a header, columns are found by name: start/end addresses or a CIDR
+    network, plus ASN, organization and country. Without one the
+    ip2asn layout is assumed: ``start, end, asn, country, description``.
+    """
+    with open(csv_path, newline="", encoding="utf-8", errors="replace") as file:
+        sample = file.read(64 * 1024)
+        file.seek(0)
+        delimiter = "\t" if sample.count("\t") > sample.count(",") else ","
+        reader = csv.reader(file, delimiter=delimiter)
+        first = next(reader, None)
+        if first is None:
+            return
+        header = [name.strip().lower() for name in first]
+        start_col = _column(header, START_COLUMNS)
+        network_col = _column(header, NETWORK_COLUMNS)
+        if start_col is None and network_col is None:
+            # Sin cabecera: formato ip2asn
+            columns = (0, 1, None, 2, 4, 3)
+            rows = [first]
+        else:
+            columns = (
+                start_col, _column(header, END_COLUMNS), network_col,
+                _column(header, ASN_COLUMNS), _column(header, ORG_COLUMNS), _column(header, COUNTRY_COLUMNS),
+            )
+            rows = []
+        start_col, end_col, network_col, asn_col, org_col, country_col = columns
+
+        for row in _chain(rows, reader):
+            if not row or row[0].startswith("#"):
+                continue
+            try:
+                if network_col is not None:
+                    network = ipaddress.ip_network(row[network_col].strip(), strict=False)
+                    version, start = network.version, int(network.network_address)
+                    end = int(network.broadcast_address)
+                else:
+                    version, start = _parse_ip(row[start_col])
+                    end_version, end = _parse_ip(row[end_col])
+                    if end_version != version:
+                        continue
+            except (ValueError, IndexError):
+                continue  # Filas mal formadas o comentarios
+            if end < start:
+                continue
+            asn = _parse_asn(row[asn_col]) if asn_col is not None and asn_col < len(row) else 0
+            org = row[org_col].strip() if org_col is not None and org_col < len(row) else ""
+            country = row[country_col].strip().upper() if country_col is not None and country_col < len(row) else ""
+            if len(country) != 2 or not country.isalpha():
+                country = ""  # "None", "-" o vacío en los volcados públicos
+            yield version, start, end, asn, country, org
+
+
+def _chain(first_rows, reader):
+    yield from first_rows
+    yield from reader
+
+
+def _compact(ranges):
+    """Flatten ``(start, end, record)`` ranges into sorted, non-overlapping ones.
+
+    A range nested in another (a more specific allocation) wins over it
+    and splits it; on partial overlaps the range that starts later wins.
+    Adjacent ranges of the same record are merged.
+    """
+    compacted = []
+
+    def emit(start, end, record):
+        if start > end:
+            return
+        if compacted and compacted[-1][2] == record and compacted[-1][1] + 1 == start:
+            compacted[-1][1] = end
+        else:
+            compacted.append([start, end, record])
+
+    stack = []  # Rangos abiertos (fin, registro), de afuera hacia adentro
+    cursor = 0
+    for start, end, record in sorted(ranges, key=lambda entry: (entry[0], -entry[1])):
+        while stack and stack[-1][0] < start:
+            outer_end, outer_record = stack.pop()
+            emit(cursor, outer_end, outer_record)
+            cursor = outer_end + 1
+        if stack:
+            emit(cursor, start - 1, stack[-1][1])
+        cursor = start
+        while stack and stack[-1][0] <= end:
+            stack.pop()  # Tapado por completo desde aquí por el rango nuevo
+        stack.append((end, record))
+    while stack:
+        outer_end, outer_record = stack.pop()
+        emit(cursor, outer_end, outer_record)
+        cursor = outer_end + 1
+    return compacted
+
+
+def _flatten(allocations):
+    """Compacted ranges pointing at the allocation that owns them, plus the allocations still used.
+
+    Each range keeps the index of its original row, so a lookup can report the
+    whole allocation and not the piece left after cutting out nested ones.
+    """
+    ranges = _compact((start, end, index) for index, (start, end, record) in enumerate(allocations))
+    used = {}
+    for entry in ranges:
+        entry[2] = used.setdefault(entry[2], len(used))
+    return ranges, [allocations[index] for index in used]
+
+
+def import_csv(csv_path, db_path):
+    """Build the binary range file ``db_path`` from ``csv_path``; returns counts and timing."""
+    started = time.perf_counter()
+    records = {}
+    allocations = {4: [], 6: []}
+    rows = 0
+    for version, start, end, asn, country, org in read_ranges(csv_path):
+        rows += 1
+        key = (asn, country, org)
+        record = records.get(key)
+        if record is None:
+            record = records[key] = len(records)
+        allocations[version].append((start, end, record))
+    v4, v4_allocations = _flatten(allocations[4])
+    v6, v6_allocations = _flatten(allocations[6])
+
+    strings = bytearray()
+    packed_records = bytearray()
+    for asn, country, org in records:
+        org_bytes = org.encode("utf-8")
+        packed_records += RECORD.pack(asn, country.encode("ascii", "replace").ljust(2)[:2], len(strings), len(org_bytes))
+        strings += org_bytes
+
+    temp_path = db_path + ".tmp"
+    with open(temp_path, "wb") as file:
+        file.write(HEADER.pack(
+            MAGIC, len(v4), len(v6), len(v4_allocations), len(v6_allocations), len(records), len(strings), int(time.time())
+        ))
+        for table in (v4, v4_allocations):
+            for column in range(3):
+                file.write(struct.pack(f"<{len(table)}I", *(entry[column] for entry in table)))
+        for table in (v6, v6_allocations):
+            for column in range(2):
+                file.write(b"".join(entry[column].to_bytes(V6_KEY, "big") for entry in table))
+            file.write(struct.pack(f"<{len(table)}I", *(entry[2] for entry in table)))
+        file.write(packed_records)
+        file.write(strings)
+    os.replace(temp_path, db_path)
+    return {
+        "rows": rows,
+        "ipv4_ranges": len(v4),
+        "ipv6_ranges": len(v6),
+        "allocations": len(v4_allocations) + len(v6_allocations),
+        "records": len(records),
+        "bytes": os.path.getsize(db_path),
+        "seconds": time.perf_counter() - started,
+    }
+
+
+class IPRangeDB:
+    """Read-only, memory-mapped IP range -> (ASN, organization, country) table.
+
+    The file written by ``import_csv`` holds sorted, non-overlapping range
+    starts and ends as little-endian uint32 arrays (IPv4) and 16-byte
+    big-endian keys (IPv6). Each range points at the allocation (CSV row) it
+    came from, which keeps the original start, end and a deduplicated
+    record; results report that allocation as ``network``. IPv4 lookups are
+    one C-level ``bisect`` over a ``memoryview`` of the map; nothing is
+    parsed or loaded on open. ``lookup_many`` runs all IPv4 searches in one
+    ``numpy.searchsorted`` call when numpy is installed (bisect per address
+    otherwise) and decodes each allocation once per batch, however many
+    addresses fall into it.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._views = []
+        try:
+            (magic, self.v4_count, self.v6_count, v4_allocations, v6_allocations,
+             self.record_count, strings_len, self.built) = HEADER.unpack_from(self._map)
+        except struct.error:
+            magic = None
+        if magic != MAGIC:
+            self.close()
+            if magic is not None and magic.startswith(b"IPRANGE"):
+                raise ValueError(f"'{path}' was built by an older version; import the IP range CSV again.")
+            raise ValueError(f"'{path}' is not an IP range database.")
+        self._view = memoryview(self._map)
+        offset = HEADER.size
+        self.v4_starts, self.v4_ends, self.v4_allocations = (
+            self._uint32s(offset + i * self.v4_count * 4, self.v4_count) for i in range(3)
+        )
+        offset += 3 * self.v4_count * 4
+        self.v4_allocation_starts, self.v4_allocation_ends, self.v4_allocation_records = (
+            self._uint32s(offset + i * v4_allocations * 4, v4_allocations) for i in range(3)
+        )
+        offset += 3 * v4_allocations * 4
+        self.v6_starts_offset = offset
+        self.v6_ends_offset = offset + self.v6_count * V6_KEY
+        self.v6_allocations_offset = offset + 2 * self.v6_count * V6_KEY
+        offset = self.v6_allocations_offset + self.v6_count * 4
+        self.v6_allocation_starts_offset = offset
+        self.v6_allocation_ends_offset = offset + v6_allocations * V6_KEY
+        self.v6_allocation_records_offset = offset + 2 * v6_allocations * V6_KEY
+        self.records_offset = self.v6_allocation_records_offset + v6_allocations * 4
+        self.strings_offset = self.records_offset + self.record_count * RECORD.size
+
+    def _uint32s(self, offset, count):
+        if sys.byteorder == "little":
+            view = self._view[offset:offset + count * 4].cast("I")
+            self._views.append(view)
+            return view
+        return struct.unpack_from(f"<{count}I", self._map, offset)
+
+    def __len__(self):
+        return self.v4_count + self.v6_count
+
+    def record(self, index):
+        asn, country, org_offset, org_len = RECORD.unpack_from(self._map, self.records_offset + index * RECORD.size)
+        start = self.strings_offset + org_offset
+        return {
+            "asn": asn,
+            "country": country.decode("ascii").strip(),
+            "org": self._map[start:start + org_len].decode("utf-8"),
+        }
+
+    def _v6_key(self, index, offset):
+        start = offset + index * V6_KEY
+        return self._map[start:start + V6_KEY]
+
+    def _find_v6(self, value):
+        key = value.to_bytes(V6_KEY, "big")
+        low, high = 0, self.v6_count
+        while low < high:
+            middle = (low + high) // 2
+            if self._v6_key(middle, self.v6_starts_offset) <= key:
+                low = middle + 1
+            else:
+                high = middle
+        index = low - 1
+        if index >= 0 and key <= self._v6_key(index, self.v6_ends_offset):
+            return struct.unpack_from("<I", self._map, self.v6_allocations_offset + index * 4)[0]
+        return None
+
+    def _find_v4(self, value):
+        """Allocation owning the IPv4 integer ``value``, or None."""
+        index = bisect_right(self.v4_starts, value) - 1
+        if index >= 0 and value <= self.v4_ends[index]:
+            return self.v4_allocations[index]
+        return None
+
+    def _v4_result(self, allocation):
+        result = self.record(self.v4_allocation_records[allocation])
+        result["network"] = _network_text(
+            socket.AF_INET, self.v4_allocation_starts[allocation], self.v4_allocation_ends[allocation]
+        )
+        return result
+
+    def _v6_result(self, allocation):
+        record = struct.unpack_from("<I", self._map, self.v6_allocation_records_offset + allocation * 4)[0]
+        result = self.record(record)
+        start, end = (
+            int.from_bytes(self._v6_key(allocation, offset), "big")
+            for offset in (self.v6_allocation_starts_offset, self.v6_allocation_ends_offset)
+        )
+        result["network"] = _network_text(socket.AF_INET6, start, end)
+        return result
+
+    def lookup(self, ip):
+        """``{"network", "asn", "org", "country"}`` for ``ip`` (str or ip_address), or None.
+
+        ``network`` is the allocation as imported (a CIDR or a ``start - end``
+        range), even when a more specific allocation inside it was cut out.
+        """
+        version, value = _parse_ip(str(ip))
+        if version == 4:
+            allocation = self._find_v4(value)
+            return self._v4_result(allocation) if allocation is not None else None
+        allocation = self._find_v6(value)
+        return self._v6_result(allocation) if allocation is not None else None
+
+    def lookup_many(self, ips):
+        """``{ip: result or None}`` for a batch; invalid addresses map to None.
+
+        Addresses of the same allocation share one result dict.
+        """
+        results = {}
+        v4_ips = []
+        values = []
+        for ip in ips:
+            try:
+                version, value = _parse_ip(ip)
+            except ValueError:
+                results[ip] = None
+                continue
+            if version == 4:
+                v4_ips.append(ip)
+                values.append(value)
+            else:
+                results[ip] = self.lookup(ip)
+        if not values or not self.v4_count:
+            results.update(dict.fromkeys(v4_ips))
+            return results
+
+        if numpy is not None:
+            # Todas las búsquedas en una sola llamada vectorizada
+            queries = numpy.array(values, dtype=numpy.uint32)
+            indexes = numpy.searchsorted(numpy.frombuffer(self.v4_starts, dtype="<u4"), queries, side="right") - 1
+            misses = (indexes < 0) | (queries > numpy.frombuffer(self.v4_ends, dtype="<u4")[numpy.maximum(indexes, 0)])
+            indexes[misses] = -1
+            indexes = indexes.tolist()
+        else:
+            starts = self.v4_starts
+            ends = self.v4_ends
+            indexes = [bisect_right(starts, value) - 1 for value in values]
+            indexes = [index if index >= 0 and value <= ends[index] else -1 for index, value in zip(indexes, values)]
+        allocations = self.v4_allocations
+        found = {None: None}
+        for ip, index in zip(v4_ips, indexes):
+            allocation = allocations[index] if index >= 0 else None
+            result = found.get(allocation, False)
+            if result is False:
+                result = found[allocation] = self._v4_result(allocation)
+            results[ip] = result
+        return results
+
+    def close(self):
+        for view in self._views:
+            view.release()
+        if getattr(self, "_view", None) is not None:
+            self._view.release()
+        self._map.close()
+        self._file.close()
+
+
+def format_result(result):
+    """Popup fields of a lookup result."""
+    return {
+        "Network": result["network"],
+        "ASN": f"AS{result['asn']}" if result["asn"] else "N/A",
+        "Organization": result["org"] or "N/A",
+        "Country": result["country"] or "N/A",
+    }
+
+
+if __name__ == "__main__":
+    # Uso: python -m functions.ip_ranges archivo.csv [data/ip_ranges.bin]
+    if len(sys.argv) < 2:
+        sys.exit("usage: python -m functions.ip_ranges ranges.csv [data/ip_ranges.bin]")
+    summary = import_csv(sys.argv[1], sys.argv[2] if len(sys.argv) > 2 else os.path.join("data", "ip_ranges.bin"))
+    for name, value in summary.items():
+        print(f"{name}: {value:.2f}" if isinstance(value, float) else f"{name}: {value}")
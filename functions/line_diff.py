@@ -0,0 +1,63 @@
+import difflib
+import re
+
+HUNK_RE = re.compile(r"^@@ -(\d+)(,\d+)? \+(\d+)(,\d+)? @@")
+
+
+def _common_ends(old_lines, new_lines):
+    """Length of the common prefix and suffix of two line lists (they never overlap)."""
+    prefix = 0
+    limit = min(len(old_lines), len(new_lines))
+    while prefix < limit and old_lines[prefix] == new_lines[prefix]:
+        prefix += 1
+    suffix = 0
+    limit -= prefix
+    while suffix < limit and old_lines[-1 - suffix] == new_lines[-1 - suffix]:
+        suffix += 1
+    return prefix, suffix
+
+
+def line_diff(old_lines, new_lines):
+    """Edit script turning ``old_lines`` into ``new_lines``: ``[[start, end, [lines]], ...]``.
+
+    The common prefix and suffix are trimmed first (O(n)), so difflib only
+    compares the few lines an edit actually touched.
+    """
+    prefix, suffix = _common_ends(old_lines, new_lines)
+    old_mid = old_lines[prefix:len(old_lines) - suffix]
+    new_mid = new_lines[prefix:len(new_lines) - suffix]
+
+    ops = []
+    matcher = difflib.SequenceMatcher(None, old_mid, new_mid, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag != "equal":
+            ops.append([prefix + i1, prefix + i2, new_mid[j1:j2]])
+    return ops
+
+
+def apply_diff(lines, ops):
+    """Apply ``line_diff`` ops in place; offsets refer to the lines before the edit."""
+    for start, end, replacement in reversed(ops):
+        lines[start:end] = replacement
+    return lines
+
+
+def unified_diff(old_lines, new_lines, old_label="a", new_label="b", context=3):
+    """Unified diff lines (without line terminators).
+
+    Only the region between the common prefix and suffix, plus ``context``
+    lines, goes through difflib; hunk headers are shifted back to the real
+    line numbers.
+    """
+    prefix, suffix = _common_ends(old_lines, new_lines)
+    offset = max(0, prefix - context)
+    old_window = old_lines[offset:len(old_lines) - max(0, suffix - context)]
+    new_window = new_lines[offset:len(new_lines) - max(0, suffix - context)]
+
+    def shift(match):
+        old_start = int(match.group(1)) + offset
+        new_start = int(match.group(3)) + offset
+        return f"@@ -{old_start}{match.group(2) or ''} +{new_start}{match.group(4) or ''} @@"
+
+    for line in difflib.unified_diff(old_window, new_window, old_label, new_label, n=context, lineterm=""):
+        yield HUNK_RE.sub(shift, line, count=1) if line.startswith("@@") else line
@@ -0,0 +1,87 @@
+import html as html_lib
+import re
+
+# Campos de la tabla "IP info" de AbuseIPDB
+ABUSEIPDB_FIELDS = ("ISP", "Usage Type", "ASN", "Domain Name", "Country", "City")
+# Una sola expresión para los seis campos: una pasada sobre la página en lugar de seis
+ABUSEIPDB_ROW_RE = re.compile(
+    r"<th>\s*(?P<field>" + "|".join(re.escape(field) for field in ABUSEIPDB_FIELDS) + r")\s*</th>\s*<td>\s*(?P<value>.*?)\s*</td>",
+    re.IGNORECASE | re.DOTALL,
+)
+TABLE_END_RE = re.compile(r"</table>", re.IGNORECASE)
+TITLE_RE = re.compile(r"<title[^>]*>(.*?)</title>", re.IGNORECASE | re.DOTALL)
+
+
+class AbuseIPDBParser:
+    """Incremental parser of the AbuseIPDB "IP info" table.
+
+    ``feed`` takes the page as it streams in and returns True once the table
+    is complete (all fields found, or the table closed), so the caller can
+    stop downloading the rest of the page.
+    """
+
+    def __init__(self):
+        self.text = ""
+        self.position = 0
+        self.found = {}
+        self.done = False
+
+    def feed(self, chunk):
+        self.text += chunk
+        while not self.done:
+            match = ABUSEIPDB_ROW_RE.search(self.text, self.position)
+            if not match:
+                break
+            field = next(name for name in ABUSEIPDB_FIELDS if name.lower() == match.group("field").lower())
+            self.found.setdefault(field, match.group("value").strip())
+            self.position = match.end()
+            self.done = len(self.found) == len(ABUSEIPDB_FIELDS)
+        if self.found and not self.done and TABLE_END_RE.search(self.text, self.position):
+            self.done = True
+        # Lo ya analizado no se vuelve a recorrer
+        self.text = self.text[self.position:]
+        self.position = 0
+        return self.done
+
+    def result(self):
+        if not self.found:
+            return None
+        return {field: self.found.get(field, "N/A") for field in ABUSEIPDB_FIELDS}
+
+
+def parse_abuseipdb(html):
+    """ISP, usage type, ASN, domain, country and city from an AbuseIPDB check page, or None."""
+    parser = AbuseIPDBParser()
+    parser.feed(html)
+    return parser.result()
+
+
+def parse_title(html):
+    """Page title, for providers without a dedicated parser."""
+    match = TITLE_RE.search(html)
+    if not match:
+        return None
+    title = " ".join(html_lib.unescape(match.group(1)).split())
+    return {"Title": title} if title else None
+
+
+# Valor de "parser" en osint.json -> función
+PARSERS = {
+    "abuseipdb": parse_abuseipdb,
+    "title": parse_title,
+}
+# Parsers incrementales: permiten cortar la descarga en cuanto tienen los datos
+STREAM_PARSERS = {
+    "abuseipdb": AbuseIPDBParser,
+}
+
+
+def parser_for(tool):
+    return PARSERS.get(tool.get("parser", "title"), parse_title)
+
+
+def summarize(data):
+    """One-line summary of a parser result for tables."""
+    if not data:
+        return "No data"
+    return "; ".join(f"{key}: {value}" for key, value in data.items() if value and value != "N/A")
@@ -0,0 +1,49 @@
+from urllib.parse import quote
+
+# Alias de osint.json ("kinds" y claves de "urls") -> tipos del motor de IOCs
+KIND_ALIASES = {
+    "ip": ("ipv4", "ipv6"),
+    "hash": ("md5", "sha1", "sha256"),
+}
+PLACEHOLDER = "{0}"
+
+
+def expand_kinds(kinds):
+    expanded = set()
+    for kind in kinds:
+        expanded.update(KIND_ALIASES.get(kind, (kind,)))
+    return expanded
+
+
+def tool_kinds(tool):
+    """Indicator kinds a tool declares, through ``kinds`` or the keys of ``urls``."""
+    return expand_kinds(tool.get("kinds", ())) | expand_kinds(tool.get("urls", {}))
+
+
+def supports(tool, kind):
+    return kind in tool_kinds(tool)
+
+
+def relevant_tools(tools, kind):
+    """Tools with a URL for ``kind``, in osint.json order."""
+    return [tool for tool in tools if supports(tool, kind)]
+
+
+def url_template(tool, kind=None):
+    """The ``urls`` template for ``kind`` (by exact kind, then alias), falling back to ``generate_url``."""
+    urls = tool.get("urls", {})
+    if kind is not None:
+        if kind in urls:
+            return urls[kind]
+        for alias, kinds in KIND_ALIASES.items():
+            if kind in kinds and alias in urls:
+                return urls[alias]
+    return tool["generate_url"]
+
+
+def build_url(tool, indicator, kind=None):
+    """URL of ``tool`` for ``indicator``: ``{0}`` is replaced (URL-encoded), a bare prefix is concatenated."""
+    template = url_template(tool, kind)
+    if PLACEHOLDER in template:
+        return template.replace(PLACEHOLDER, quote(indicator, safe="@:"))
+    return template + indicator
@@ -0,0 +1,167 @@
+import glob
+import json
+import os
+import time
+
+from functions.line_diff import apply_diff, line_diff
+
+try:
+    import msvcrt
+except ImportError:  # POSIX: bloqueo con fcntl
+    msvcrt = None
+    import fcntl
+
+
+def _try_lock(file):
+    """Take a non-blocking exclusive lock on ``file``; OSError if another handle holds it."""
+    if msvcrt is not None:
+        file.seek(0)
+        msvcrt.locking(file.fileno(), msvcrt.LK_NBLCK, 1)
+    else:
+        fcntl.flock(file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+
+
+class RecoveryJournal:
+    """Per-session crash-recovery log of the editor buffer and the timer state.
+
+    Each ``record`` appends one JSON line: a full ``checkpoint`` every
+    ``checkpoint_every`` records (or when the diffs outgrow the text), and a
+    line ``diff`` against the previous state otherwise. A checkpoint rewrites
+    the file with just itself, so recovery never replays more than
+    ``checkpoint_every`` diffs. ``close`` removes the file. While the session
+    runs it holds a lock on ``<journal>.lock``: a journal whose lock can be
+    taken belongs to a session that did not exit cleanly, one whose lock is
+    held to another instance that is still running.
+    Not thread-safe: records must come from a single worker (the serial pool).
+    """
+
+    def __init__(self, directory="./data/recovery", checkpoint_every=50):
+        self.directory = directory
+        self.checkpoint_every = checkpoint_every
+        self.path = os.path.join(directory, f"session-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}.jsonl")
+        self.lines = None
+        self.timer = None
+        self.records = 0
+        self.diff_bytes = 0
+        self.text_bytes = 0
+        self._file = None
+        # El lock dura toda la sesión: otras instancias no tocan este journal
+        os.makedirs(directory, exist_ok=True)
+        self._lock_file = open(self.path + ".lock", "a+")
+        try:
+            _try_lock(self._lock_file)
+        except OSError:
+            pass
+
+    def record(self, text, timer):
+        """Store the current state; returns False if nothing changed since the last record."""
+        lines = text.split("\n")
+        if self.lines is None or self.records >= self.checkpoint_every or self.diff_bytes > self.text_bytes:
+            self._checkpoint(lines, timer)
+            return True
+
+        ops = line_diff(self.lines, lines)
+        if not ops and timer == self.timer:
+            return False
+        entry = {"type": "diff", "time": time.time(), "ops": ops}
+        if timer != self.timer:
+            entry["timer"] = timer
+        line = json.dumps(entry) + "\n"
+        self._write(line)
+        self.lines = lines
+        self.timer = timer
+        self.records += 1
+        self.diff_bytes += len(line)
+        return True
+
+    def _checkpoint(self, lines, timer):
+        os.makedirs(self.directory, exist_ok=True)
+        line = json.dumps({"type": "checkpoint", "time": time.time(), "lines": lines, "timer": timer}) + "\n"
+        if self._file:
+            self._file.close()
+        temp_path = self.path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as file:
+            file.write(line)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_path, self.path)
+        self._file = open(self.path, "a", encoding="utf-8")
+        self.lines = lines
+        self.timer = timer
+        self.records = 0
+        self.diff_bytes = 0
+        self.text_bytes = len(line)
+
+    def _write(self, line):
+        self._file.write(line)
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self, discard=True):
+        """End the session; with ``discard`` the journal is deleted (clean exit)."""
+        if self._file:
+            self._file.close()
+            self._file = None
+        if discard and os.path.exists(self.path):
+            os.remove(self.path)
+        if self._lock_file:
+            self._lock_file.close()
+            self._lock_file = None
+            if discard:
+                os.remove(self.path + ".lock")
+
+    # Recuperación
+    @staticmethod
+    def leftover_sessions(directory="./data/recovery"):
+        """Journals left by sessions that did not close, newest first.
+
+        Journals of instances that are still running (their lock is held) are skipped.
+        """
+        leftovers = [path for path in glob.glob(os.path.join(directory, "session-*.jsonl")) if not RecoveryJournal.in_use(path)]
+        return sorted(leftovers, key=os.path.getmtime, reverse=True)
+
+    @staticmethod
+    def in_use(path):
+        """True if a running session holds the lock of the journal ``path``."""
+        lock_path = path + ".lock"
+        if not os.path.exists(lock_path):
+            return False  # Journal sin lock: de una versión anterior, nadie lo usa
+        try:
+            with open(lock_path, "a+") as file:
+                _try_lock(file)  # Se libera al cerrar el archivo
+        except OSError:
+            return True
+        return False
+
+    @staticmethod
+    def discard(paths):
+        """Delete leftover journals (and their lock files) once they are no longer needed."""
+        for path in paths:
+            for name in (path, path + ".lock"):
+                try:
+                    os.remove(name)
+                except FileNotFoundError:
+                    pass
+
+    @staticmethod
+    def recover(path):
+        """Rebuild ``(text, timer, saved_at)`` from a journal; None if it has no checkpoint."""
+        lines = None
+        timer = None
+        saved_at = None
+        with open(path, "r", encoding="utf-8") as file:
+            for raw in file:
+                try:
+                    entry = json.loads(raw)
+                except json.JSONDecodeError:
+                    break  # Última línea truncada por el cierre abrupto
+                if entry["type"] == "checkpoint":
+                    lines = entry["lines"]
+                    timer = entry.get("timer")
+                elif lines is not None:
+                    apply_diff(lines, entry["ops"])
+                    timer = entry.get("timer", timer)
+                saved_at = entry.get("time")
+        if lines is None:
+            return None
+        return "\n".join(lines), timer, saved_at
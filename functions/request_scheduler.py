@@ -0,0 +1,290 @@
+import heapq
+import itertools
+import random
+import threading
+import time
+from concurrent.futures import Future, InvalidStateError, ThreadPoolExecutor
+
+INTERACTIVE = 0  # Consultas que el analista está esperando
+BULK = 10  # Enriquecimiento masivo: solo usa la cuota que sobra
+
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_BACKOFF = 1.0
+MAX_BACKOFF = 60.0
+
+
+class TokenBucket:
+    """``rate`` requests per second with bursts of up to ``burst``."""
+
+    def __init__(self, rate, burst, clock=time.monotonic):
+        self.rate = rate
+        self.capacity = max(1.0, float(burst))
+        self.tokens = self.capacity
+        self.clock = clock
+        self.updated = clock()
+        self.paused_until = 0.0
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, now):
+        """Seconds until a request may be sent (0 when a token is available now)."""
+        self._refill(now)
+        pause = max(0.0, self.paused_until - now)
+        if self.tokens >= 1:
+            return pause
+        return max(pause, (1 - self.tokens) / self.rate)
+
+    def take(self, now):
+        self._refill(now)
+        self.tokens -= 1
+
+    def pause(self, seconds, now):
+        """Stop sending for ``seconds`` (the provider answered 429) and restart with an empty bucket."""
+        self._refill(now)
+        self.paused_until = max(self.paused_until, now + seconds)
+        self.tokens = min(self.tokens, 0.0)
+
+
+def bucket_from_config(tool, clock=time.monotonic):
+    """TokenBucket for an osint.json entry with ``"rate_limit": {"per_minute": n, "burst": b}``, or None."""
+    limit = tool.get("rate_limit")
+    if not limit or not limit.get("per_minute"):
+        return None
+    return TokenBucket(limit["per_minute"] / 60.0, limit.get("burst", 1), clock)
+
+
+class _Job:
+    def __init__(self, provider, key, func, priority):
+        self.provider = provider
+        self.key = key
+        self.func = func
+        self.priority = priority
+        self.state = "queued"  # queued -> running -> (delayed -> queued ...) -> done
+        self.attempts = 0
+        self.waiters = []
+
+    def abandoned(self):
+        return all(waiter.cancelled() for waiter in self.waiters)
+
+
+class RequestScheduler:
+    """Provider-aware scheduler for outgoing OSINT requests.
+
+    Every provider has a token bucket (``rate_limit`` in osint.json; no
+    limit when absent) and its own priority queue, so interactive lookups
+    jump ahead of queued bulk ones without a throttled provider holding up
+    the others. A dispatcher thread hands the best ready request to one of
+    ``workers`` threads. Identical requests (same provider and key) that are
+    queued or running are coalesced into one call; every caller gets its
+    own Future, so cancelling one caller does not affect the rest. 429 and
+    5xx answers (exceptions with a ``status``) are retried up to
+    ``max_retries`` times with full-jitter exponential backoff, honouring
+    ``Retry-After``; a 429 also pauses the provider's bucket.
+    """
+
+    def __init__(self, workers=6, clock=time.monotonic, rng=None):
+        self.workers = workers
+        self.clock = clock
+        self.rng = rng or random.Random()
+        self.condition = threading.Condition()
+        self.sequence = itertools.count()
+        self.buckets = {}
+        self.retry_limits = {}
+        self.queues = {}  # proveedor -> heap [(prioridad, secuencia, job)]
+        self.delayed = []  # heap [(listo_en, secuencia, job)] de reintentos en espera
+        self.inflight = {}  # (proveedor, clave) -> job
+        self.running = 0
+        self.closed = False
+        self.dispatcher = None
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="osint")
+        self.counters = {}
+
+    def configure(self, tools):
+        """Apply ``rate_limit`` / ``max_retries`` of every osint.json entry (tools without them are unlimited)."""
+        with self.condition:
+            for tool in tools:
+                name = tool["name"]
+                bucket = bucket_from_config(tool, self.clock)
+                old = self.buckets.get(name)
+                if bucket is None:
+                    self.buckets.pop(name, None)
+                elif old is None or (old.rate, old.capacity) != (bucket.rate, bucket.capacity):
+                    self.buckets[name] = bucket
+                self.retry_limits[name] = tool.get("max_retries", DEFAULT_MAX_RETRIES)
+            self.condition.notify_all()
+
+    def _count(self, provider, counter, amount=1):
+        counters = self.counters.setdefault(
+            provider, {"requests": 0, "coalesced": 0, "retries": 0, "failures": 0, "throttled": 0}
+        )
+        counters[counter] += amount
+
+    def stats(self):
+        with self.condition:
+            queued = {provider: len(queue) for provider, queue in self.queues.items()}
+            return {
+                provider: dict(counters, queued=queued.get(provider, 0))
+                for provider, counters in self.counters.items()
+            }
+
+    # Encolado
+    def submit(self, provider, key, func, priority=INTERACTIVE):
+        """Schedule ``func()`` for ``provider``; returns a Future with its result.
+
+        ``key`` identifies the request (normally its URL) for coalescing.
+        """
+        waiter = Future()
+        with self.condition:
+            if self.closed:
+                raise RuntimeError("The request scheduler is closed.")
+            job = self.inflight.get((provider, key))
+            if job is not None:
+                self._count(provider, "coalesced")
+                if priority < job.priority and job.state == "queued":
+                    # Un pedido interactivo sube de prioridad al masivo ya encolado
+                    job.priority = priority
+                    heapq.heappush(self.queues[provider], (priority, next(self.sequence), job))
+                elif priority < job.priority:
+                    job.priority = priority
+            else:
+                job = self.inflight[(provider, key)] = _Job(provider, key, func, priority)
+                heapq.heappush(self.queues.setdefault(provider, []), (priority, next(self.sequence), job))
+            job.waiters.append(waiter)
+            if self.dispatcher is None:
+                self.dispatcher = threading.Thread(target=self._dispatch_loop, name="osint-dispatcher", daemon=True)
+                self.dispatcher.start()
+            self.condition.notify_all()
+        return waiter
+
+    # Despacho
+    def _dispatch_loop(self):
+        with self.condition:
+            while not self.closed:
+                now = self.clock()
+                while self.delayed and self.delayed[0][0] <= now:
+                    ready_at, seq, job = heapq.heappop(self.delayed)
+                    job.state = "queued"
+                    heapq.heappush(self.queues[job.provider], (job.priority, next(self.sequence), job))
+                timeout = self.delayed[0][0] - now if self.delayed else None
+                if self.running < self.workers:
+                    job, wait = self._next_job(now)
+                    if job is not None:
+                        self._start(job, now)
+                        continue
+                    if wait is not None:
+                        timeout = wait if timeout is None else min(timeout, wait)
+                self.condition.wait(timeout)
+
+    def _next_job(self, now):
+        """Best ready job over all providers, or ``(None, seconds until one could be ready)``."""
+        best = None
+        wait = None
+        for provider, queue in self.queues.items():
+            # Se descartan entradas viejas (prioridad cambiada, ya iniciadas o sin nadie esperando)
+            while queue:
+                priority, seq, job = queue[0]
+                if job.state == "queued" and priority == job.priority and not job.abandoned():
+                    break
+                heapq.heappop(queue)
+                if job.state == "queued" and job.abandoned():
+                    job.state = "done"
+                    self.inflight.pop((job.provider, job.key), None)
+            if not queue:
+                continue
+            bucket = self.buckets.get(provider)
+            delay = bucket.wait_time(now) if bucket else 0.0
+            if delay > 0:
+                wait = delay if wait is None else min(wait, delay)
+                continue
+            if best is None or queue[0][:2] < best[:2]:
+                best = queue[0]
+        return (best[2], None) if best else (None, wait)
+
+    def _start(self, job, now):
+        queue = self.queues[job.provider]
+        heapq.heappop(queue)
+        bucket = self.buckets.get(job.provider)
+        if bucket:
+            bucket.take(now)
+        job.state = "running"
+        self.running += 1
+        self._count(job.provider, "requests")
+        self.pool.submit(self._run, job)
+
+    def _run(self, job):
+        try:
+            result = job.func()
+        except Exception as error:
+            if not self._retry(job, error):
+                self._finish(job, error=error)
+        else:
+            self._finish(job, result=result)
+        finally:
+            with self.condition:
+                self.running -= 1
+                self.condition.notify_all()
+
+    def _retry(self, job, error):
+        status = getattr(error, "status", None)
+        if not status or not (status == 429 or status >= 500):
+            return False
+        with self.condition:
+            if self.closed or job.attempts >= self.retry_limits.get(job.provider, DEFAULT_MAX_RETRIES) or job.abandoned():
+                return False
+            delay = retry_after(error)
+            if delay is None:
+                delay = self.rng.uniform(0, min(MAX_BACKOFF, DEFAULT_BACKOFF * 2 ** job.attempts))
+            now = self.clock()
+            if status == 429:
+                self._count(job.provider, "throttled")
+                bucket = self.buckets.get(job.provider)
+                if bucket:
+                    bucket.pause(delay, now)
+            job.attempts += 1
+            job.state = "delayed"
+            self._count(job.provider, "retries")
+            heapq.heappush(self.delayed, (now + delay, next(self.sequence), job))
+            self.condition.notify_all()
+        return True
+
+    def _finish(self, job, result=None, error=None):
+        with self.condition:
+            job.state = "done"
+            self.inflight.pop((job.provider, job.key), None)
+            if error is not None:
+                self._count(job.provider, "failures")
+            waiters = list(job.waiters)
+        for waiter in waiters:
+            try:
+                if error is not None:
+                    waiter.set_exception(error)
+                else:
+                    waiter.set_result(result)
+            except InvalidStateError:
+                pass  # El que esperaba canceló
+
+    def close(self):
+        """Stop dispatching and cancel every request that has not started."""
+        with self.condition:
+            self.closed = True
+            pending = [job for job in self.inflight.values() if job.state != "running"]
+            self.inflight.clear()
+            self.queues.clear()
+            self.delayed.clear()
+            self.condition.notify_all()
+        for job in pending:
+            for waiter in job.waiters:
+                waiter.cancel()
+        self.pool.shutdown(wait=False, cancel_futures=True)
+
+
+def retry_after(error):
+    """Seconds from a numeric ``Retry-After`` header of ``error``, or None."""
+    headers = getattr(error, "headers", None) or {}
+    value = next((value for name, value in headers.items() if name.lower() == "retry-after"), None)
+    try:
+        return max(0.0, float(value)) if value is not None else None
+    except ValueError:
+        return None
@@ -0,0 +1,192 @@
+import json
+import os
+import struct
+import threading
+import time
+import zlib
+from collections import OrderedDict
+
+from functions.line_diff import apply_diff, line_diff, unified_diff
+
+FRAME = struct.Struct(">II")  # longitud de la cabecera JSON, longitud del payload
+
+
+class RevisionStore:
+    """Append-only revision chains of ticket bodies.
+
+    Each saved body becomes one frame in ``path``: a JSON header (ticket key,
+    revision number, kind, time, size) and a zlib payload. A revision is
+    stored as a line delta (``line_diff``) against the previous one; a full
+    keyframe is written instead once the deltas since the last keyframe
+    outweigh it or ``max_chain`` deltas have accumulated. So the file grows
+    with the edits and not with the number of saves, and rebuilding any
+    revision reads at most one keyframe plus deltas of about the same size.
+    Saving an unchanged body adds nothing. Renames and deletes are logged as
+    payload-less ``rename``/``drop`` frames. Headers are indexed in memory on
+    open; payloads are read on demand.
+    """
+
+    def __init__(self, path, max_chain=50, cache_size=64):
+        self.path = path
+        self.max_chain = max_chain
+        self.lock = threading.Lock()
+        self.chains = {}  # (ticket_number, client) -> [cabecera, ...]
+        self.latest = OrderedDict()  # clave -> líneas de la última revisión (LRU)
+        self.cache_size = cache_size
+        if not os.path.exists(path):
+            open(path, "wb").close()
+        self._file = open(path, "r+b")
+        self._load_index()
+
+    def _load_index(self):
+        self._file.seek(0)
+        offset = 0
+        while True:
+            frame = self._file.read(FRAME.size)
+            if len(frame) < FRAME.size:
+                break
+            header_len, payload_len = FRAME.unpack(frame)
+            raw_header = self._file.read(header_len)
+            if len(raw_header) < header_len:
+                break
+            header = json.loads(raw_header)
+            header["offset"] = offset + FRAME.size + header_len
+            header["length"] = payload_len
+            offset = header["offset"] + payload_len
+            if offset > os.fstat(self._file.fileno()).st_size:
+                break  # Frame incompleto por un cierre abrupto
+            self._file.seek(offset)
+            if header["kind"] == "rename":
+                self.chains[tuple(header["to"])] = self.chains.pop(tuple(header["key"]), [])
+            elif header["kind"] == "drop":
+                self.chains.pop(tuple(header["key"]), None)
+            else:
+                self.chains.setdefault(tuple(header["key"]), []).append(header)
+        # Se descarta cualquier resto truncado para que las escrituras sigan alineadas
+        self._file.truncate(offset)
+        self._size = offset
+
+    def _append(self, header, payload=b""):
+        raw_header = json.dumps(header).encode("utf-8")
+        self._file.seek(self._size)
+        self._file.write(FRAME.pack(len(raw_header), len(payload)) + raw_header + payload)
+        self._file.flush()
+        header["offset"] = self._size + FRAME.size + len(raw_header)
+        header["length"] = len(payload)
+        self._size = header["offset"] + len(payload)
+
+    def _payload(self, header):
+        self._file.seek(header["offset"])
+        return zlib.decompress(self._file.read(header["length"]))
+
+    # Escritura
+    def record(self, key, text, timestamp=None):
+        """Add ``text`` as the newest revision of ``key``; returns its number, or None if unchanged."""
+        key = tuple(key)
+        lines = text.split("\n")
+        with self.lock:
+            chain = self.chains.setdefault(key, [])
+            rev = len(chain)
+            header = {"key": list(key), "rev": rev, "time": timestamp or time.time(), "size": len(text)}
+            stored = False
+            if chain:
+                previous = self._lines(key, rev - 1)
+                if previous == lines:
+                    return None
+                keyframe = max(i for i, entry in enumerate(chain) if entry["kind"] == "full")
+                delta_bytes = sum(entry["length"] for entry in chain[keyframe + 1:])
+                delta = zlib.compress(json.dumps(line_diff(previous, lines)).encode("utf-8"))
+                if rev - keyframe <= self.max_chain and delta_bytes + len(delta) <= chain[keyframe]["length"]:
+                    header["kind"] = "delta"
+                    self._append(header, delta)
+                    stored = True
+            if not stored:
+                header["kind"] = "full"
+                self._append(header, zlib.compress(text.encode("utf-8")))
+            chain.append(header)
+            self._remember(key, lines)
+        return rev
+
+    def rename(self, old_key, new_key):
+        """Keep the chain of a ticket whose number or client changed.
+
+        A chain already under ``new_key`` belongs to the ticket the rename
+        replaced and is discarded.
+        """
+        old_key, new_key = tuple(old_key), tuple(new_key)
+        with self.lock:
+            if old_key == new_key:
+                return
+            if old_key not in self.chains:
+                self._drop(new_key)
+                return
+            self._append({"key": list(old_key), "kind": "rename", "to": list(new_key), "time": time.time()})
+            self.chains[new_key] = self.chains.pop(old_key)
+            self.latest.pop(new_key, None)
+            if old_key in self.latest:
+                self.latest[new_key] = self.latest.pop(old_key)
+
+    def drop(self, key):
+        """Forget the chain of a deleted ticket, so a new ticket with the same key starts clean."""
+        with self.lock:
+            self._drop(tuple(key))
+
+    def _drop(self, key):
+        if key in self.chains:
+            self._append({"key": list(key), "kind": "drop", "time": time.time()})
+            del self.chains[key]
+        self.latest.pop(key, None)
+
+    def _remember(self, key, lines):
+        self.latest[key] = lines
+        self.latest.move_to_end(key)
+        while len(self.latest) > self.cache_size:
+            self.latest.popitem(last=False)
+
+    # Lectura
+    def revisions(self, key):
+        """``[{"rev", "time", "size", "kind"}, ...]`` oldest first."""
+        with self.lock:
+            return [
+                {name: entry[name] for name in ("rev", "time", "size", "kind")}
+                for entry in self.chains.get(tuple(key), [])
+            ]
+
+    def has_revisions(self, key):
+        return bool(self.chains.get(tuple(key)))
+
+    def get(self, key, rev=-1):
+        """Text of revision ``rev`` (negative counts from the newest)."""
+        with self.lock:
+            return "\n".join(self._lines(tuple(key), rev))
+
+    def _lines(self, key, rev):
+        chain = self.chains[key]
+        if rev < 0:
+            rev += len(chain)
+        if rev == len(chain) - 1 and key in self.latest:
+            return list(self.latest[key])
+
+        # Keyframe más cercano y deltas hacia adelante
+        keyframe = rev
+        while chain[keyframe]["kind"] != "full":
+            keyframe -= 1
+        lines = self._payload(chain[keyframe]).decode("utf-8").split("\n")
+        for entry in chain[keyframe + 1:rev + 1]:
+            apply_diff(lines, json.loads(self._payload(entry)))
+        return lines
+
+    def diff(self, key, old_rev, new_rev, context=3):
+        """Unified diff between two revisions of ``key``, as a list of lines."""
+        key = tuple(key)
+        with self.lock:
+            old_lines = self._lines(key, old_rev)
+            new_lines = self._lines(key, new_rev)
+        return list(unified_diff(old_lines, new_lines, f"revision {old_rev}", f"revision {new_rev}", context))
+
+    def size(self):
+        return self._size
+
+    def close(self):
+        with self.lock:
+            self._file.close()
@@ -0,0 +1,252 @@
+import bisect
+import heapq
+import math
+import re
+import threading
+from collections import Counter
+
+# Tokens compuestos (IPs, hashes, hosts, emails, rutas) y sus partes
+TOKEN_RE = re.compile(r"[\w][\w.:@/\\-]*[\w]|[\w]")
+PART_SPLIT_RE = re.compile(r"[.:@/\\-]+")
+QUERY_RE = re.compile(r'(\w+):"([^"]*)"|"([^"]*)"|(\S+)')
+DEFANG_RE = re.compile(r"\[(\.|:|@|dot|at)\]|\((\.|dot)\)", re.IGNORECASE)
+DEFANG_MAP = {".": ".", ":": ":", "@": "@", "dot": ".", "at": "@"}
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Campos que aceptan búsqueda acotada, p. ej. client:acme tuc:"TUC 12"
+FIELDS = {
+    "ticket": "ticket_number",
+    "client": "client",
+    "tuc": "tuc",
+    "severity": "severity",
+    "assigned": "assigned_to",
+}
+# Prefijo de los términos acotados: TOKEN_RE nunca lo produce, así que el texto
+# "client:acme" dentro de un ticket no coincide con el filtro client:acme
+SCOPE_MARK = "\x00"
+TEXT_FIELDS = ("ticket_number", "client", "tuc", "short_description", "timezone", "assigned_to")
+
+
+def normalize(text):
+    """Lowercase and refang ``[.]``-style notation so indicators match either way."""
+    text = text.lower()
+    if "[" in text or "(" in text:
+        text = DEFANG_RE.sub(lambda m: DEFANG_MAP[m.group(1) or m.group(2)], text)
+    return text
+
+
+def tokenize(text):
+    """Return index terms: each compound token plus its dot/colon/slash separated parts."""
+    terms = TOKEN_RE.findall(normalize(text))
+    compound = [token for token in terms if not token.isalnum()]
+    for token in compound:
+        terms.extend(part for part in PART_SPLIT_RE.split(token) if part)
+    return terms
+
+
+class SearchIndex:
+    """Incremental inverted index over ticket metadata and content.
+
+    Query syntax: terms are AND-ed, ``OR`` separates alternatives, ``"..."`` is a
+    phrase and ``field:value`` / ``field:"..."`` restricts a clause to one of
+    ``FIELDS``. A trailing ``*`` matches by prefix. Results are ranked with BM25.
+    """
+
+    def __init__(self, text_loader=None):
+        # text_loader(key) devuelve el texto completo, usado solo para verificar frases
+        self.text_loader = text_loader
+        self.lock = threading.RLock()
+        self.postings = {}
+        # Los documentos se identifican internamente con enteros: hashing más barato que las tuplas
+        self.doc_ids = {}
+        self.doc_keys = {}
+        self.doc_terms = {}
+        self.doc_lengths = {}
+        self.total_length = 0
+        self._next_id = 0
+        self.signature = None
+        self._vocabulary = None
+        self._norms = None
+
+    # Mantenimiento
+    def clear(self):
+        with self.lock:
+            self.postings = {}
+            self.doc_ids = {}
+            self.doc_keys = {}
+            self.doc_terms = {}
+            self.doc_lengths = {}
+            self.total_length = 0
+            self._vocabulary = None
+            self._norms = None
+
+    def add(self, key, ticket, content=""):
+        """Index (or re-index) the ticket stored under ``key``."""
+        content_terms = tokenize(content or "")
+        counts = Counter(content_terms)
+        for field in TEXT_FIELDS:
+            value = ticket.get(field)
+            if value is not None:
+                counts.update(tokenize(str(value)))
+        for scope, field in FIELDS.items():
+            value = ticket.get(field)
+            if value is not None:
+                counts.update(f"{SCOPE_MARK}{scope}:{term}" for term in tokenize(str(value)))
+
+        with self.lock:
+            self.remove(key)
+            doc_id = self._next_id
+            self._next_id += 1
+            self.doc_ids[key] = doc_id
+            self.doc_keys[doc_id] = key
+            for term, frequency in counts.items():
+                self.postings.setdefault(term, {})[doc_id] = frequency
+            self.doc_terms[doc_id] = tuple(counts)
+            self.doc_lengths[doc_id] = len(content_terms)
+            self.total_length += len(content_terms)
+            self._vocabulary = None
+            self._norms = None
+
+    def remove(self, key):
+        with self.lock:
+            doc_id = self.doc_ids.pop(key, None)
+            if doc_id is None:
+                return
+            del self.doc_keys[doc_id]
+            for term in self.doc_terms.pop(doc_id):
+                docs = self.postings.get(term)
+                if docs is not None:
+                    docs.pop(doc_id, None)
+                    if not docs:
+                        del self.postings[term]
+            self.total_length -= self.doc_lengths.pop(doc_id, 0)
+            self._vocabulary = None
+            self._norms = None
+
+    def __len__(self):
+        return len(self.doc_terms)
+
+    # Consulta
+    def search(self, query, limit=None, candidates=None, cancelled=None):
+        """Return document keys matching ``query``, best match first.
+
+        ``candidates`` (a set of keys) restricts the search, which lets callers
+        narrow a previous result set as the query grows. ``cancelled()`` is checked
+        between clauses; once it returns True the search stops and returns [].
+        """
+        groups = self._parse(query)
+        if not groups:
+            return []
+
+        with self.lock:
+            if candidates is not None:
+                candidates = {self.doc_ids[key] for key in candidates if key in self.doc_ids}
+            scores = {}
+            for clauses in groups:
+                group_scores = None
+                for clause in clauses:
+                    if cancelled is not None and cancelled():
+                        return []
+                    # Cada cláusula se evalúa solo sobre los documentos que ya coinciden
+                    docs = self._match_clause(clause, candidates if group_scores is None else group_scores.keys())
+                    if group_scores is None:
+                        group_scores = docs
+                    else:
+                        group_scores = {key: group_scores[key] + score for key, score in docs.items()}
+                    if not group_scores:
+                        break
+                if not scores:
+                    scores = dict(group_scores or {})
+                    continue
+                for key, score in (group_scores or {}).items():
+                    if score > scores.get(key, 0.0):
+                        scores[key] = score
+
+            if limit:
+                ranked = heapq.nlargest(limit, scores, key=scores.get)
+            else:
+                ranked = sorted(scores, key=scores.get, reverse=True)
+            return [self.doc_keys[doc_id] for doc_id in ranked]
+
+    def _parse(self, query):
+        groups = [[]]
+        for match in QUERY_RE.finditer(query):
+            scope, scoped_phrase, phrase, word = match.groups()
+            if word == "OR":
+                groups.append([])
+                continue
+            if word == "AND":
+                continue
+            if scope is not None:
+                groups[-1].append((scope.lower(), scoped_phrase, True))
+            elif phrase is not None:
+                groups[-1].append((None, phrase, True))
+            elif ":" in word and word.split(":", 1)[0].lower() in FIELDS:
+                field, value = word.split(":", 1)
+                groups[-1].append((field.lower(), value, False))
+            else:
+                groups[-1].append((None, word, False))
+        return [clauses for clauses in groups if clauses]
+
+    def _match_clause(self, clause, candidates):
+        scope, text, is_phrase = clause
+        prefix = not is_phrase and text.endswith("*")
+        terms = list(TOKEN_RE.findall(normalize(text.rstrip("*"))))
+        if not terms:
+            return {}
+        if scope:
+            terms = [f"{SCOPE_MARK}{scope}:{term}" for term in terms]
+
+        docs = None
+        scores = {}
+        norms = self._document_norms()
+        for position, term in enumerate(terms):
+            expand = prefix and position == len(terms) - 1
+            term_docs = self._term_docs(term, expand)
+            idf = self._idf(len(term_docs))
+            if candidates is not None:
+                if len(candidates) < len(term_docs):
+                    term_docs = {key: term_docs[key] for key in candidates if key in term_docs}
+                else:
+                    term_docs = {key: tf for key, tf in term_docs.items() if key in candidates}
+            docs = set(term_docs) if docs is None else docs & term_docs.keys()
+            weight = idf * (BM25_K1 + 1)
+            get = scores.get
+            for key, tf in term_docs.items():
+                scores[key] = get(key, 0.0) + weight * tf / (tf + norms[key])
+
+        if is_phrase and not scope and len(terms) > 1 and self.text_loader:
+            needle = normalize(text)
+            docs = {doc_id for doc_id in docs if needle in normalize(self.text_loader(self.doc_keys[doc_id]))}
+        if len(docs) == len(scores):
+            return scores
+        return {key: scores[key] for key in docs}
+
+    def _term_docs(self, term, prefix):
+        if not prefix:
+            return self.postings.get(term, {})
+        if self._vocabulary is None:
+            self._vocabulary = sorted(self.postings)
+        merged = {}
+        for position in range(bisect.bisect_left(self._vocabulary, term), len(self._vocabulary)):
+            candidate = self._vocabulary[position]
+            if not candidate.startswith(term):
+                break
+            for key, tf in self.postings[candidate].items():
+                merged[key] = merged.get(key, 0) + tf
+        return merged
+
+    def _idf(self, document_frequency):
+        total = len(self.doc_terms) or 1
+        return math.log(1 + (total - document_frequency + 0.5) / (document_frequency + 0.5))
+
+    def _document_norms(self):
+        """BM25 length normalization per document, recomputed lazily after changes."""
+        if self._norms is None:
+            average = (self.total_length / len(self.doc_lengths)) if self.doc_lengths else 1
+            average = average or 1
+            self._norms = {
+                key: BM25_K1 * (1 - BM25_B + BM25_B * length / average) for key, length in self.doc_lengths.items()
+            }
+        return self._norms
@@ -0,0 +1,78 @@
+import threading
+
+
+class FrozenDict(dict):
+    """Read-only dict handed out by the cache. Use ``dict(item)`` to get an editable copy."""
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("Cached records are read-only; copy them with dict() before editing.")
+
+    __setitem__ = __delitem__ = __ior__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+
+    def __reduce__(self):
+        return (FrozenDict, (dict(self),))
+
+
+def freeze(value):
+    """Recursively turn lists into tuples and dicts into FrozenDict."""
+    if isinstance(value, dict):
+        return FrozenDict((key, freeze(item)) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+def thaw(value):
+    """Inverse of ``freeze``: return a fully mutable deep copy."""
+    if isinstance(value, dict):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [thaw(item) for item in value]
+    return value
+
+
+class SnapshotCache:
+    """Read-through cache of parsed collections keyed by file path.
+
+    Each entry is validated against the storage signature (mtime, size, inode for
+    JSON files), so an unchanged file is served without touching the parser.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, path, signature, loader):
+        if signature is not None:
+            with self._lock:
+                entry = self._entries.get(path)
+                if entry is not None and entry[0] == signature:
+                    self.hits += 1
+                    return entry[1]
+
+        snapshot = freeze(loader())
+        with self._lock:
+            self.misses += 1
+            if signature is not None:
+                self._entries[path] = (signature, snapshot)
+        return snapshot
+
+    def invalidate(self, path=None):
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(path, None)
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "entries": len(self._entries),
+            }
@@ -0,0 +1,338 @@
+import json
+import os
+import sqlite3
+import sys
+import threading
+
+from functions.ticket_journal import TicketJournal
+
+
+TICKETS_FILE = "tickets.json"
+TICKETS_JOURNAL_FILE = "tickets.journal.jsonl"
+SQLITE_FILENAME = "automatea.db"
+
+# Colecciones que viven dentro de la base SQLite; el resto (osint, template_5w)
+# lo siguen leyendo los módulos directamente desde su archivo JSON.
+SQLITE_COLLECTIONS = ("tickets", "notes", "clients", "tucs", "templates", "queries")
+
+
+def ticket_key(ticket):
+    """Return the primary key of a ticket: (ticket_number, client)."""
+    return (ticket.get("ticket_number"), ticket.get("client"))
+
+
+def collection_name(filename):
+    return os.path.splitext(os.path.basename(filename))[0]
+
+
+class JSONStorage:
+    """Storage engine that keeps every collection as a whole JSON file."""
+
+    def __init__(self, data_folder):
+        self.data_folder = data_folder
+
+    def path(self, filename):
+        return os.path.join(self.data_folder, filename)
+
+    def load(self, filename):
+        path = self.path(filename)
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as file:
+                return json.load(file)
+        return []
+
+    def save(self, filename, data):
+        with open(self.path(filename), "w", encoding="utf-8") as file:
+            json.dump(data, file, indent=4)
+
+    def signature(self, filename):
+        """Return (mtime_ns, size, inode) of the file, or None if it does not exist."""
+        try:
+            stat = os.stat(self.path(filename))
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+    def append(self, filename, item):
+        data = list(self.load(filename))
+        data.append(item)
+        self.save(filename, data)
+
+    def upsert_ticket(self, ticket, key=None):
+        """Replace the ticket stored under ``key`` (or append it if missing)."""
+        key = tuple(key or ticket_key(ticket))
+        new_key = ticket_key(ticket)
+        tickets = list(self.load(TICKETS_FILE))
+        if key != new_key:
+            # Renombrado sobre un ticket existente: lo reemplaza, como el journal y SQLite
+            tickets = [existing for existing in tickets if ticket_key(existing) != new_key]
+        for index, existing in enumerate(tickets):
+            if ticket_key(existing) == key:
+                tickets[index] = ticket
+                break
+        else:
+            tickets.append(ticket)
+        self.save(TICKETS_FILE, tickets)
+
+    def delete_ticket(self, key):
+        tickets = [ticket for ticket in self.load(TICKETS_FILE) if ticket_key(ticket) != tuple(key)]
+        self.save(TICKETS_FILE, tickets)
+
+    def close(self):
+        pass
+
+
+class JournalStorage(JSONStorage):
+    """JSON storage where tickets are written to an append-only journal.
+
+    tickets.json stays the snapshot format, so switching back to plain JSON only
+    needs a compaction (done automatically on ``close``).
+    """
+
+    def __init__(self, data_folder, max_bytes=4 * 1024 * 1024, max_records=2000):
+        super().__init__(data_folder)
+        self.journal = TicketJournal(
+            self.path(TICKETS_FILE),
+            self.path(TICKETS_JOURNAL_FILE),
+            max_bytes=max_bytes,
+            max_records=max_records,
+        )
+
+    def load(self, filename):
+        if collection_name(filename) == "tickets":
+            return self.journal.values()
+        return super().load(filename)
+
+    def save(self, filename, data):
+        if collection_name(filename) == "tickets":
+            return self.journal.replace_all(data)
+        return super().save(filename, data)
+
+    def signature(self, filename):
+        if collection_name(filename) == "tickets":
+            return ("journal", self.journal.version)
+        return super().signature(filename)
+
+    def append(self, filename, item):
+        if collection_name(filename) == "tickets":
+            return self.journal.put(item)
+        return super().append(filename, item)
+
+    def upsert_ticket(self, ticket, key=None):
+        self.journal.put(ticket, key)
+
+    def delete_ticket(self, key):
+        self.journal.delete(key)
+
+    def close(self):
+        self.journal.close()
+
+
+class SQLiteStorage:
+    """Storage engine backed by a single SQLite database in WAL mode.
+
+    Tickets get their own table with indexed columns so saving one ticket is a
+    single-row upsert. The other collections are stored as ordered JSON documents.
+    Files outside ``SQLITE_COLLECTIONS`` are delegated to ``fallback``.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS tickets (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            ticket_number TEXT,
+            client TEXT,
+            tuc TEXT,
+            created_timestamp TEXT,
+            updated_timestamp TEXT,
+            data TEXT NOT NULL
+        );
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_tickets_key ON tickets (ticket_number, client);
+        CREATE INDEX IF NOT EXISTS idx_tickets_client ON tickets (client);
+        CREATE INDEX IF NOT EXISTS idx_tickets_tuc ON tickets (tuc);
+        CREATE INDEX IF NOT EXISTS idx_tickets_created ON tickets (created_timestamp);
+        CREATE TABLE IF NOT EXISTS documents (
+            collection TEXT NOT NULL,
+            position INTEGER NOT NULL,
+            name TEXT,
+            data TEXT NOT NULL,
+            PRIMARY KEY (collection, position)
+        );
+        CREATE INDEX IF NOT EXISTS idx_documents_name ON documents (collection, name);
+    """
+
+    # Sentencias constantes: sqlite3 las prepara una vez y las reutiliza desde su caché.
+    SELECT_TICKETS = "SELECT data FROM tickets ORDER BY id"
+    INSERT_TICKET = (
+        "INSERT INTO tickets (ticket_number, client, tuc, created_timestamp, updated_timestamp, data) "
+        "VALUES (?, ?, ?, ?, ?, ?)"
+    )
+    UPSERT_TICKET = INSERT_TICKET + (
+        " ON CONFLICT (ticket_number, client) DO UPDATE SET "
+        "tuc = excluded.tuc, created_timestamp = excluded.created_timestamp, "
+        "updated_timestamp = excluded.updated_timestamp, data = excluded.data"
+    )
+    UPDATE_TICKET = (
+        "UPDATE tickets SET ticket_number = ?, client = ?, tuc = ?, created_timestamp = ?, "
+        "updated_timestamp = ?, data = ? WHERE ticket_number = ? AND client = ?"
+    )
+    DELETE_TICKET = "DELETE FROM tickets WHERE ticket_number = ? AND client = ?"
+    SELECT_DOCUMENTS = "SELECT data FROM documents WHERE collection = ? ORDER BY position"
+    INSERT_DOCUMENT = "INSERT INTO documents (collection, position, name, data) VALUES (?, ?, ?, ?)"
+    APPEND_DOCUMENT = (
+        "INSERT INTO documents (collection, position, name, data) "
+        "SELECT ?, COALESCE(MAX(position) + 1, 0), ?, ? FROM documents WHERE collection = ?"
+    )
+    DELETE_DOCUMENTS = "DELETE FROM documents WHERE collection = ?"
+
+    def __init__(self, db_path, fallback=None):
+        self.db_path = db_path
+        self.fallback = fallback
+        self.lock = threading.RLock()
+        self.connection = sqlite3.connect(db_path, check_same_thread=False, cached_statements=64)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(self.SCHEMA)
+        self.write_count = 0
+
+    def path(self, filename):
+        if self._owns(filename):
+            return self.db_path
+        return self.fallback.path(filename)
+
+    def _owns(self, filename):
+        return self.fallback is None or collection_name(filename) in SQLITE_COLLECTIONS
+
+    def signature(self, filename):
+        """Change marker for a collection: other connections bump ``data_version``,
+        writes through this one bump ``write_count``."""
+        if not self._owns(filename):
+            return self.fallback.signature(filename)
+        with self.lock:
+            data_version = self.connection.execute("PRAGMA data_version").fetchone()[0]
+            return (data_version, self.write_count)
+
+    @staticmethod
+    def _ticket_row(ticket):
+        return (
+            ticket.get("ticket_number"),
+            ticket.get("client"),
+            ticket.get("tuc"),
+            ticket.get("created_timestamp"),
+            ticket.get("updated_timestamp"),
+            json.dumps(ticket),
+        )
+
+    @staticmethod
+    def _document_name(item):
+        return item.get("name") if isinstance(item, dict) else None
+
+    def load(self, filename):
+        if not self._owns(filename):
+            return self.fallback.load(filename)
+        collection = collection_name(filename)
+        with self.lock:
+            if collection == "tickets":
+                rows = self.connection.execute(self.SELECT_TICKETS).fetchall()
+            else:
+                rows = self.connection.execute(self.SELECT_DOCUMENTS, (collection,)).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def save(self, filename, data):
+        if not self._owns(filename):
+            return self.fallback.save(filename, data)
+        collection = collection_name(filename)
+        with self.lock, self.connection:
+            self.write_count += 1
+            if collection == "tickets":
+                self.connection.execute("DELETE FROM tickets")
+                self.connection.executemany(self.UPSERT_TICKET, (self._ticket_row(t) for t in data))
+            else:
+                self.connection.execute(self.DELETE_DOCUMENTS, (collection,))
+                self.connection.executemany(
+                    self.INSERT_DOCUMENT,
+                    (
+                        (collection, position, self._document_name(item), json.dumps(item))
+                        for position, item in enumerate(data)
+                    ),
+                )
+
+    def append(self, filename, item):
+        if not self._owns(filename):
+            return self.fallback.append(filename, item)
+        collection = collection_name(filename)
+        if collection == "tickets":
+            return self.upsert_ticket(item)
+        with self.lock, self.connection:
+            self.write_count += 1
+            self.connection.execute(
+                self.APPEND_DOCUMENT, (collection, self._document_name(item), json.dumps(item), collection)
+            )
+
+    def upsert_ticket(self, ticket, key=None):
+        row = self._ticket_row(ticket)
+        with self.lock, self.connection:
+            self.write_count += 1
+            if key and tuple(key) != ticket_key(ticket):
+                # Renombrado sobre un ticket existente: se reemplaza en vez de violar la clave única
+                self.connection.execute(self.DELETE_TICKET, ticket_key(ticket))
+                cursor = self.connection.execute(self.UPDATE_TICKET, row + tuple(key))
+                if cursor.rowcount:
+                    return
+            self.connection.execute(self.UPSERT_TICKET, row)
+
+    def delete_ticket(self, key):
+        with self.lock, self.connection:
+            self.write_count += 1
+            self.connection.execute(self.DELETE_TICKET, tuple(key))
+
+    def close(self):
+        with self.lock:
+            self.connection.close()
+
+
+def create_storage(data_folder, backend="auto"):
+    """Build the storage engine for ``backend`` ("json", "journal", "sqlite" or "auto").
+
+    "auto" picks SQLite once ``migrate_json_to_sqlite`` has created the database
+    and the ticket journal otherwise.
+    """
+    db_path = os.path.join(data_folder, SQLITE_FILENAME)
+    if backend == "auto":
+        backend = "sqlite" if os.path.exists(db_path) else "journal"
+    if backend == "sqlite":
+        return SQLiteStorage(db_path, fallback=JSONStorage(data_folder))
+    if backend == "journal":
+        return JournalStorage(data_folder)
+    if backend == "json":
+        return JSONStorage(data_folder)
+    raise ValueError(f"Unknown storage backend: {backend}")
+
+
+def migrate_json_to_sqlite(data_folder="./data/", overwrite=False):
+    """One-shot import of ``data/*.json`` into ``data/automatea.db``.
+
+    Returns a dict with the number of records migrated per collection.
+    """
+    db_path = os.path.join(data_folder, SQLITE_FILENAME)
+    if os.path.exists(db_path) and not overwrite:
+        raise FileExistsError(f"'{db_path}' already exists. Use overwrite=True to rebuild it.")
+
+    source = JSONStorage(data_folder)
+    target = SQLiteStorage(db_path)
+    migrated = {}
+    try:
+        for collection in SQLITE_COLLECTIONS:
+            data = source.load(f"{collection}.json")
+            target.save(f"{collection}.json", data)
+            migrated[collection] = len(data)
+    finally:
+        target.close()
+    return migrated
+
+
+if __name__ == "__main__":
+    # Uso: python -m functions.storage [data_folder] [--overwrite]
+    args = [arg for arg in sys.argv[1:] if arg != "--overwrite"]
+    result = migrate_json_to_sqlite(args[0] if args else "./data/", overwrite="--overwrite" in sys.argv)
+    for name, count in result.items():
+        print(f"{name}: {count} records")
@@ -0,0 +1,105 @@
+import queue
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+
+
+class TaskExecutor:
+    """Shared background executor for the Tk application.
+
+    I/O work runs on a thread pool; writes that must keep their order (saves)
+    go through a single-thread lane; CPU-bound work can use a process pool.
+    ``submit`` returns a ``concurrent.futures.Future``. Callbacks never run on
+    the worker: finished futures are put on a queue that one ``after()`` pump
+    drains on the Tk thread, so ``on_done``/``on_error`` may touch widgets.
+    """
+
+    POLL_MS = 50
+
+    def __init__(self, io_workers=4, cpu_workers=0):
+        self.io_pool = ThreadPoolExecutor(max_workers=io_workers, thread_name_prefix="io")
+        self.serial_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="save")
+        self.cpu_workers = cpu_workers
+        self.cpu_pool = None
+        self.widget = None
+        self.pending = 0
+        self.busy_listeners = []
+        self._completed = queue.Queue()
+        self._pump_id = None
+
+    def attach(self, widget):
+        """Start the completion pump on ``widget`` (normally the root window)."""
+        self.widget = widget
+        if self._pump_id is None:
+            self._pump_id = widget.after(self.POLL_MS, self._pump)
+
+    def submit(self, func, *args, on_done=None, on_error=None, cpu=False, serial=False, busy=True, **kwargs):
+        """Run ``func(*args, **kwargs)`` in the background and return its Future.
+
+        ``on_done(result)`` / ``on_error(exception)`` are called on the Tk thread.
+        ``serial`` runs the task in submission order with other serial tasks;
+        ``cpu`` uses the process pool when one is configured (``func`` and its
+        arguments must then be picklable). ``busy`` counts the task in the busy
+        indicator.
+        """
+        if cpu and self.cpu_workers:
+            if self.cpu_pool is None:
+                self.cpu_pool = ProcessPoolExecutor(max_workers=self.cpu_workers)
+            pool = self.cpu_pool
+        else:
+            pool = self.serial_pool if serial else self.io_pool
+
+        if busy:
+            self._set_pending(self.pending + 1)
+        future = pool.submit(func, *args, **kwargs)
+        future.add_done_callback(lambda done: self._completed.put((done, on_done, on_error, busy)))
+        return future
+
+    def call_in_ui(self, callback, *args):
+        """Run ``callback(*args)`` on the Tk thread from any thread (through the pump)."""
+        future = Future()
+        future.set_result(None)
+        self._completed.put((future, lambda result: callback(*args), None, False))
+
+    # Indicador de actividad
+    def add_busy_listener(self, callback):
+        """``callback(pending_count)`` is called on the Tk thread whenever the count changes."""
+        self.busy_listeners.append(callback)
+        callback(self.pending)
+
+    def _set_pending(self, count):
+        self.pending = count
+        for callback in self.busy_listeners:
+            callback(count)
+
+    # Bomba de finalizaciones (hilo de Tk)
+    def _pump(self):
+        try:
+            while True:
+                future, on_done, on_error, busy = self._completed.get_nowait()
+                if busy:
+                    self._set_pending(self.pending - 1)
+                if future.cancelled():
+                    continue
+                error = future.exception()
+                try:
+                    if error is not None:
+                        if on_error:
+                            on_error(error)
+                        else:
+                            print(f"Background task failed: {error!r}")
+                    elif on_done:
+                        on_done(future.result())
+                except Exception as e:
+                    print(f"Error in task callback: {e!r}")
+        except queue.Empty:
+            pass
+        self._pump_id = self.widget.after(self.POLL_MS, self._pump)
+
+    def shutdown(self, wait=True):
+        """Stop the pump and wait for queued saves to reach the disk."""
+        if self._pump_id is not None and self.widget is not None:
+            self.widget.after_cancel(self._pump_id)
+            self._pump_id = None
+        self.io_pool.shutdown(wait=False, cancel_futures=True)
+        self.serial_pool.shutdown(wait=wait)
+        if self.cpu_pool is not None:
+            self.cpu_pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,212 @@
+import bisect
+import threading
+from datetime import datetime
+
+# Posiciones de los bits encendidos en cada valor de byte (0-255)
+BYTE_BITS = tuple(tuple(bit for bit in range(8) if value >> bit & 1) for value in range(256))
+
+
+def parse_timestamp(value):
+    """Epoch seconds for a ``%Y-%m-%d %H:%M:%S`` (or ISO) timestamp, None if missing or invalid."""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(str(value)).timestamp()
+    except ValueError:
+        return None
+
+
+def _key(ticket):
+    return (ticket.get("ticket_number"), ticket.get("client"))
+
+
+def ticket_date(ticket):
+    """Activity date of a ticket: last update, or creation if it was never updated."""
+    epoch = parse_timestamp(ticket.get("updated_timestamp"))
+    return epoch if epoch is not None else parse_timestamp(ticket.get("created_timestamp"))
+
+
+class TicketFilterIndex:
+    """Precomputed filter indexes for the History list.
+
+    Tickets are laid out once in activity-date order, so a date range is a
+    contiguous run of positions found by bisect. Each client, TUC and category
+    has a bitmap (a Python int, bit ``i`` = ticket at position ``i``). A filter
+    is the AND of those bitmaps and the range mask, and only the bits left set
+    are turned back into tickets.
+
+    ``rebuild`` indexes everything; ``add`` and ``remove`` keep the index in
+    step with single ticket writes (a bisect into the date order and one
+    shift of each bitmap), so timestamps are only parsed for the ticket that
+    changed. Reads and writes may come from different threads.
+    """
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.tickets = []
+        self.epochs = []
+        self.undated = 0
+        self.by_client = {}
+        self.by_tuc = {}
+        self.by_category = {}
+        self.tuc_categories = {}
+        self.signature = None
+
+    def rebuild(self, tickets, tuc_categories=None, signature=None):
+        """Index ``tickets``; ``tuc_categories`` maps a TUC name to its category."""
+        with self.lock:
+            self._rebuild(tickets, tuc_categories or {}, signature)
+
+    def _rebuild(self, tickets, tuc_categories, signature):
+        dated = sorted(((ticket_date(ticket), ticket) for ticket in tickets), key=self._date_order)
+        # Los tickets sin fecha van al principio y quedan fuera de cualquier rango
+        self.undated = sum(1 for epoch, ticket in dated if epoch is None)
+        self.tickets = [ticket for epoch, ticket in dated]
+        self.epochs = [epoch for epoch, ticket in dated[self.undated:]]
+        self.tuc_categories = tuc_categories
+
+        by_client, by_tuc, by_category = {}, {}, {}
+        for position, ticket in enumerate(self.tickets):
+            tuc = ticket.get("tuc") or ""
+            by_client.setdefault(ticket.get("client") or "", []).append(position)
+            by_tuc.setdefault(tuc, []).append(position)
+            by_category.setdefault(tuc_categories.get(tuc) or "", []).append(position)
+        size = len(self.tickets)
+        self.by_client = {value: self._bitmap(positions, size) for value, positions in by_client.items()}
+        self.by_tuc = {value: self._bitmap(positions, size) for value, positions in by_tuc.items()}
+        self.by_category = {value: self._bitmap(positions, size) for value, positions in by_category.items()}
+        self.signature = signature
+
+    # Actualización incremental
+    def _values(self, ticket):
+        tuc = ticket.get("tuc") or ""
+        return (
+            (self.by_client, ticket.get("client") or ""),
+            (self.by_tuc, tuc),
+            (self.by_category, self.tuc_categories.get(tuc) or ""),
+        )
+
+    def _bitmaps(self):
+        for bitmaps in (self.by_client, self.by_tuc, self.by_category):
+            for value, bits in bitmaps.items():
+                yield bitmaps, value, bits
+
+    def add(self, ticket):
+        """Insert ``ticket`` at its place in the date order."""
+        with self.lock:
+            epoch = ticket_date(ticket)
+            if epoch is None:
+                position = self.undated
+                self.undated += 1
+            else:
+                index = bisect.bisect_right(self.epochs, epoch)
+                self.epochs.insert(index, epoch)
+                position = self.undated + index
+            self.tickets.insert(position, ticket)
+            # Los bits desde ``position`` se corren un lugar hacia arriba
+            low_mask = (1 << position) - 1
+            for bitmaps, value, bits in list(self._bitmaps()):
+                if bits >> position:
+                    bitmaps[value] = (bits & low_mask) | (bits >> position << (position + 1))
+            for bitmaps, value in self._values(ticket):
+                bitmaps[value] = bitmaps.get(value, 0) | (1 << position)
+
+    def remove(self, ticket):
+        """Remove the entry of ``ticket`` (the stored version, whose date locates it)."""
+        with self.lock:
+            position = self._position(ticket)
+            if position is None:
+                return
+            del self.tickets[position]
+            if position < self.undated:
+                self.undated -= 1
+            else:
+                del self.epochs[position - self.undated]
+            low_mask = (1 << position) - 1
+            for bitmaps, value, bits in list(self._bitmaps()):
+                if bits >> position:
+                    bits = (bits & low_mask) | (bits >> (position + 1) << position)
+                    if bits:
+                        bitmaps[value] = bits
+                    else:
+                        del bitmaps[value]  # Ya no queda ningún ticket con ese valor
+
+    def _position(self, ticket):
+        key = _key(ticket)
+        epoch = ticket_date(ticket)
+        if epoch is None:
+            low, high = 0, self.undated
+        else:
+            low = self.undated + bisect.bisect_left(self.epochs, epoch)
+            high = self.undated + bisect.bisect_right(self.epochs, epoch)
+        for position in range(low, high):
+            if _key(self.tickets[position]) == key:
+                return position
+        return None
+
+    @staticmethod
+    def _bitmap(positions, size):
+        # Se arma en un bytearray: hacer OR sobre un int que crece sería cuadrático
+        data = bytearray((size + 7) // 8)
+        for position in positions:
+            data[position >> 3] |= 1 << (position & 7)
+        return int.from_bytes(data, "little")
+
+    @staticmethod
+    def _date_order(item):
+        epoch = item[0]
+        return (epoch is not None, epoch or 0.0)
+
+    # Valores disponibles para los desplegables
+    def clients(self):
+        with self.lock:
+            return sorted(value for value in self.by_client if value)
+
+    def tucs(self):
+        with self.lock:
+            return sorted(value for value in self.by_tuc if value)
+
+    def categories(self):
+        with self.lock:
+            return sorted(value for value in self.by_category if value)
+
+    # Consulta
+    def date_mask(self, start=None, end=None):
+        """Bitmap of tickets dated within [start, end] (epoch seconds, either may be None)."""
+        if start is None and end is None:
+            return (1 << len(self.tickets)) - 1
+        low = self.undated + (bisect.bisect_left(self.epochs, start) if start is not None else 0)
+        high = self.undated + (bisect.bisect_right(self.epochs, end) if end is not None else len(self.epochs))
+        if high <= low:
+            return 0
+        return ((1 << high) - 1) ^ ((1 << low) - 1)
+
+    def match(self, client=None, tuc=None, category=None, start=None, end=None):
+        """Bitmap of tickets passing every given filter (None means "any")."""
+        with self.lock:
+            bits = self.date_mask(start, end)
+            for bitmap, value in ((self.by_client, client), (self.by_tuc, tuc), (self.by_category, category)):
+                if value is not None and bits:
+                    bits &= bitmap.get(value, 0)
+            return bits
+
+    def positions(self, bits):
+        """Positions of the set bits, in date order, scanning whole zero bytes at once."""
+        if not bits:
+            return []
+        data = bits.to_bytes((bits.bit_length() + 7) // 8, "little")
+        positions = []
+        for byte_index, value in enumerate(data):
+            if value:
+                base = byte_index * 8
+                positions.extend(base + bit for bit in BYTE_BITS[value])
+        return positions
+
+    def filter(self, **filters):
+        """Tickets passing ``filters`` (see ``match``), oldest first."""
+        with self.lock:
+            tickets = self.tickets
+            return [tickets[position] for position in self.positions(self.match(**filters))]
+
+    def __len__(self):
+        return len(self.tickets)
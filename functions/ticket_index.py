@@ -0,0 +1,54 @@
+import json
+
+
+def ticket_iid(key):
+    """Encode a (ticket_number, client) key as a Treeview item id."""
+    return json.dumps(list(key))
+
+
+def iid_key(iid):
+    """Decode a Treeview item id produced by ``ticket_iid``."""
+    return tuple(json.loads(iid))
+
+
+class TicketIndex:
+    """Primary-key hash index: (ticket_number, client) -> ticket.
+
+    DataManager keeps one instance alive and updates it in place on every write,
+    so lookups, upserts and deletes are O(1): one dict probe, whatever the
+    number of tickets. Their wall time still grows with the ticket count (about
+    0.2 us at 1k tickets and 1.5 us at 1M for random keys) because a large
+    table and its key objects no longer fit in the CPU caches; a bare dict
+    shows the same curve (see benchmarks/bench_ticket_index.py). It is only
+    rebuilt when the storage signature shows the tickets were changed from
+    outside this DataManager.
+    """
+
+    def __init__(self):
+        self.entries = {}
+        self.signature = None
+
+    def rebuild(self, tickets, signature=None):
+        self.entries = {(ticket.get("ticket_number"), ticket.get("client")): ticket for ticket in tickets}
+        self.signature = signature
+
+    def get(self, key):
+        return self.entries.get(tuple(key))
+
+    def upsert(self, ticket, old_key=None):
+        key = (ticket.get("ticket_number"), ticket.get("client"))
+        if old_key is not None and tuple(old_key) != key:
+            self.entries.pop(tuple(old_key), None)
+        self.entries[key] = ticket
+
+    def delete(self, key):
+        return self.entries.pop(tuple(key), None)
+
+    def keys(self):
+        return self.entries.keys()
+
+    def __contains__(self, key):
+        return tuple(key) in self.entries
+
+    def __len__(self):
+        return len(self.entries)
@@ -0,0 +1,140 @@
+import json
+import os
+import threading
+
+
+def _key(ticket):
+    return (ticket.get("ticket_number"), ticket.get("client"))
+
+
+class TicketJournal:
+    """Append-only ticket log on top of a JSON snapshot.
+
+    Every create/update is one JSON line appended to ``journal_path``; a later line
+    for the same (ticket_number, client) supersedes the earlier one. When the
+    journal grows past ``max_bytes`` or ``max_records`` a background thread folds
+    it into ``snapshot_path`` (the regular tickets.json) and starts a fresh journal.
+    On startup the state is rebuilt from snapshot + journal.
+    """
+
+    def __init__(self, snapshot_path, journal_path, max_bytes=4 * 1024 * 1024, max_records=2000):
+        self.snapshot_path = snapshot_path
+        self.journal_path = journal_path
+        self.compacting_path = journal_path + ".compacting"
+        self.max_bytes = max_bytes
+        self.max_records = max_records
+        self.lock = threading.RLock()
+        self.compact_lock = threading.Lock()
+        self.tickets = {}
+        self.version = 0
+        self.journal_bytes = 0
+        self.journal_records = 0
+        self._compactor = None
+
+        self._replay()
+        self._journal = open(self.journal_path, "a", encoding="utf-8")
+        if os.path.exists(self.compacting_path):
+            # Una compactación anterior quedó a medias: el estado ya la incluye
+            self.compact()
+
+    # Reconstrucción
+    def _replay(self):
+        if os.path.exists(self.snapshot_path):
+            with open(self.snapshot_path, "r", encoding="utf-8") as file:
+                for ticket in json.load(file):
+                    self.tickets[_key(ticket)] = ticket
+
+        for path in (self.compacting_path, self.journal_path):
+            if not os.path.exists(path):
+                continue
+            with open(path, "r", encoding="utf-8") as file:
+                for line in file:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        break  # Última línea truncada por un cierre abrupto
+                    self._apply(record)
+                    if path == self.journal_path:
+                        self.journal_records += 1
+                        self.journal_bytes += len(line.encode("utf-8"))
+
+    def _apply(self, record):
+        key = tuple(record["key"])
+        if record["op"] == "delete":
+            self.tickets.pop(key, None)
+            return
+        ticket = record["ticket"]
+        if key != _key(ticket):
+            self.tickets.pop(key, None)
+        self.tickets[_key(ticket)] = ticket
+
+    # Escritura O(1)
+    def _append(self, record):
+        line = json.dumps(record) + "\n"
+        with self.lock:
+            self._apply(record)
+            self._journal.write(line)
+            self._journal.flush()
+            os.fsync(self._journal.fileno())
+            self.version += 1
+            self.journal_records += 1
+            self.journal_bytes += len(line.encode("utf-8"))
+            needs_compaction = self.journal_records >= self.max_records or self.journal_bytes >= self.max_bytes
+        if needs_compaction:
+            self.compact_in_background()
+
+    def put(self, ticket, key=None):
+        ticket = dict(ticket)
+        self._append({"op": "put", "key": list(key or _key(ticket)), "ticket": ticket})
+
+    def delete(self, key):
+        self._append({"op": "delete", "key": list(key)})
+
+    def replace_all(self, tickets):
+        with self.lock:
+            self.tickets = {_key(ticket): dict(ticket) for ticket in tickets}
+            self.version += 1
+        self.compact()
+
+    def values(self):
+        with self.lock:
+            return list(self.tickets.values())
+
+    # Compactación
+    def compact_in_background(self):
+        with self.lock:
+            if self._compactor and self._compactor.is_alive():
+                return
+            self._compactor = threading.Thread(target=self.compact, name="ticket-journal-compactor", daemon=True)
+            self._compactor.start()
+
+    def compact(self):
+        """Fold the journal into the snapshot file."""
+        with self.compact_lock:
+            with self.lock:
+                self._journal.close()
+                if os.path.exists(self.journal_path) and not os.path.exists(self.compacting_path):
+                    os.replace(self.journal_path, self.compacting_path)
+                self._journal = open(self.journal_path, "a", encoding="utf-8")
+                self.journal_records = 0
+                self.journal_bytes = 0
+                # Los tickets guardados nunca se mutan, basta con copiar las referencias
+                state = list(self.tickets.values())
+
+            tmp_path = self.snapshot_path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as file:
+                json.dump(state, file, indent=4)
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(tmp_path, self.snapshot_path)
+            if os.path.exists(self.compacting_path):
+                os.remove(self.compacting_path)
+
+    def close(self):
+        compactor = self._compactor
+        if compactor and compactor.is_alive():
+            compactor.join()
+        if self.journal_records:
+            self.compact()
+        with self.lock:
+            self._journal.close()
@@ -0,0 +1,82 @@
+import tkinter as tk
+from tkinter import messagebox
+from menu.manage_all_window import center_window
+
+
+def format_stats(stats):
+    codecs = ", ".join(f"{name}: {count}" for name, count in sorted(stats["codecs"].items())) or "-"
+    return (
+        f"Ticket bodies: {stats['bodies']}\n"
+        f"On disk: {stats['disk_bytes'] / 1024:.1f} KB in {stats['segments']} segment(s)\n"
+        f"Stored as: {codecs}\n"
+        f"Compression ratio: {stats['ratio']:.2f}x\n"
+        f"Codec for new tickets: {stats['codec']}"
+        f"{' + dictionary #' + str(stats['dictionary']) if stats['dictionary'] else ''}\n"
+        f"Read latency: {stats['read_ms_avg']:.3f} ms avg, {stats['read_ms_p95']:.3f} ms p95"
+    )
+
+
+class ContentStorageWindow(tk.Toplevel):
+    def __init__(self, parent, data_manager, executor):
+        super().__init__(parent)
+        self.title("Ticket Content Storage")
+        self.config(bg="#ECECEC")
+        self.data_manager = data_manager
+        self.executor = executor
+        center_window(self, 420, 260)
+
+        self.stats_label = tk.Label(self, text="Measuring...", justify="left", anchor="nw", bg="#ECECEC")
+        self.stats_label.pack(fill="both", expand=True, padx=10, pady=10)
+        btn_frame = tk.Frame(self, bg="#ECECEC")
+        btn_frame.pack(fill="x", padx=10, pady=(0, 10))
+        self.recompress_button = tk.Button(btn_frame, text="Recompress Archive", command=self.recompress, bg="#A8A8A8")
+        self.recompress_button.pack(side="left")
+        tk.Button(btn_frame, text="Close", command=self.destroy, bg="#A8A8A8").pack(side="right")
+        self.refresh()
+
+    def refresh(self):
+        self.executor.submit(
+            self.data_manager.content_stats,
+            on_done=self.show_stats,
+            on_error=lambda e: messagebox.showerror("Error", f"Failed to read storage stats: {e}", parent=self),
+        )
+
+    def show_stats(self, stats):
+        if not self.winfo_exists():
+            return
+        if stats is None:
+            self.stats_label.config(text="Ticket bodies are stored inline (no content store).")
+            self.recompress_button.config(state="disabled")
+            return
+        self.stats_label.config(text=format_stats(stats))
+
+    def recompress(self):
+        if not messagebox.askyesno(
+            "Recompress",
+            "Train a new dictionary on templates and tickets and rewrite every ticket body?\n"
+            "The previous archive file is removed on the next start.",
+            parent=self,
+        ):
+            return
+        self.recompress_button.config(state="disabled")
+        self.stats_label.config(text="Recompressing...")
+
+        def on_done(result):
+            if not self.winfo_exists():
+                return
+            self.recompress_button.config(state="normal")
+            before, after = result["before"], result["after"]
+            self.show_stats(after)
+            messagebox.showinfo(
+                "Recompress",
+                f"Compression ratio {before['ratio']:.2f}x -> {after['ratio']:.2f}x.",
+                parent=self,
+            )
+
+        def on_error(error):
+            if self.winfo_exists():
+                self.recompress_button.config(state="normal")
+            messagebox.showerror("Error", f"Recompression failed: {error}")
+
+        # Escribe tickets: va por el worker serial, como el resto de guardados
+        self.executor.submit(self.data_manager.recompress_ticket_content, serial=True, on_done=on_done, on_error=on_error)
@@ -1,5 +1,6 @@
 import tkinter as tk
-from tkinter import ttk
+from tkinter import ttk, messagebox
+from functions.snapshot_cache import thaw
 
 def center_window(win, width=400, height=300):
     win.update_idletasks()
@@ -10,12 +11,13 @@ def center_window(win, width=400, height=300):
     win.geometry(f"{width}x{height}+{x}+{y}")
 
 class ManageAllWindow(tk.Toplevel):
-    def __init__(self, parent, data_manager):
+    def __init__(self, parent, data_manager, executor):
         super().__init__(parent)
         self.title("Manage All Data")
         self.config(bg="#ECECEC")
         self.parent = parent
         self.data_manager = data_manager
+        self.executor = executor
         self.geometry("900x500")
         center_window(self, 900, 500)
         self.modules_map = {
@@ -76,6 +78,7 @@ class ManageAllWindow(tk.Toplevel):
             else:
                 fn = self.data_manager.files.get(self.current_module, "")
                 self.current_data = self.data_manager._load_json(fn) if fn else []
+        self.current_data = thaw(self.current_data)
         self.refresh_tree()
 
     def refresh_tree(self):
@@ -95,11 +98,15 @@ class ManageAllWindow(tk.Toplevel):
         if not self.current_module:
             return
         if self.current_module == "template_5w":
-            self.data_manager._save_json("template_5w.json", self.current_data)
+            fn = "template_5w.json"
         else:
             fn = self.data_manager.files.get(self.current_module, "")
-            if fn:
-                self.data_manager._save_json(fn, self.current_data)
+        if fn:
+            # Guardado en segundo plano sobre una copia de los datos actuales
+            self.executor.submit(
+                self.data_manager._save_json, fn, list(self.current_data), serial=True,
+                on_error=lambda e: messagebox.showerror("Error", f"Failed to save {fn}: {e}"),
+            )
 
     def add_item(self):
         w = tk.Toplevel(self)
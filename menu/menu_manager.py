@@ -1,10 +1,12 @@
 import tkinter as tk
 from menu.manage_all_window import ManageAllWindow
+from menu.content_storage_window import ContentStorageWindow
 
 class MenuManager:
     def __init__(self, parent):
         self.parent = parent
         self.data_manager = parent.data_manager
+        self.executor = parent.executor
         self.menu_bar = tk.Menu(self.parent)
 
     def create_menu(self):
@@ -13,10 +15,14 @@ class MenuManager:
 
         manage_menu = tk.Menu(self.menu_bar, tearoff=False)
         manage_menu.add_command(label="Manage All", command=self.manage_all)
+        manage_menu.add_command(label="Content Storage", command=self.content_storage)
 
         self.menu_bar.add_cascade(label="File", menu=file_menu)
         self.menu_bar.add_cascade(label="Manage", menu=manage_menu)
         self.parent.config(menu=self.menu_bar)
 
     def manage_all(self):
-        ManageAllWindow(self.parent, self.data_manager)
+        ManageAllWindow(self.parent, self.data_manager, self.executor)
+
+    def content_storage(self):
+        ContentStorageWindow(self.parent, self.data_manager, self.executor)
@@ -0,0 +1,134 @@
+from datetime import datetime
+from tkinter import messagebox
+
+from functions.recovery_journal import RecoveryJournal
+
+
+class AutosaveManager:
+    """Debounced autosave of the editor and timer into a crash-recovery journal.
+
+    Every edit (re)arms a ``delay_ms`` timer; when it fires the text is read on
+    the Tk thread and diffed/written by the executor's serial worker. A
+    heartbeat also records timer changes when the text is idle. On start,
+    journals left by a crashed session are offered for restore.
+    """
+
+    def __init__(self, parent, editor_module, timer_module, executor, directory="./data/recovery",
+                 delay_ms=2000, heartbeat_ms=15000):
+        self.parent = parent
+        self.editor_module = editor_module
+        self.timer_module = timer_module
+        self.executor = executor
+        self.directory = directory
+        self.delay_ms = delay_ms
+        self.heartbeat_ms = heartbeat_ms
+        self.journal = RecoveryJournal(directory)
+        self.save_job = None
+        self.heartbeat_job = None
+        self.last_timer = None
+
+    def start(self):
+        # Los journals existentes son de sesiones anteriores: se revisan antes de crear el propio
+        leftovers = RecoveryJournal.leftover_sessions(self.directory)
+        if leftovers:
+            self.executor.submit(
+                self.read_leftovers,
+                leftovers,
+                on_done=self.offer_restore,
+                on_error=lambda e: messagebox.showerror("Error", f"Failed to read recovery journal: {e}"),
+            )
+        self.editor_module.add_change_listener(self.on_editor_change)
+        self.heartbeat_job = self.parent.after(self.heartbeat_ms, self.heartbeat)
+
+    @staticmethod
+    def read_leftovers(paths):
+        """``(recovered, paths)``: the most recent non-empty session among ``paths`` (or None).
+
+        The journals are not deleted here: that waits until the user decided
+        and, on restore, until the text is in this session's journal.
+        """
+        recovered = None
+        for path in paths:
+            try:
+                result = RecoveryJournal.recover(path)
+            except (OSError, ValueError, KeyError):
+                result = None
+            if result and result[0].strip():
+                recovered = result
+                break
+        return recovered, paths
+
+    def offer_restore(self, result):
+        recovered, paths = result
+        if not recovered:
+            self.discard_leftovers(paths)
+            return
+        text, timer, saved_at = recovered
+        when = datetime.fromtimestamp(saved_at).strftime("%Y-%m-%d %H:%M:%S") if saved_at else "an earlier session"
+        if not messagebox.askyesno(
+            "Recover Unsaved Work",
+            f"AutomaTEA did not close properly. Restore the editor contents and timer saved at {when}?",
+        ):
+            self.discard_leftovers(paths)
+            return
+        self.editor_module.set_text(text)
+        if timer:
+            self.timer_module.restore_state(timer)
+        # Se guarda el texto recuperado y no el editor: los textos grandes se insertan por trozos
+        self.executor.submit(
+            self.adopt_recovered,
+            text,
+            timer,
+            paths,
+            serial=True,
+            busy=False,
+            on_error=lambda e: messagebox.showerror("Error", f"Failed to save the recovered text: {e}"),
+        )
+
+    def adopt_recovered(self, text, timer, paths):
+        """Worker: write the recovered state into this session's journal, then delete the old journals."""
+        self.journal.record(text, timer)
+        RecoveryJournal.discard(paths)
+
+    def discard_leftovers(self, paths):
+        self.executor.submit(
+            RecoveryJournal.discard,
+            paths,
+            serial=True,
+            busy=False,
+            on_error=lambda e: messagebox.showerror("Error", f"Failed to remove old recovery journals: {e}"),
+        )
+
+    # Guardado con debounce
+    def on_editor_change(self, splices):
+        self.schedule_save()
+
+    def schedule_save(self):
+        if self.save_job:
+            self.parent.after_cancel(self.save_job)
+        self.save_job = self.parent.after(self.delay_ms, self.save)
+
+    def heartbeat(self):
+        if self.timer_module.get_state() != self.last_timer:
+            self.save()
+        self.heartbeat_job = self.parent.after(self.heartbeat_ms, self.heartbeat)
+
+    def save(self):
+        if self.save_job:
+            self.parent.after_cancel(self.save_job)
+        self.save_job = None
+        if self.editor_module.chunked_paste:
+            # Pegado por trozos en curso: el editor aún no tiene todo el texto
+            self.schedule_save()
+            return
+        # Tk añade un salto de línea final que no forma parte del texto
+        text = self.editor_module.get_ticket_text()[:-1]
+        self.last_timer = self.timer_module.get_state()
+        self.executor.submit(self.journal.record, text, self.last_timer, serial=True, busy=False)
+
+    def close(self):
+        """Clean exit: stop saving and delete this session's journal (call after the executor drained)."""
+        for job in (self.save_job, self.heartbeat_job):
+            if job:
+                self.parent.after_cancel(job)
+        self.journal.close(discard=True)
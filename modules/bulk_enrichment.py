@@ -0,0 +1,111 @@
+import tkinter as tk
+from tkinter import ttk, messagebox
+from functions.bulk_enrichment import BulkEnricher, plan_lookups
+
+COLUMNS = (
+    ("indicator", "Indicator", 220),
+    ("kind", "Type", 60),
+    ("provider", "Provider", 120),
+    ("status", "Status", 70),
+    ("summary", "Result", 380),
+    ("elapsed", "ms", 60),
+)
+
+
+class BulkEnrichmentWindow(tk.Toplevel):
+    """Results table of a bulk enrichment run; rows appear as lookups finish."""
+
+    def __init__(self, parent, indicators, tools, executor, cache=None, editor_module=None, scheduler=None,
+                 http_pool=None):
+        super().__init__(parent)
+        self.title("Bulk Enrichment")
+        self.geometry("960x420")
+        self.executor = executor
+        self.editor_module = editor_module
+        self.results = []
+        self.lookups = plan_lookups(indicators, tools)
+        # Los resultados llegan desde el hilo del loop asyncio: se pasan al hilo de Tk
+        self.enricher = BulkEnricher(
+            cache=cache,
+            on_result=lambda result: executor.call_in_ui(self.add_result, result),
+            scheduler=scheduler,
+            http_pool=http_pool,
+        )
+
+        self.tree = ttk.Treeview(self, columns=[name for name, label, width in COLUMNS], show="headings")
+        for name, label, width in COLUMNS:
+            self.tree.heading(name, text=label)
+            self.tree.column(name, width=width, stretch=name == "summary")
+        scrollbar = ttk.Scrollbar(self, orient="vertical", command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scrollbar.set)
+        self.tree.tag_configure("error", foreground="#B00020")
+        self.tree.tag_configure("cached", foreground="#555555")
+
+        button_frame = ttk.Frame(self)
+        button_frame.pack(side="bottom", fill="x", padx=10, pady=5)
+        self.status_label = ttk.Label(button_frame, text="")
+        self.status_label.pack(side="left", padx=5)
+        ttk.Button(button_frame, text="Close", command=self.close).pack(side="right", padx=5)
+        self.cancel_button = ttk.Button(button_frame, text="Cancel", command=self.enricher.cancel)
+        self.cancel_button.pack(side="right", padx=5)
+        ttk.Button(button_frame, text="Send to Editor", command=self.send_to_editor).pack(side="right", padx=5)
+        ttk.Button(button_frame, text="Copy", command=self.copy_results).pack(side="right", padx=5)
+        scrollbar.pack(side="right", fill="y", pady=(10, 0))
+        self.tree.pack(fill="both", expand=True, padx=(10, 0), pady=(10, 0))
+        self.protocol("WM_DELETE_WINDOW", self.close)
+
+        self.update_status()
+        self.executor.submit(self.enricher.run, self.lookups, on_done=self.on_finished, on_error=self.on_failed)
+
+    def add_result(self, result):
+        if not self.winfo_exists():
+            return
+        self.results.append(result)
+        tag = "error" if result["status"] in ("error", "timeout") else "cached" if result["status"] == "cached" else ""
+        self.tree.insert("", "end", values=self.row_values(result), tags=(tag,) if tag else ())
+        self.update_status()
+
+    @staticmethod
+    def row_values(result):
+        elapsed = f"{result['elapsed'] * 1000:.0f}" if result["status"] != "cached" else "-"
+        return (result["indicator"], result["kind"], result["provider"], result["status"], result["summary"], elapsed)
+
+    def update_status(self, finished=False):
+        done = len(self.results)
+        state = "Done" if finished else "Running"
+        self.status_label.config(text=f"{state}: {done}/{len(self.lookups)} lookups")
+
+    def on_finished(self, results):
+        if self.winfo_exists():
+            self.cancel_button.config(state="disabled")
+            self.update_status(finished=True)
+
+    def on_failed(self, error):
+        if self.winfo_exists():
+            self.cancel_button.config(state="disabled")
+        messagebox.showerror("Error", f"Bulk enrichment failed: {error}")
+
+    def results_text(self):
+        header = "\t".join(label for name, label, width in COLUMNS)
+        return "\n".join([header] + ["\t".join(map(str, self.row_values(result))) for result in self.results])
+
+    def copy_results(self):
+        self.clipboard_clear()
+        self.clipboard_append(self.results_text())
+        self.status_label.config(text=f"Copied {len(self.results)} results")
+
+    def send_to_editor(self):
+        if not (self.editor_module and self.editor_module.editor_box):
+            messagebox.showerror("Error", "Editor module is not properly configured.", parent=self)
+            return
+        lines = [
+            f"{result['indicator']} [{result['provider']}]: {result['summary']}"
+            for result in self.results
+            if result["status"] in ("ok", "cached") and result["data"]
+        ]
+        self.editor_module.editor_box.insert("end", "\n## Enrichment\n" + "\n".join(lines) + "\n")
+        self.status_label.config(text=f"Sent {len(lines)} results to the editor")
+
+    def close(self):
+        self.enricher.cancel()
+        self.destroy()
@@ -1,23 +1,35 @@
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
-import re
-import json
 from datetime import datetime
+from functions.ioc_extractor import parse_fields
+from functions.attachments import ATTACHMENT_RE, AttachmentStore, format_size
+from functions.event_bus import CollectionChanged
+from functions.defang import DEFAULT_STYLE, STYLES, defang_text, refang_text
+from modules.large_paste import ChunkedPaste
+from modules.text_changes import TextChangeTracker
+
+# Pegados a partir de este tamaño se insertan por trozos o se guardan como adjunto
+LARGE_PASTE_CHARS = 512 * 1024
+# Límite de acciones en la pila de deshacer (cada una menor que LARGE_PASTE_CHARS)
+UNDO_LIMIT = 100
 
 
 class EditorModule:
-    def __init__(self, parent, row_start, col_start, col_span, row_span, data_manager, history_module, timer_module, json_path="tickets.json"):
+    def __init__(self, parent, row_start, col_start, col_span, row_span, data_manager, timer_module, executor):
         self.parent = parent
         self.row_start = row_start
         self.col_start = col_start
         self.col_span = col_span
         self.row_span = row_span
         self.data_manager = data_manager
-        self.history_module = history_module
         self.timer_module = timer_module
+        self.executor = executor
         self.editor_box = None
+        self.change_tracker = None
+        self.defang_style = None
         self.template_combo = None
-        self.json_path = json_path
+        self.attachments = AttachmentStore()
+        self.chunked_paste = None
 
     def build(self):
         frame = ttk.LabelFrame(self.parent, text="Ticket Editor")
@@ -35,17 +47,29 @@ class EditorModule:
 
         # Combo de Plantillas
         ttk.Label(frame, text="Template:").grid(row=0, column=0, sticky="w", padx=5, pady=5)
-        template_list = [tmpl.get("name", "Unnamed") for tmpl in self.data_manager.get_templates()]
-        self.template_combo = ttk.Combobox(frame, values=template_list, state="readonly")
+        self.template_combo = ttk.Combobox(frame, values=[], state="readonly")
         self.template_combo.grid(row=0, column=1, sticky="ew", padx=5, pady=5)
         self.template_combo.bind("<<ComboboxSelected>>", self.load_template_content)
+        self.load_template_names()
+        self.data_manager.events.subscribe(
+            CollectionChanged, lambda event: event.collection == "templates" and self.load_template_names()
+        )
 
         # Cuadro de Texto
-        self.editor_box = tk.Text(frame, wrap="word", undo=True)
+        self.editor_box = tk.Text(frame, wrap="word", undo=True, maxundo=UNDO_LIMIT)
         self.editor_box.grid(row=1, column=0, columnspan=2, sticky="nsew", padx=5, pady=5)
         scrollbar = ttk.Scrollbar(frame, command=self.editor_box.yview)
         self.editor_box.configure(yscrollcommand=scrollbar.set)
         scrollbar.grid(row=1, column=2, sticky="ns")
+        self.change_tracker = TextChangeTracker(self.editor_box)
+        self.editor_box.bind("<<Paste>>", self.on_paste)
+
+        # Marcadores de adjuntos: clic para mostrar u ocultar las primeras líneas
+        self.editor_box.tag_configure("attachment", foreground="blue", underline=True)
+        self.editor_box.tag_configure("attachment_preview", foreground="gray40")
+        self.editor_box.tag_bind("attachment", "<Button-1>", self.toggle_attachment_preview)
+        self.editor_box.tag_bind("attachment", "<Enter>", lambda e: self.editor_box.config(cursor="hand2"))
+        self.editor_box.tag_bind("attachment", "<Leave>", lambda e: self.editor_box.config(cursor="xterm"))
 
         # Botones
         button_frame = ttk.Frame(frame)
@@ -56,15 +80,37 @@ class EditorModule:
         ttk.Button(button_frame, text="Load", command=self.load_ticket).pack(side="left", padx=5)
         ttk.Button(button_frame, text="Defang", command=self.apply_defang).pack(side="left", padx=5)
         ttk.Button(button_frame, text="Undo Defang", command=self.undo_defang).pack(side="left", padx=5)
+        self.defang_style = tk.StringVar(value=DEFAULT_STYLE)
+        ttk.Combobox(
+            button_frame, textvariable=self.defang_style, values=list(STYLES), state="readonly", width=8
+        ).pack(side="left", padx=5)
+
+    def load_template_names(self):
+        def show_names(templates):
+            self.template_combo["values"] = [tmpl.get("name", "Unnamed") for tmpl in templates]
+
+        self.executor.submit(
+            self.data_manager.get_templates,
+            on_done=show_names,
+            on_error=lambda e: messagebox.showerror("Error", f"Failed to load templates: {e}"),
+        )
 
     def load_template_content(self, event):
-        templates = self.data_manager.get_templates()
-        content = next((tmpl["content"] for tmpl in templates if tmpl.get("name") == self.template_combo.get()), "")
-        self.editor_box.delete("1.0", tk.END)
-        self.editor_box.insert("1.0", content)
+        name = self.template_combo.get()
+
+        def show_content(templates):
+            content = next((tmpl["content"] for tmpl in templates if tmpl.get("name") == name), "")
+            self.set_text(content)
+
+        # La lectura del archivo de plantillas se hace fuera del hilo de Tk
+        self.executor.submit(
+            self.data_manager.get_templates,
+            on_done=show_content,
+            on_error=lambda e: messagebox.showerror("Error", f"Failed to load template: {e}"),
+        )
 
     def save_ticket(self):
-        content = self.editor_box.get("1.0", tk.END).strip()
+        content = self.get_ticket_text().strip()
         if not content:
             messagebox.showwarning("Warning", "Editor is empty!")
             return
@@ -94,22 +140,20 @@ class EditorModule:
             messagebox.showerror("Error", f"Ticket {ticket_data['ticket_number']} already exists!")
             return
 
-        # Save the ticket
-        self.save_to_json(ticket_data)
-
-        # Refresh the history module
-        self.history_module.load_tickets()  # Reload tickets from JSON
-        self.history_module.update_history_list()  # Refresh the UI
+        def on_saved(result):
+            # History se actualiza sola con el evento TicketUpserted de DataManager.
+            # Pause the timer and open checklist
+            self.pause_timer()
+            self.open_checklist_window(ticket_data)
 
-        # Pause the timer and open checklist
-        self.pause_timer()
-        self.open_checklist_window(ticket_data)
+            messagebox.showinfo("Success", "Ticket saved successfully!")
 
-        messagebox.showinfo("Success", "Ticket saved successfully!")
+        # Save the ticket
+        self.save_to_json(ticket_data, on_done=on_saved)
 
 
     def update_ticket(self):
-        content = self.editor_box.get("1.0", tk.END).strip()
+        content = self.get_ticket_text().strip()
         if not content:
             messagebox.showwarning("Warning", "Editor is empty!")
             return
@@ -134,19 +178,13 @@ class EditorModule:
             messagebox.showerror("Error", f"Ticket {ticket_data['ticket_number']} does not exist for updating!")
             return
 
-        self.overwrite_ticket(ticket_data)
-        self.history_module.update_history_list()
-        messagebox.showinfo("Success", "Ticket updated successfully!")
+        def on_updated(result):
+            messagebox.showinfo("Success", "Ticket updated successfully!")
+
+        self.overwrite_ticket(ticket_data, on_done=on_updated)
 
     def is_ticket_duplicate(self, ticket_data):
-        tickets = self.data_manager.get_tickets()
-        for ticket in tickets:
-            if (
-                ticket.get("ticket_number") == ticket_data["ticket_number"]
-                and ticket.get("client") == ticket_data["client"]
-            ):
-                return True
-        return False
+        return self.data_manager.has_ticket(ticket_data["ticket_number"], ticket_data["client"])
 
     def open_checklist_window(self, ticket_data):
         checklist_window = tk.Toplevel(self.parent)
@@ -235,21 +273,23 @@ class EditorModule:
         self.parent.update()
         messagebox.showinfo("Copied", "Summary copied to clipboard!")
 
-    def save_to_json(self, ticket_data):
-        tickets = self.data_manager.get_tickets()
-        tickets.append(ticket_data)
-        self.data_manager._save_json(self.json_path, tickets)
-
-    def overwrite_ticket(self, ticket_data):
-        tickets = self.data_manager.get_tickets()
-        for index, ticket in enumerate(tickets):
-            if (
-                ticket.get("ticket_number") == ticket_data["ticket_number"]
-                and ticket.get("client") == ticket_data["client"]
-            ):
-                tickets[index].update(ticket_data)
-                self.data_manager._save_json(self.json_path, tickets)
-                return
+    def save_to_json(self, ticket_data, on_done=None):
+        self.executor.submit(
+            self.data_manager.add_ticket,
+            ticket_data,
+            serial=True,
+            on_done=on_done,
+            on_error=lambda e: messagebox.showerror("Error", f"Failed to save ticket: {e}"),
+        )
+
+    def overwrite_ticket(self, ticket_data, on_done=None):
+        self.executor.submit(
+            self.data_manager.update_ticket,
+            ticket_data,
+            serial=True,
+            on_done=on_done,
+            on_error=lambda e: messagebox.showerror("Error", f"Failed to update ticket: {e}"),
+        )
 
     def pause_timer(self):
         if self.timer_module and self.timer_module.timer_running:
@@ -258,51 +298,203 @@ class EditorModule:
     def get_time_worked(self):
         return self.timer_module.get_time_worked() if self.timer_module else "00:00:00"
 
+    def add_change_listener(self, callback):
+        """Call ``callback(splices)`` after every edit (see TextChangeTracker)."""
+        self.change_tracker.add_listener(callback)
+
+    def remove_change_listener(self, callback):
+        self.change_tracker.remove_listener(callback)
+
     def extract_fields(self, content):
-        pattern = r"(?P<key>[\w\s]+):\s*(?P<value>[^\n]+)"
-        matches = re.findall(pattern, content)
-        return {key.strip(): value.strip() for key, value in matches}
+        # Si una clave se repite, gana el último valor
+        fields = {key: values[-1] for key, values in parse_fields(content).items()}
+        # El formulario de entrada escribe "Time/Timezone:"
+        if "Timezone" not in fields and "Time/Timezone" in fields:
+            fields["Timezone"] = fields["Time/Timezone"]
+        return fields
 
     def clear_editor(self):
+        if self.chunked_paste:
+            self.chunked_paste.cancel()
         self.editor_box.delete("1.0", tk.END)
 
     def load_ticket(self):
         file_path = filedialog.askopenfilename(initialdir="./tickets/")
         if file_path:
-            with open(file_path, "r", encoding="utf-8") as file:
-                self.editor_box.delete("1.0", tk.END)
-                self.editor_box.insert("1.0", file.read())
-    def apply_defang(self):
+            def show_file(text):
+                self.set_text(text)
+
+            self.executor.submit(
+                self.read_text_file,
+                file_path,
+                on_done=show_file,
+                on_error=lambda e: messagebox.showerror("Error", f"Failed to load {file_path}: {e}"),
+            )
+
+    def get_ticket_text(self):
+        """
+        Texto del editor sin las vistas previas de adjuntos desplegadas.
+        """
+        ranges = self.editor_box.tag_ranges("attachment_preview")
+        if not ranges:
+            return self.editor_box.get("1.0", tk.END)
+        parts = []
+        position = "1.0"
+        for start, end in zip(ranges[0::2], ranges[1::2]):
+            parts.append(self.editor_box.get(position, start))
+            position = end
+        parts.append(self.editor_box.get(position, tk.END))
+        return "".join(parts)
+
+    def set_text(self, text):
+        """
+        Reemplaza el contenido del editor; los textos grandes se insertan por trozos.
+        """
+        if self.chunked_paste:
+            self.chunked_paste.cancel()
+        self.editor_box.delete("1.0", tk.END)
+        if len(text) >= LARGE_PASTE_CHARS:
+            self.paste_in_chunks(text, "1.0")
+        else:
+            self.editor_box.insert("1.0", text)
+            self.tag_attachments()
+
+    # Pegado de textos grandes
+    def on_paste(self, event):
         try:
-            # Obtener el rango seleccionado
-            start = self.editor_box.index("sel.first")
-            end = self.editor_box.index("sel.last")
-            selected_text = self.editor_box.get(start, end)
-
-            # Reemplazar los patrones en el texto seleccionado
-            defanged_text = selected_text.replace(".", "[.]").replace("http", "hxxp")
-            
-            # Reemplazar el texto seleccionado con el texto defanged
-            self.editor_box.delete(start, end)
-            self.editor_box.insert(start, defanged_text)
+            payload = self.editor_box.clipboard_get()
+        except tk.TclError:
+            return None
+        if len(payload) < LARGE_PASTE_CHARS:
+            return None  # Pegado normal de Tk
+
+        answer = messagebox.askyesnocancel(
+            "Large Paste",
+            f"The clipboard holds {format_size(len(payload.encode('utf-8')))} "
+            f"({payload.count(chr(10)) + 1:,} lines).\n\n"
+            "Yes: store it as an attachment and insert a placeholder.\n"
+            "No: insert it into the editor in chunks (clears the undo history).",
+        )
+        if answer is None or self.chunked_paste:
+            return "break"
+        try:
+            self.editor_box.delete("sel.first", "sel.last")
         except tk.TclError:
-            messagebox.showwarning("Warning", "No text selected! Please select a portion of text to apply defang.")
+            pass
+        if answer:
+            self.paste_as_attachment(payload)
+        else:
+            self.paste_in_chunks(payload, "insert")
+        return "break"
+
+    def paste_in_chunks(self, payload, index):
+        def on_done(elapsed, max_slice):
+            self.chunked_paste = None
+            self.editor_box.config(cursor="xterm")
+            self.tag_attachments()
+
+        self.editor_box.config(cursor="watch")
+        self.chunked_paste = ChunkedPaste(self.editor_box, payload, index, on_done=on_done)
+        self.chunked_paste.start()
+
+    def paste_as_attachment(self, payload):
+        # El marcador se inserta donde estaba el cursor al pegar, aunque se siga escribiendo
+        mark = f"attachment_{id(payload)}"
+        self.editor_box.mark_set(mark, "insert")
+        self.editor_box.mark_gravity(mark, "left")
+
+        def insert_placeholder(placeholder):
+            self.editor_box.insert(mark, placeholder, ("attachment",))
+            self.editor_box.mark_unset(mark)
+
+        def on_error(error):
+            self.editor_box.mark_unset(mark)
+            messagebox.showerror("Error", f"Failed to store attachment: {error}")
+
+        # Hash y escritura del adjunto fuera del hilo de Tk
+        self.executor.submit(self.attachments.save, payload, on_done=insert_placeholder, on_error=on_error)
+
+    def tag_attachments(self):
+        """
+        Marca los marcadores de adjuntos presentes en el texto (p. ej. al cargar un ticket).
+        """
+        self.editor_box.tag_remove("attachment", "1.0", tk.END)
+        count = tk.IntVar()
+        index = "1.0"
+        while True:
+            index = self.editor_box.search(r"\[\[attachment: ", index, tk.END, regexp=True, count=count)
+            if not index:
+                break
+            line_end = self.editor_box.index(f"{index} lineend")
+            match = ATTACHMENT_RE.match(self.editor_box.get(index, line_end))
+            end = f"{index}+{match.end() if match else count.get()}c"
+            if match:
+                self.editor_box.tag_add("attachment", index, end)
+            index = end
+
+    def toggle_attachment_preview(self, event):
+        found = self.editor_box.tag_prevrange("attachment", "current+1c")
+        match = ATTACHMENT_RE.match(self.editor_box.get(*found)) if found else None
+        if not match:
+            return "break"
+        start, end = found
+
+        # Si ya está desplegada, se pliega
+        if "attachment_preview" in self.editor_box.tag_names(end):
+            preview_start, preview_end = self.editor_box.tag_nextrange("attachment_preview", end)
+            self.editor_box.delete(preview_start, preview_end)
+            return "break"
+
+        name = match.group("name")
+        mark = f"attachment_preview_{name}"
+        self.editor_box.mark_set(mark, end)
+        self.editor_box.mark_gravity(mark, "left")
+
+        def show_preview(result):
+            text, truncated = result
+            preview = "\n" + text.rstrip("\n")
+            if truncated:
+                preview += f"\n... more lines in {name}"
+            self.editor_box.insert(mark, preview, ("attachment_preview",))
+            self.editor_box.mark_unset(mark)
+
+        def on_error(error):
+            self.editor_box.mark_unset(mark)
+            messagebox.showerror("Error", f"Failed to read attachment {name}: {error}")
+
+        self.executor.submit(self.attachments.preview, name, on_done=show_preview, on_error=on_error)
+        return "break"
+
+    @staticmethod
+    def read_text_file(file_path):
+        with open(file_path, "r", encoding="utf-8") as file:
+            return file.read()
+
+    def apply_defang(self):
+        self.transform_indicators(lambda text: defang_text(text, self.defang_style.get()))
 
     def undo_defang(self):
+        self.transform_indicators(refang_text)
+
+    def transform_indicators(self, transform):
+        """
+        Reescribe solo los indicadores (IPs, dominios, URLs, correos) de la selección,
+        o de todo el ticket si no hay selección.
+        """
         try:
-            # Obtener el rango seleccionado
             start = self.editor_box.index("sel.first")
             end = self.editor_box.index("sel.last")
-            selected_text = self.editor_box.get(start, end)
-
-            # Revertir los patrones en el texto seleccionado
-            undefanged_text = selected_text.replace("[.]", ".").replace("hxxp", "http")
-            
-            # Reemplazar el texto seleccionado con el texto undefanged
-            self.editor_box.delete(start, end)
-            self.editor_box.insert(start, undefanged_text)
         except tk.TclError:
-            messagebox.showwarning("Warning", "No text selected! Please select a portion of text to undo defang.")
+            start, end = "1.0", "end-1c"
+        original = self.editor_box.get(start, end)
+        transformed = transform(original)
+        if transformed == original:
+            return
+
+        # Un solo paso de deshacer para todo el reemplazo
+        self.editor_box.edit_separator()
+        self.editor_box.replace(start, end, transformed)
+        self.editor_box.edit_separator()
 
     def center_window(self, window, width, height):
         window.update_idletasks()
@@ -1,6 +1,11 @@
 import tkinter as tk
+from collections import Counter
 from tkinter import ttk, messagebox
-import re
+from functions.ioc_extractor import KIND_LABELS, count_iocs, parse_fields
+from functions.incremental_extractor import IncrementalExtractor
+from modules.virtual_tree import VirtualTreeview
+
+ALL_FIELDS = "All"
 
 
 class ExtractFieldsModule:
@@ -11,6 +16,11 @@ class ExtractFieldsModule:
         self.col_span = col_span
         self.row_span = row_span
         self.editor_module = editor_module  # Referencia al EditorModule
+        self.live_var = None
+        self.extractor = IncrementalExtractor()
+        self.live_pending = False
+        self.fields = {}  # campo -> {valor: ocurrencias}
+        self.rows = []  # (índice, campo, valor, ocurrencias) de la vista actual
 
     def build(self):
         # Contenedor principal
@@ -24,14 +34,13 @@ class ExtractFieldsModule:
             padx=2,
             pady=2,
         )
-        frame.columnconfigure(0, weight=0)
-        frame.columnconfigure(1, weight=1)
+        frame.columnconfigure(0, weight=1)
         frame.rowconfigure(1, weight=1)
 
         # Botones
         button_frame = ttk.Frame(frame)
-        button_frame.grid(row=0, column=0, columnspan=2, sticky="ew")
-        button_frame.columnconfigure(0, weight=1)
+        button_frame.grid(row=0, column=0, sticky="ew")
+        button_frame.columnconfigure(3, weight=1)
 
         # Botón para extraer campos
         ttk.Button(
@@ -46,97 +55,123 @@ class ExtractFieldsModule:
             button_frame,
             text="Clear",
             command=self.clear_fields,
-            width=12,
-        ).grid(row=0, column=1, pady=2, padx=2, sticky="e")
-
-        # Canvas para contenido scrollable
-        self.fields_canvas = tk.Canvas(frame, highlightthickness=0, height=150)  # 5 filas visibles (aproximadamente)
-        self.fields_canvas.grid(row=1, column=0, columnspan=2, sticky="nsew", padx=2, pady=2)
-
-        self.scrollable_frame = ttk.Frame(self.fields_canvas)
-        self.scrollable_window = self.fields_canvas.create_window((0, 0), window=self.scrollable_frame, anchor="nw")
-
-        # Barra de desplazamiento vertical
-        scrollbar = ttk.Scrollbar(frame, orient="vertical", command=self.fields_canvas.yview)
-        scrollbar.grid(row=1, column=2, sticky="ns")
-        self.fields_canvas.configure(yscrollcommand=scrollbar.set)
-
-        # Vincular el canvas con la rueda del mouse, solo para este módulo
-        self.fields_canvas.bind("<Enter>", self._bind_mousewheel)
-        self.fields_canvas.bind("<Leave>", self._unbind_mousewheel)
+            width=6,
+        ).grid(row=0, column=1, pady=2, padx=2, sticky="w")
 
-        self.scrollable_frame.bind(
-            "<Configure>",
-            lambda e: self.fields_canvas.configure(scrollregion=self.fields_canvas.bbox("all")),
+        # Extracción en vivo mientras se escribe en el editor
+        self.live_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(
+            button_frame,
+            text="Live",
+            variable=self.live_var,
+            command=self.toggle_live,
+        ).grid(row=0, column=2, pady=2, padx=2, sticky="w")
+
+        # Filtro por campo, con el número de valores de cada uno
+        self.key_combo = ttk.Combobox(button_frame, values=[ALL_FIELDS], state="readonly", width=16)
+        self.key_combo.set(ALL_FIELDS)
+        self.key_combo.grid(row=0, column=3, pady=2, padx=2, sticky="ew")
+        self.key_combo.bind("<<ComboboxSelected>>", lambda e: self.render_fields(keep_position=False))
+
+        # Copiar toda la vista como tabla (separada por tabulaciones)
+        ttk.Button(
+            button_frame,
+            text="Copy All",
+            command=self.copy_all_fields,
+            width=8,
+        ).grid(row=0, column=4, pady=2, padx=2, sticky="e")
+
+        # Lista virtual: solo existen en Tk las filas visibles, sin importar cuántos valores haya
+        columns = ("field", "value", "count")
+        self.virtual_tree = VirtualTreeview(
+            frame,
+            columns,
+            row_values=lambda row: row[1:],
+            row_iid=lambda row: str(row[0]),
+            height=5,
         )
+        self.fields_tree = self.virtual_tree.tree
+        self.fields_tree.heading("field", text="Field", anchor="w")
+        self.fields_tree.heading("value", text="Value", anchor="w")
+        self.fields_tree.heading("count", text="#", anchor="center")
+        self.fields_tree.column("field", width=100, stretch=False, anchor="w")
+        self.fields_tree.column("value", width=200, anchor="w")
+        self.fields_tree.column("count", width=40, stretch=False, anchor="center")
+        self.virtual_tree.grid(row=1, column=0, sticky="nsew", padx=2, pady=2)
+        self.fields_tree.bind("<Double-1>", lambda e: self.copy_selected_fields())
+        self.fields_tree.bind("<Control-c>", lambda e: self.copy_selected_fields())
+
+        # Estado: totales y confirmación de copias (sin ventanas modales)
+        self.status_label = ttk.Label(frame, text="", anchor="w", font=("Arial", 8))
+        self.status_label.grid(row=2, column=0, sticky="ew", padx=2)
 
     def display_extracted_fields(self, fields):
         """
-        Muestra los campos extraídos en la interfaz en columnas.
+        Muestra los campos extraídos. ``fields`` es {campo: {valor: ocurrencias}} o {campo: [valores]}.
         """
-        for widget in self.scrollable_frame.winfo_children():
-            widget.destroy()
+        self.fields = {key: self.count_values(values) for key, values in fields.items() if values}
+        self.update_key_options()
+        self.render_fields(keep_position=False)
 
-        if not fields:
-            ttk.Label(self.scrollable_frame, text="No fields extracted.", anchor="center").pack(pady=2)
+    def update_field_values(self, changes):
+        """
+        Aplica solo los campos cuyos valores cambiaron y vuelve a pintar la ventana visible.
+        """
+        if not changes:
             return
+        for key, values in changes.items():
+            if values:
+                self.fields[key] = self.count_values(values)
+            else:
+                self.fields.pop(key, None)
+        self.update_key_options()
+        self.render_fields(keep_position=True)
 
-        # Mostrar los campos en columnas verticales
-        max_rows = 5
-        row = 0
-        col = 0
-
-        for index, (key, value_list) in enumerate(fields.items(), start=1):
-            for value in value_list:
-                field_frame = ttk.Frame(self.scrollable_frame)
-                field_frame.grid(row=row, column=col, sticky="nsew", padx=2, pady=1)
-
-                # Viñeta con índice
-                ttk.Label(
-                    field_frame,
-                    text=f"{index}.",
-                    anchor="center",
-                    width=2,
-                    font=("Arial", 8),
-                    foreground="blue",
-                ).grid(row=0, column=0, sticky="w")
-
-                # Etiqueta del campo
-                ttk.Label(
-                    field_frame,
-                    text=f"{key}:",
-                    anchor="w",
-                    width=20,
-                    font=("Arial", 8),
-                ).grid(row=0, column=1, sticky="w")
-
-                # Valor del campo
-                ttk.Label(
-                    field_frame,
-                    text=value,
-                    anchor="w",
-                    wraplength=150,
-                    font=("Arial", 8),
-                ).grid(row=0, column=2, sticky="w")
-
-                # Botón para copiar al portapapeles
-                ttk.Button(
-                    field_frame,
-                    text="📋",
-                    width=2,
-                    command=lambda v=value: self.copy_to_clipboard(v),
-                ).grid(row=0, column=3, sticky="w", padx=2)
-
-                # Ajustar la posición de fila y columna
-                row += 1
-                if row >= max_rows:
-                    row = 0
-                    col += 1
+    @staticmethod
+    def count_values(values):
+        # Las listas (campos "clave: valor") se cuentan; los dict ya traen las ocurrencias
+        return dict(values) if isinstance(values, dict) else dict(Counter(values))
+
+    def update_key_options(self):
+        """
+        Rellena el filtro de campos con el número de valores distintos de cada uno.
+        """
+        total = sum(len(values) for values in self.fields.values())
+        options = [f"{ALL_FIELDS} ({total})"] + [f"{key} ({len(values)})" for key, values in self.fields.items()]
+        self.key_combo.configure(values=options)
+        selected = self.selected_key()
+        if selected != ALL_FIELDS and selected not in self.fields:
+            selected = ALL_FIELDS
+        self.key_combo.set(options[0] if selected == ALL_FIELDS else f"{selected} ({len(self.fields[selected])})")
+
+    def selected_key(self):
+        # "IPv4 (12)" -> "IPv4"
+        text = self.key_combo.get()
+        return text.rsplit(" (", 1)[0] if text.endswith(")") else text
+
+    def render_fields(self, keep_position=True):
+        """
+        Construye las filas del campo seleccionado (o de todos) y las entrega a la lista virtual.
+        """
+        selected = self.selected_key()
+        keys = self.fields if selected == ALL_FIELDS else [selected]
+        rows = []
+        for key in keys:
+            for value, count in self.fields.get(key, {}).items():
+                rows.append((len(rows), key, value, count))
+        self.rows = rows
+        self.virtual_tree.set_rows(rows, keep_position=keep_position)
+
+        if not self.fields:
+            self.status_label.config(text="No fields extracted.")
+        else:
+            occurrences = sum(row[3] for row in rows)
+            self.status_label.config(text=f"{len(rows)} values, {occurrences} occurrences")
 
     def extract_fields(self):
         """
-        Extrae campos reales del contenido establecido usando patrones basados en ":".
-        Solo analiza el contenido después de "####INVESTIGATION DETAILS####".
+        Extrae los campos "clave: valor" y los indicadores (IPs, dominios, URLs, hashes...)
+        del editor. Los campos se toman después de "####INVESTIGATION DETAILS####" si existe.
         """
         if not self.editor_module or not hasattr(self.editor_module, "editor_box"):
             messagebox.showerror("Error", "Editor module not configured!")
@@ -149,61 +184,100 @@ class ExtractFieldsModule:
 
         # Buscar la sección relevante
         investigation_marker = "####INVESTIGATION DETAILS####"
-        if investigation_marker not in content_to_parse:
-            messagebox.showwarning("No Marker Found", f"'{investigation_marker}' not found in the content.")
-            return
-
-        relevant_content = content_to_parse.split(investigation_marker, 1)[1].strip()
+        relevant_content = content_to_parse
+        if investigation_marker in content_to_parse:
+            relevant_content = content_to_parse.split(investigation_marker, 1)[1].strip()
 
-        # Extraer campos usando el patrón actualizado
-        # Captura claves completas (incluye espacios) y múltiples valores
-        pattern = r"(?P<key>.+?):\s+(?P<value>[^\s].+)"
-        matches = re.findall(pattern, relevant_content)
-
-        extracted_fields = {}
-        for key, value in matches:
-            key = key.strip()
-            if key in extracted_fields:
-                extracted_fields[key].append(value.strip())
-            else:
-                extracted_fields[key] = [value.strip()]
+        # Campos "clave: valor" e indicadores en una sola pasada cada uno
+        extracted_fields = parse_fields(relevant_content)
+        for kind, counts in count_iocs(content_to_parse).items():
+            extracted_fields[KIND_LABELS[kind]] = counts
 
         if not extracted_fields:
             messagebox.showinfo("No Fields Found", "No fields were extracted from the content.")
+        self.display_extracted_fields(extracted_fields)
+
+    def toggle_live(self):
+        """
+        Activa o desactiva la extracción incremental ligada a las ediciones del editor.
+        """
+        if not self.editor_module or not getattr(self.editor_module, "change_tracker", None):
+            messagebox.showerror("Error", "Editor module not configured!")
+            self.live_var.set(False)
+            return
+
+        if self.live_var.get():
+            self.editor_module.add_change_listener(self.on_editor_change)
+            self.extractor.reset(self.editor_module.editor_box.get("1.0", "end-1c"))
+            self.extractor.take_changes()
+            self.display_extracted_fields(self.extractor.results())
         else:
-            self.display_extracted_fields(extracted_fields)
+            self.editor_module.remove_change_listener(self.on_editor_change)
 
-    def copy_to_clipboard(self, text):
+    def on_editor_change(self, splices):
         """
-        Copia el texto especificado al portapapeles.
+        Registra las líneas afectadas por una edición; la extracción se hace en after_idle
+        para agrupar ráfagas de cambios (pegar, teclear rápido) en una sola pasada.
         """
-        self.parent.clipboard_clear()
-        self.parent.clipboard_append(text)
-        self.parent.update()
-        messagebox.showinfo("Copied", f"Copied to clipboard: {text}")
+        if splices is None:
+            self.extractor.reset(self.editor_module.editor_box.get("1.0", "end-1c"))
+        else:
+            for start, old_count, new_count in splices:
+                self.extractor.splice(start, old_count, new_count)
+        if not self.live_pending:
+            self.live_pending = True
+            self.parent.after_idle(self.refresh_live)
 
-    def clear_fields(self):
+    def refresh_live(self):
         """
-        Limpia todos los campos mostrados.
+        Vuelve a extraer solo las líneas sucias y envía al panel los campos que cambiaron.
         """
-        for widget in self.scrollable_frame.winfo_children():
-            widget.destroy()
-        ttk.Label(self.scrollable_frame, text="Fields cleared.", anchor="center").pack(pady=2)
+        self.live_pending = False
+        if not self.live_var.get():
+            return
+        tracker = self.editor_module.change_tracker
+        if len(self.extractor.lines) != tracker.line_count():
+            # La caché perdió la sincronía con el texto: se reconstruye
+            self.extractor.reset(self.editor_module.editor_box.get("1.0", "end-1c"))
+        else:
+            for start, end in self.extractor.take_dirty_ranges():
+                self.extractor.update(start, tracker.get_lines(start, end))
+        self.update_field_values(self.extractor.take_changes())
+
+    def copy_selected_fields(self):
+        """
+        Copia los valores de las filas seleccionadas, uno por línea.
+        """
+        rows = [self.virtual_tree.row_for_iid(iid) for iid in self.fields_tree.selection()]
+        values = [row[2] for row in rows if row]
+        if values:
+            self.copy_to_clipboard("\n".join(values), f"Copied {values[0]}" if len(values) == 1 else f"Copied {len(values)} values")
+        return "break"
 
-    def _bind_mousewheel(self, event):
+    def copy_all_fields(self):
         """
-        Permite desplazar el canvas con la rueda del mouse cuando el puntero está sobre este módulo.
+        Copia la vista actual como tabla (Field, Value, Count separados por tabulaciones).
         """
-        self.fields_canvas.bind("<MouseWheel>", self._on_mousewheel)
+        if not self.rows:
+            self.status_label.config(text="Nothing to copy.")
+            return
+        lines = ["Field\tValue\tCount"]
+        lines.extend(f"{key}\t{value}\t{count}" for index, key, value, count in self.rows)
+        self.copy_to_clipboard("\n".join(lines), f"Copied {len(self.rows)} rows as table")
 
-    def _unbind_mousewheel(self, event):
+    def copy_to_clipboard(self, text, message=None):
         """
-        Desactiva el desplazamiento con la rueda del mouse cuando el puntero sale del módulo.
+        Copia el texto especificado al portapapeles y lo indica en la barra de estado.
         """
-        self.fields_canvas.unbind("<MouseWheel>")
+        self.parent.clipboard_clear()
+        self.parent.clipboard_append(text)
+        self.status_label.config(text=message or "Copied to clipboard")
 
-    def _on_mousewheel(self, event):
+    def clear_fields(self):
         """
-        Maneja el desplazamiento con la rueda del mouse.
+        Limpia todos los campos mostrados.
         """
-        self.fields_canvas.yview_scroll(-1 * (event.delta // 120), "units")
+        self.fields = {}
+        self.update_key_options()
+        self.render_fields(keep_position=False)
+        self.status_label.config(text="Fields cleared.")
@@ -2,12 +2,12 @@ from tkinter import ttk
 
 
 class FooterModule:
-    def __init__(self, parent, row_start, col_start, col_span):
+    def __init__(self, parent, row_start, col_start, col_span, executor=None):
         self.parent = parent
         self.row_start = row_start
         self.col_start = col_start
         self.col_span = col_span
-
+        self.executor = executor
 
     def build(self):
         footer_frame = ttk.Frame(self.parent)
@@ -18,4 +18,22 @@ class FooterModule:
             font=("Arial", 10, "italic"),
             anchor="center",
         )
-        footer_label.pack()
+        footer_label.pack(side="left", expand=True)
+
+        # Indicador de actividad: visible mientras haya tareas en segundo plano
+        self.busy_label = ttk.Label(footer_frame, text="", font=("Arial", 9))
+        self.busy_bar = ttk.Progressbar(footer_frame, mode="indeterminate", length=80)
+        if self.executor:
+            self.executor.add_busy_listener(self.update_busy)
+
+    def update_busy(self, pending):
+        if pending:
+            self.busy_label.config(text=f"Working... ({pending})")
+            if not self.busy_bar.winfo_ismapped():
+                self.busy_label.pack(side="right", padx=5)
+                self.busy_bar.pack(side="right", padx=5)
+                self.busy_bar.start(15)
+        else:
+            self.busy_bar.stop()
+            self.busy_bar.pack_forget()
+            self.busy_label.pack_forget()
@@ -1,19 +1,33 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
-from datetime import datetime
+from datetime import datetime, timedelta
+from functions.event_bus import ClientAdded, TicketDeleted, TicketsReloaded, TicketUpserted, TucAdded
+from functions.storage import ticket_key
+from functions.ticket_index import iid_key, ticket_iid
+from modules.live_search import LiveSearch
+from modules.virtual_tree import VirtualTreeview
 
 
 class HistoryModule:
-    def __init__(self, parent, row_start, col_start, col_span, row_span, data_manager):
+    def __init__(self, parent, row_start, col_start, col_span, row_span, data_manager, executor):
         self.parent = parent
         self.row_start = row_start
         self.col_start = col_start
         self.col_span = col_span
         self.row_span = row_span
         self.data_manager = data_manager
+        self.executor = executor
         self.search_var = tk.StringVar()
         self.client_filter_var = tk.StringVar()
+        self.tuc_filter_var = tk.StringVar()
+        self.category_filter_var = tk.StringVar()
+        self.date_from_var = tk.StringVar()
+        self.date_to_var = tk.StringVar()
         self.tickets = []
+        self.ticket_positions = {}  # (ticket_number, client) -> posición en self.tickets
+        self.search_query = ""
+        self.search_results = []
+        self.keep_position = False
         self.sort_by = None
         self.sort_reverse = False
 
@@ -29,7 +43,7 @@ class HistoryModule:
             pady=5,
         )
         frame.columnconfigure(0, weight=1)
-        frame.rowconfigure(1, weight=1)
+        frame.rowconfigure(2, weight=1)
 
         search_frame = ttk.Frame(frame)
         search_frame.grid(row=0, column=0, sticky="ew", padx=5, pady=5)
@@ -39,15 +53,57 @@ class HistoryModule:
         search_entry.pack(side="left", fill="x", expand=True, padx=5)
         search_button = ttk.Button(search_frame, text="Filter", command=self.update_history_list)
         search_button.pack(side="left", padx=5)
+        # Búsqueda en vivo mientras se escribe, en un hilo de trabajo
+        self.live_search = LiveSearch(
+            frame,
+            self.search_var,
+            self.search_history,
+            self.show_search_results,
+            narrows=self.query_narrows,
+            on_error=self.on_search_error,
+        )
 
         # Filtro por cliente
         ttk.Label(search_frame, text="Client:").pack(side="left", padx=5)
         self.client_filter = ttk.Combobox(search_frame, textvariable=self.client_filter_var, state="readonly")
         self.client_filter.pack(side="left", padx=5)
-        self.client_filter.bind("<<ComboboxSelected>>", lambda e: self.update_history_list())
+        self.client_filter.bind("<<ComboboxSelected>>", lambda e: self.render_history_list())
+
+        # Filtros predefinidos: TUC, categoría y rango de fechas (YYYY-MM-DD)
+        filter_frame = ttk.Frame(frame)
+        filter_frame.grid(row=1, column=0, sticky="ew", padx=5)
+
+        ttk.Label(filter_frame, text="TUC:").pack(side="left", padx=5)
+        self.tuc_filter = ttk.Combobox(filter_frame, textvariable=self.tuc_filter_var, state="readonly", width=15)
+        self.tuc_filter.pack(side="left", padx=5)
+        self.tuc_filter.bind("<<ComboboxSelected>>", lambda e: self.render_history_list())
+
+        ttk.Label(filter_frame, text="Category:").pack(side="left", padx=5)
+        self.category_filter = ttk.Combobox(filter_frame, textvariable=self.category_filter_var, state="readonly", width=15)
+        self.category_filter.pack(side="left", padx=5)
+        self.category_filter.bind("<<ComboboxSelected>>", lambda e: self.render_history_list())
+
+        ttk.Label(filter_frame, text="From:").pack(side="left", padx=5)
+        date_from_entry = ttk.Entry(filter_frame, textvariable=self.date_from_var, width=11)
+        date_from_entry.pack(side="left", padx=5)
+        ttk.Label(filter_frame, text="To:").pack(side="left", padx=5)
+        date_to_entry = ttk.Entry(filter_frame, textvariable=self.date_to_var, width=11)
+        date_to_entry.pack(side="left", padx=5)
+        for entry in (date_from_entry, date_to_entry):
+            entry.bind("<Return>", lambda e: self.render_history_list())
+        ttk.Button(filter_frame, text="Apply", command=self.render_history_list).pack(side="left", padx=5)
+        ttk.Button(filter_frame, text="Clear", command=self.clear_filters).pack(side="left", padx=5)
 
         columns = ("ticket_number", "account", "tuc", "short_description", "timezone")
-        self.history_tree = ttk.Treeview(frame, columns=columns, show="headings", height=8)
+        # Lista virtual: solo existen en Tk las filas visibles (más un margen)
+        self.virtual_tree = VirtualTreeview(
+            frame,
+            columns,
+            row_values=self.ticket_row_values,
+            row_iid=lambda ticket: ticket_iid((ticket.get("ticket_number"), ticket.get("client"))),
+            height=8,
+        )
+        self.history_tree = self.virtual_tree.tree
 
         for col in columns:
             self.history_tree.heading(
@@ -58,59 +114,211 @@ class HistoryModule:
             )
             self.history_tree.column(col, width=120, anchor="center")
 
-        self.history_tree.grid(row=1, column=0, sticky="nsew", padx=5, pady=5)
+        self.virtual_tree.grid(row=2, column=0, sticky="nsew", padx=5, pady=5)
         self.history_tree.bind("<Double-1>", self.on_ticket_double_click)
 
         self.load_tickets()
-        self.update_client_filter()  # Update the client filter options
-        self.update_history_list()
+        self.update_filter_options()
+        self.search_results = list(self.tickets)
+        self.render_history_list()
+
+        # Cambios publicados por DataManager: se aplican fila a fila
+        events = self.data_manager.events
+        events.subscribe(TicketUpserted, self.on_ticket_upserted)
+        events.subscribe(TicketDeleted, self.on_ticket_deleted)
+        events.subscribe(TicketsReloaded, self.on_tickets_reloaded)
+        events.subscribe(TucAdded, self.on_filter_value_added)
+        events.subscribe(ClientAdded, self.on_filter_value_added)
 
     def load_tickets(self):
-        self.tickets = self.data_manager.get_tickets()
-
-    def update_client_filter(self):
-        clients = sorted(set(ticket.get("client", "Unknown") for ticket in self.tickets))
-        self.client_filter["values"] = ["All"] + clients
-        self.client_filter_var.set("All")
-
-    def update_history_list(self):
-        self.history_tree.delete(*self.history_tree.get_children())
-        query = self.search_var.get().lower()
-        selected_client = self.client_filter_var.get()
-
-        filtered_tickets = [
-            ticket
-            for ticket in self.tickets
-            if (
-                query in ticket.get("ticket_number", "").lower()
-                or query in ticket.get("client", "").lower()
-                or query in ticket.get("tuc", "").lower()
-                or query in ticket.get("short_description", "").lower()
-                or query in ticket.get("timezone", "").lower()
-            )
-        ]
+        # Solo metadata: el contenido se lee bajo demanda al abrir el ticket
+        self.tickets = list(self.data_manager.get_ticket_summaries())
+        self.ticket_positions = {ticket_key(ticket): position for position, ticket in enumerate(self.tickets)}
+
+    # Actualizaciones incrementales desde el bus de eventos
+    def list_is_derived(self):
+        """True when a search or filter decides which tickets are listed."""
+        if self.search_query or self.search_var.get().strip():
+            return True
+        values = (self.client_filter_var.get(), self.tuc_filter_var.get(), self.category_filter_var.get())
+        return any(value and value != "All" for value in values) or bool(
+            self.date_from_var.get().strip() or self.date_to_var.get().strip()
+        )
+
+    def on_ticket_upserted(self, event):
+        ticket = event.ticket
+        old_key = tuple(event.old_key) if event.old_key else ticket_key(ticket)
+        if ticket_key(ticket) != old_key and ticket_key(ticket) in self.ticket_positions:
+            # Renombrado sobre un ticket existente: lo reemplaza
+            self.remove_ticket(ticket_key(ticket))
+            self.virtual_tree.remove_row(ticket_iid(ticket_key(ticket)))
+        position = self.ticket_positions.pop(old_key, None)
+        if position is None:
+            position = len(self.tickets)
+            self.tickets.append(ticket)
+        else:
+            self.tickets[position] = ticket
+        self.ticket_positions[ticket_key(ticket)] = position
+        self.add_filter_values(ticket.get("client"), ticket.get("tuc"))
+
+        if self.list_is_derived():
+            # La pertenencia a los resultados puede cambiar: se repite la búsqueda (índices incrementales)
+            self.update_history_list(keep_position=True)
+            return
+        # Sin búsqueda ni filtros los resultados son todos los tickets: se comparte la lista
+        self.search_results = self.tickets
+        sort_key = None
+        if self.sort_by:
+            sort_field = "client" if self.sort_by == "account" else self.sort_by
+            sort_key = lambda x: x.get(sort_field) or ""
+        self.virtual_tree.upsert_row(ticket, ticket_iid(old_key), sort_key=sort_key, reverse=self.sort_reverse)
+
+    def on_ticket_deleted(self, event):
+        key = tuple(event.key)
+        self.remove_ticket(key)
+        if self.search_results is not self.tickets:
+            self.search_results = [ticket for ticket in self.search_results if ticket_key(ticket) != key]
+        self.virtual_tree.remove_row(ticket_iid(key))
+
+    def remove_ticket(self, key):
+        position = self.ticket_positions.pop(key, None)
+        if position is None:
+            return
+        del self.tickets[position]
+        # Solo se corren las posiciones de los tickets que estaban detrás
+        for index in range(position, len(self.tickets)):
+            self.ticket_positions[ticket_key(self.tickets[index])] = index
+
+    def on_tickets_reloaded(self, event):
+        self.load_tickets()
+        self.update_filter_options()
+        self.update_history_list(keep_position=True)
+
+    def on_filter_value_added(self, event):
+        if isinstance(event, TucAdded):
+            self.add_filter_values(tuc=event.name)
+        else:
+            self.add_filter_values(client=event.name)
+
+    def add_filter_values(self, client=None, tuc=None):
+        # Solo se agregan valores nuevos a los combos; los filtros activos se conservan
+        for combo, value in ((self.client_filter, client), (self.tuc_filter, tuc)):
+            values = list(combo["values"])
+            if value and value not in values:
+                combo["values"] = values[:1] + sorted(values[1:] + [value])
+
+    @staticmethod
+    def ticket_row_values(ticket):
+        return (
+            ticket.get("ticket_number") or "",
+            ticket.get("client") or "",
+            ticket.get("tuc") or "",
+            ticket.get("short_description") or "",
+            ticket.get("timezone") or "",
+        )
+
+    def update_filter_options(self):
+        index = self.data_manager.ticket_filters()
+        self.client_filter["values"] = ["All"] + index.clients()
+        self.tuc_filter["values"] = ["All"] + index.tucs()
+        self.category_filter["values"] = ["All"] + index.categories()
+        self.clear_filters(render=False)
+
+    def clear_filters(self, render=True):
+        for variable in (self.client_filter_var, self.tuc_filter_var, self.category_filter_var):
+            variable.set("All")
+        self.date_from_var.set("")
+        self.date_to_var.set("")
+        if render:
+            self.render_history_list()
+
+    def active_filters(self):
+        """Selected filters as ``TicketFilterIndex.match`` arguments, or None if a date is invalid."""
+        filters = {}
+        for name, variable in (
+            ("client", self.client_filter_var),
+            ("tuc", self.tuc_filter_var),
+            ("category", self.category_filter_var),
+        ):
+            value = variable.get()
+            if value and value != "All":
+                filters[name] = value
+        try:
+            date_from = self.date_from_var.get().strip()
+            date_to = self.date_to_var.get().strip()
+            if date_from:
+                filters["start"] = datetime.strptime(date_from, "%Y-%m-%d").timestamp()
+            if date_to:
+                # Fecha final inclusiva: hasta el último segundo del día
+                end = datetime.strptime(date_to, "%Y-%m-%d") + timedelta(days=1)
+                filters["end"] = end.timestamp() - 1
+        except ValueError:
+            messagebox.showerror("Error", "Dates must use the YYYY-MM-DD format.")
+            return None
+        return filters
+
+    def update_history_list(self, keep_position=False):
+        """Re-run the current search (in the background) and refresh the list."""
+        self.keep_position = keep_position
+        self.live_search.refresh()
+
+    def search_history(self, query, candidates, cancelled):
+        """Worker-thread search: ranked index lookup, narrowed to ``candidates`` if given."""
+        query = query.strip()
+        if not query:
+            return list(self.tickets)
+        # La última palabra puede estar a medio escribir: se busca como prefijo
+        last_word = query.split()[-1]
+        if query[-1].isalnum() and last_word not in ("AND", "OR"):
+            query += "*"
+        if candidates is not None:
+            candidates = {ticket_key(ticket) for ticket in candidates}
+        # Búsqueda en el índice invertido (metadata + contenido), ordenada por relevancia
+        return self.data_manager.search_tickets(query, candidates=candidates, cancelled=cancelled)
+
+    @staticmethod
+    def query_narrows(old_query, new_query):
+        # Solo si la consulta anterior no estaba vacía y no hay alternativas OR
+        return bool(old_query.strip()) and new_query.startswith(old_query) and "OR" not in new_query.split()
+
+    def on_search_error(self, query, error):
+        messagebox.showerror("Error", f"Failed to search tickets: {error}")
+
+    def show_search_results(self, query, results):
+        self.search_query = query.strip()
+        self.search_results = results
+        self.render_history_list(keep_position=self.keep_position)
+        self.keep_position = False
+
+    def render_history_list(self, keep_position=False):
+        """Apply the predefined filters and sort order to the last search results."""
+        filters = self.active_filters()
+        if filters is None:
+            return
 
-        if selected_client != "All":
-            filtered_tickets = [ticket for ticket in filtered_tickets if ticket.get("client") == selected_client]
+        if not filters:
+            filtered_tickets = list(self.search_results)
+        elif not self.search_query:
+            # Sin búsqueda: los filtros se resuelven solo con los índices (bitmaps + rango)
+            filtered_tickets = self.data_manager.ticket_filters().filter(**filters)
+        else:
+            matching = {ticket_key(ticket) for ticket in self.data_manager.ticket_filters().filter(**filters)}
+            filtered_tickets = [ticket for ticket in self.search_results if ticket_key(ticket) in matching]
 
         if self.sort_by:
+            sort_field = "client" if self.sort_by == "account" else self.sort_by
             filtered_tickets.sort(
-                key=lambda x: x.get(self.sort_by, ""),
+                key=lambda x: x.get(sort_field) or "",
                 reverse=self.sort_reverse,
             )
 
-        for ticket in filtered_tickets:
-            self.history_tree.insert(
-                "",
-                "end",
-                values=(
-                    ticket.get("ticket_number", ""),
-                    ticket.get("client", ""),
-                    ticket.get("tuc", ""),
-                    ticket.get("short_description", ""),
-                    ticket.get("timezone", ""),
-                ),
-            )
+        self.virtual_tree.set_rows(filtered_tickets, keep_position=keep_position)
+
+    def get_scroll_position(self):
+        return self.virtual_tree.get_scroll_position()
+
+    def set_scroll_position(self, index):
+        self.virtual_tree.set_scroll_position(index)
 
     def sort_history(self, column):
         if self.sort_by == column:
@@ -119,17 +327,15 @@ class HistoryModule:
             self.sort_by = column
             self.sort_reverse = False
 
-        self.update_history_list()
+        self.render_history_list()
 
     def on_ticket_double_click(self, event):
         selected_item = self.history_tree.selection()
         if not selected_item:
             return
 
-        ticket_data = self.history_tree.item(selected_item[0], "values")
-        ticket_number = ticket_data[0]
-
-        ticket = next((t for t in self.tickets if t.get("ticket_number") == ticket_number), None)
+        # El iid de cada fila es la clave primaria del ticket: búsqueda O(1) en el índice
+        ticket = self.data_manager.find_ticket(*iid_key(selected_item[0]))
         if ticket:
             self.open_ticket_editor(ticket)
 
@@ -197,16 +403,106 @@ class HistoryModule:
 
         self.content_text = tk.Text(text_subframe, wrap="word")
         self.content_text.grid(row=0, column=0, sticky="nsew")
-        self.content_text.insert("1.0", ticket.get("content", ""))
+        self.content_text.insert("1.0", self.data_manager.get_ticket_content(ticket))
 
         scrollbar = ttk.Scrollbar(text_subframe, command=self.content_text.yview)
         scrollbar.grid(row=0, column=1, sticky="ns")
         self.content_text.config(yscrollcommand=scrollbar.set)
 
+        ttk.Button(editor_window, text="Revisions...",
+                   command=lambda: self.open_revisions_window(ticket, editor_window)).pack(fill="x", padx=10)
         save_btn = ttk.Button(editor_window, text="Save Changes",
                               command=lambda: self.save_changes(ticket, editor_window))
         save_btn.pack(fill="x", padx=10, pady=10)
 
+    def open_revisions_window(self, ticket, editor_window):
+        key = (ticket.get("ticket_number"), ticket.get("client"))
+        revisions = self.data_manager.ticket_revisions(*key)
+        if not revisions:
+            messagebox.showinfo("Revisions", "This ticket has no saved revisions yet.", parent=editor_window)
+            return
+
+        window = tk.Toplevel(editor_window)
+        window.title(f"Revisions: {key[0]}")
+        self.center_window(window, 800, 500)
+
+        labels = [
+            f"r{rev['rev']}  {datetime.fromtimestamp(rev['time']).strftime('%Y-%m-%d %H:%M')}  ({rev['size']} chars)"
+            for rev in revisions
+        ]
+        top = ttk.Frame(window)
+        top.pack(fill="x", padx=10, pady=5)
+        ttk.Label(top, text="From:").pack(side="left")
+        old_combo = ttk.Combobox(top, values=labels, state="readonly", width=32)
+        old_combo.current(max(0, len(labels) - 2))
+        old_combo.pack(side="left", padx=5)
+        ttk.Label(top, text="To:").pack(side="left")
+        new_combo = ttk.Combobox(top, values=labels, state="readonly", width=32)
+        new_combo.current(len(labels) - 1)
+        new_combo.pack(side="left", padx=5)
+
+        text_frame = ttk.Frame(window)
+        text_frame.pack(fill="both", expand=True, padx=10, pady=5)
+        text_frame.rowconfigure(0, weight=1)
+        text_frame.columnconfigure(0, weight=1)
+        diff_text = tk.Text(text_frame, wrap="none", font=("Consolas", 9))
+        diff_text.grid(row=0, column=0, sticky="nsew")
+        scrollbar = ttk.Scrollbar(text_frame, command=diff_text.yview)
+        scrollbar.grid(row=0, column=1, sticky="ns")
+        diff_text.config(yscrollcommand=scrollbar.set)
+        diff_text.tag_configure("added", foreground="dark green")
+        diff_text.tag_configure("removed", foreground="red3")
+        diff_text.tag_configure("hunk", foreground="blue")
+
+        def show_diff(lines):
+            diff_text.config(state="normal")
+            diff_text.delete("1.0", "end")
+            if not lines:
+                diff_text.insert("end", "No differences.")
+            # Una inserción por bloque de líneas del mismo tipo, no una por línea
+            block, block_tag = [], None
+            for line in lines:
+                tag = "hunk" if line.startswith("@@") else "added" if line.startswith("+") else (
+                    "removed" if line.startswith("-") else None)
+                if tag != block_tag and block:
+                    diff_text.insert("end", "\n".join(block) + "\n", block_tag or ())
+                    block = []
+                block_tag = tag
+                block.append(line)
+            if block:
+                diff_text.insert("end", "\n".join(block) + "\n", block_tag or ())
+            diff_text.config(state="disabled")
+
+        def refresh(event=None):
+            self.executor.submit(
+                self.data_manager.diff_ticket_revisions,
+                *key,
+                old_combo.current(),
+                new_combo.current(),
+                on_done=show_diff,
+                on_error=lambda e: messagebox.showerror("Error", f"Failed to compare revisions: {e}", parent=window),
+            )
+
+        def restore():
+            # Carga la revisión "To" en el editor del ticket; se guarda con "Save Changes"
+            def load(content):
+                self.content_text.delete("1.0", "end")
+                self.content_text.insert("1.0", content)
+                window.destroy()
+
+            self.executor.submit(
+                self.data_manager.get_ticket_revision,
+                *key,
+                new_combo.current(),
+                on_done=load,
+                on_error=lambda e: messagebox.showerror("Error", f"Failed to load revision: {e}", parent=window),
+            )
+
+        old_combo.bind("<<ComboboxSelected>>", refresh)
+        new_combo.bind("<<ComboboxSelected>>", refresh)
+        ttk.Button(top, text="Load 'To' into Editor", command=restore).pack(side="right")
+        refresh()
+
     def save_changes(self, ticket, editor_window):
         new_ticket_number = self.entry_ticket_number.get().strip()
         new_client = self.entry_client.get().strip()
@@ -220,22 +516,29 @@ class HistoryModule:
         new_assigned = self.entry_assigned.get().strip()
         new_content = self.content_text.get("1.0", "end").strip()
 
-        ticket["ticket_number"] = new_ticket_number
-        ticket["client"] = new_client
-        ticket["short_description"] = new_short_desc
-        ticket["tuc"] = new_tuc
-        ticket["severity"] = new_severity
-        ticket["assigned_to"] = new_assigned
-        ticket["updated_timestamp"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        ticket["content"] = new_content
-
-        filename = self.data_manager.files.get("tickets", "")
-        self.data_manager._save_json(filename, self.tickets)
-
-        self.load_tickets()  # Reload tickets from updated data
-        self.update_history_list()
-        messagebox.showinfo("Success", "Ticket updated successfully!")
-        editor_window.destroy()
+        updated_ticket = {
+            "ticket_number": new_ticket_number,
+            "client": new_client,
+            "short_description": new_short_desc,
+            "tuc": new_tuc,
+            "severity": new_severity,
+            "assigned_to": new_assigned,
+            "updated_timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "content": new_content,
+        }
+        def on_saved(result):
+            # La lista se actualiza con el evento TicketUpserted de DataManager
+            messagebox.showinfo("Success", "Ticket updated successfully!")
+            editor_window.destroy()
+
+        self.executor.submit(
+            self.data_manager.update_ticket,
+            updated_ticket,
+            key=(ticket.get("ticket_number"), ticket.get("client")),
+            serial=True,
+            on_done=on_saved,
+            on_error=lambda e: messagebox.showerror("Error", f"Failed to update ticket: {e}"),
+        )
 
     def center_window(self, window, width, height):
         window.update_idletasks()
@@ -1,5 +1,6 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
+from functions.event_bus import ClientAdded, CollectionChanged, TucAdded
 
 class InputModule:
     def __init__(
@@ -106,6 +107,15 @@ class InputModule:
         ).grid(row=3, column=1, sticky="ew", padx=2, pady=2)
 
         self.refresh_inputs()
+        self.data_manager.events.subscribe(TucAdded, self.on_lists_changed)
+        self.data_manager.events.subscribe(ClientAdded, self.on_lists_changed)
+        self.data_manager.events.subscribe(CollectionChanged, self.on_lists_changed)
+
+    def on_lists_changed(self, event):
+        # Clientes y TUCs pueden cambiar desde Manage All o desde otros módulos
+        if isinstance(event, CollectionChanged) and event.collection not in ("clients", "tucs"):
+            return
+        self.refresh_inputs()
 
     def submit_inputs(self):
         details = (
@@ -134,8 +144,7 @@ class InputModule:
         if not new_tuc:
             messagebox.showerror("Error", "TUC field is empty.")
             return
-        self.data_manager.add_tuc(new_tuc)
-        self.refresh_inputs()
+        self.data_manager.add_tuc(new_tuc)  # Los combos se refrescan con el evento TucAdded
         messagebox.showinfo("Success", f"TUC '{new_tuc}' added successfully!")
 
     def clear_inputs(self):
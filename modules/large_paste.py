@@ -0,0 +1,68 @@
+import time
+
+CHUNK_CHARS = 64 * 1024
+
+
+class ChunkedPaste:
+    """Insert a large string into a ``tk.Text`` in slices scheduled with ``after_idle``.
+
+    Each slice inserts at most ``chunk_size`` characters (cut at a line break
+    when possible), so the event loop gets control back between slices and the
+    window keeps redrawing. The undo stack is switched off while inserting and
+    cleared at the end: recording the paste would keep a second copy of it in
+    memory, and older entries would point at shifted indexes.
+    ``on_done(elapsed, max_slice)`` receives the total time and the longest
+    slice, which is how long the UI was blocked at most.
+    """
+
+    def __init__(self, text, payload, index="insert", chunk_size=CHUNK_CHARS, on_done=None, on_progress=None):
+        self.text = text
+        self.payload = payload
+        self.chunk_size = chunk_size
+        self.on_done = on_done
+        self.on_progress = on_progress
+        self.offset = 0
+        self.mark = f"chunked_paste_{id(self)}"
+        self.started = None
+        self.max_slice = 0.0
+        self.job = None
+        self.undo = bool(int(text.cget("undo")))
+        text.mark_set(self.mark, index)
+        text.mark_gravity(self.mark, "right")  # La marca avanza con cada trozo insertado
+
+    def start(self):
+        self.started = time.perf_counter()
+        self.text.edit_separator()
+        self.text.configure(undo=False)
+        self.job = self.text.after_idle(self._step)
+
+    def cancel(self):
+        if self.job:
+            self.text.after_cancel(self.job)
+        self._finish()
+
+    def _step(self):
+        slice_start = time.perf_counter()
+        end = min(len(self.payload), self.offset + self.chunk_size)
+        if end < len(self.payload):
+            newline = self.payload.rfind("\n", self.offset, end)
+            if newline > self.offset:
+                end = newline + 1
+        self.text.insert(self.mark, self.payload[self.offset:end])
+        self.offset = end
+        self.max_slice = max(self.max_slice, time.perf_counter() - slice_start)
+
+        if self.on_progress:
+            self.on_progress(self.offset, len(self.payload))
+        if self.offset < len(self.payload):
+            self.job = self.text.after_idle(self._step)
+        else:
+            self._finish()
+
+    def _finish(self):
+        self.job = None
+        self.text.mark_unset(self.mark)
+        self.text.edit_reset()
+        self.text.configure(undo=self.undo)
+        if self.on_done:
+            self.on_done(time.perf_counter() - self.started, self.max_slice)
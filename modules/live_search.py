@@ -0,0 +1,136 @@
+import queue
+import threading
+import traceback
+
+
+class LiveSearch:
+    """Search-as-you-type bound to a ``StringVar``.
+
+    Every change restarts a ``delay`` ms debounce timer. When it fires, the query
+    is handed to a worker thread that calls ``search(query, candidates, cancelled)``;
+    only the newest query is kept, older ones are dropped or told to stop through
+    ``cancelled()``. Results travel back through a queue drained with ``after()``
+    on the Tk thread and are delivered as ``on_results(query, results)``.
+
+    If the new query only extends the last completed one (``narrows(old, new)``),
+    the previous results are passed as ``candidates`` so the search can be
+    restricted to them instead of starting from scratch.
+
+    A search that raises is logged with its traceback and reported as
+    ``on_error(query, exception)``, once until a search succeeds again, so a
+    persistent failure does not pop up on every keystroke. The list keeps
+    showing the last results.
+    """
+
+    POLL_MS = 30
+    _STOP = object()
+
+    def __init__(self, widget, variable, search, on_results, delay=250, narrows=None, on_error=None):
+        self.widget = widget
+        self.variable = variable
+        self.search = search
+        self.on_results = on_results
+        self.on_error = on_error
+        self.failing = False
+        self.delay = delay
+        self.narrows = narrows or (lambda old, new: new.startswith(old))
+        self.generation = 0
+        self.last_query = None
+        self.last_results = None
+        self._timer = None
+        self._polling = False
+        self._results = queue.Queue()
+        self._pending = None
+        self._wakeup = threading.Condition()
+        self._worker = threading.Thread(target=self._run, daemon=True)
+        self._worker.start()
+        self._trace = variable.trace_add("write", lambda *args: self.schedule())
+
+    # Hilo de Tk
+    def schedule(self, delay=None):
+        """Restart the debounce timer; the search runs when typing pauses."""
+        if self._timer is not None:
+            self.widget.after_cancel(self._timer)
+        self._timer = self.widget.after(self.delay if delay is None else delay, self._submit)
+
+    def refresh(self):
+        """Search again now, without narrowing (the underlying data changed)."""
+        self.last_query = None
+        self.last_results = None
+        self.schedule(0)
+
+    def _submit(self):
+        self._timer = None
+        query = self.variable.get()
+        candidates = None
+        if self.last_results is not None and query != self.last_query and self.narrows(self.last_query, query):
+            candidates = self.last_results
+        self.generation += 1
+        with self._wakeup:
+            self._pending = (self.generation, query, candidates)
+            self._wakeup.notify()
+        if not self._polling:
+            self._polling = True
+            self.widget.after(self.POLL_MS, self._poll)
+
+    def _poll(self):
+        waiting = True
+        try:
+            while True:
+                generation, query, results, error = self._results.get_nowait()
+                # Los resultados de búsquedas ya reemplazadas se descartan
+                if generation != self.generation:
+                    continue
+                waiting = False
+                if error is not None:
+                    if not self.failing and self.on_error:
+                        self.on_error(query, error)
+                    self.failing = True
+                elif results is not None:
+                    self.failing = False
+                    self.last_query = query
+                    self.last_results = results
+                    self.on_results(query, results)
+        except queue.Empty:
+            pass
+        if waiting:
+            self.widget.after(self.POLL_MS, self._poll)
+        else:
+            self._polling = False
+
+    # Hilo de trabajo
+    def _run(self):
+        while True:
+            with self._wakeup:
+                while self._pending is None:
+                    self._wakeup.wait()
+                job = self._pending
+                self._pending = None
+            if job is self._STOP:
+                return
+            generation, query, candidates = job
+
+            def cancelled(generation=generation):
+                return generation != self.generation
+
+            results = None
+            error = None
+            if not cancelled():
+                try:
+                    results = self.search(query, candidates, cancelled)
+                except Exception as e:
+                    traceback.print_exc()
+                    error = e
+            # Siempre se responde, aunque sea sin resultados, para que el sondeo termine
+            if cancelled():
+                results = error = None
+            self._results.put((generation, query, results, error))
+
+    def close(self):
+        if self._timer is not None:
+            self.widget.after_cancel(self._timer)
+            self._timer = None
+        self.variable.trace_remove("write", self._trace)
+        with self._wakeup:
+            self._pending = self._STOP
+            self._wakeup.notify()
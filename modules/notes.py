@@ -1,22 +1,24 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
-import json
-import os
 import uuid
 from datetime import datetime
+from functions.event_bus import CollectionChanged, NoteAdded
+from functions.snapshot_cache import thaw
+from modules.live_search import LiveSearch
 
 
 class NotesModule:
-    def __init__(self, parent, row_start, col_start, col_span, row_span, data_manager, json_path="data/notes.json"):
+    def __init__(self, parent, row_start, col_start, col_span, row_span, data_manager, executor):
         self.parent = parent
         self.row_start = row_start
         self.col_start = col_start
         self.col_span = col_span
         self.row_span = row_span
         self.data_manager = data_manager
-        self.json_path = json_path
+        self.executor = executor
         self.notes = []
         self.filtered_notes = []
+        self.search_var = tk.StringVar()
 
     def build(self):
         frame = ttk.LabelFrame(self.parent, text="Notes")
@@ -37,12 +39,14 @@ class NotesModule:
         controls_frame.columnconfigure(0, weight=1)
 
         ttk.Label(controls_frame, text="Search:").grid(row=0, column=0, sticky="w", padx=2)
-        self.search_entry = ttk.Entry(controls_frame, width=30)
+        self.search_entry = ttk.Entry(controls_frame, width=30, textvariable=self.search_var)
         self.search_entry.grid(row=0, column=1, sticky="ew", padx=2)
         ttk.Button(controls_frame, text="Search", command=self.filter_notes).grid(row=0, column=2, sticky="w", padx=2)
 
         ttk.Button(controls_frame, text="New Note", command=self.new_note, width=12).grid(row=0, column=3, sticky="e", padx=2)
         ttk.Button(controls_frame, text="Delete Note", command=self.delete_note, width=12).grid(row=0, column=4, sticky="e", padx=2)
+        # Filtrado en vivo mientras se escribe
+        self.live_search = LiveSearch(frame, self.search_var, self.match_notes, self.show_search_results, on_error=self.on_search_error)
 
         tree_frame = ttk.Frame(frame)
         tree_frame.grid(row=1, column=0, sticky="nsew")
@@ -64,14 +68,21 @@ class NotesModule:
 
         self.load_notes()
         self.tree.bind("<Double-1>", self.open_note_details)
+        self.data_manager.events.subscribe(CollectionChanged, self.on_notes_changed)
+        self.data_manager.events.subscribe(NoteAdded, self.on_notes_changed)
+
+    def on_notes_changed(self, event):
+        # Los guardados propios ya están en memoria; solo se recargan cambios de otros módulos
+        if event.source is self or getattr(event, "collection", "notes") != "notes":
+            return
+        self.load_notes()
+        self.filter_notes()
 
     def load_notes(self):
         try:
-            if os.path.exists(self.json_path):
-                with open(self.json_path, "r", encoding="utf-8") as file:
-                    self.notes = json.load(file)
-                    self.filtered_notes = self.notes[:]
-                    self.update_notes_tree()
+            self.notes = thaw(self.data_manager.get_notes())
+            self.filtered_notes = self.notes[:]
+            self.update_notes_tree()
         except:
             self.notes = []
             self.filtered_notes = []
@@ -92,14 +103,29 @@ class NotesModule:
             )
 
     def filter_notes(self):
-        search_text = self.search_entry.get().lower()
-        self.filtered_notes = [
-            note
-            for note in self.notes
-            if search_text in note["name"].lower()
-            or search_text in note["content"].lower()
-            or any(search_text in tag.lower() for tag in note.get("tags", []))
-        ]
+        """Re-run the current filter (in the background) and refresh the tree."""
+        self.live_search.refresh()
+
+    def match_notes(self, search_text, candidates, cancelled):
+        """Worker-thread filter over ``candidates`` (previous results) or all notes."""
+        search_text = search_text.lower()
+        matches = []
+        for position, note in enumerate(list(self.notes if candidates is None else candidates)):
+            if position % 500 == 0 and cancelled():
+                return None
+            if (
+                search_text in note["name"].lower()
+                or search_text in note["content"].lower()
+                or any(search_text in tag.lower() for tag in note.get("tags", []))
+            ):
+                matches.append(note)
+        return matches
+
+    def on_search_error(self, search_text, error):
+        messagebox.showerror("Error", f"Failed to search notes: {error}")
+
+    def show_search_results(self, search_text, results):
+        self.filtered_notes = results
         self.update_notes_tree()
 
     def new_note(self):
@@ -131,9 +157,8 @@ class NotesModule:
 
         self.notes = [note for note in self.notes if note["name"] != note_name]
         self.filtered_notes = [note for note in self.filtered_notes if note["name"] != note_name]
-        self.save_notes_to_file()
+        self.save_notes_to_file(f"Note '{note_name}' deleted successfully!")
         self.update_notes_tree()
-        messagebox.showinfo("Success", f"Note '{note_name}' deleted successfully!")
 
     def open_note_details(self, event):
         selected_item = self.tree.focus()
@@ -186,11 +211,18 @@ class NotesModule:
         note_data["content"] = new_content
         note_data["timestamp"] = new_timestamp
 
-        self.save_notes_to_file()
+        self.save_notes_to_file("Changes saved successfully!")
         self.update_notes_tree()
-        messagebox.showinfo("Success", "Changes saved successfully!")
         editor_window.destroy()
 
-    def save_notes_to_file(self):
-        with open(self.json_path, "w", encoding="utf-8") as file:
-            json.dump(self.notes, file, indent=4)
+    def save_notes_to_file(self, success_message=None):
+        # Se guarda una copia en segundo plano; el aviso se muestra al terminar
+        self.executor.submit(
+            self.data_manager._save_json,
+            self.data_manager.files["notes"],
+            [dict(note) for note in self.notes],
+            source=self,
+            serial=True,
+            on_done=lambda result: success_message and messagebox.showinfo("Success", success_message),
+            on_error=lambda e: messagebox.showerror("Error", f"Failed to save notes: {e}"),
+        )
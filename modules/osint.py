@@ -1,14 +1,34 @@
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, filedialog, messagebox
 import webbrowser
-import subprocess
-import re
 import json
 import os
+import threading
+from functions.bulk_enrichment import bulk_providers, fetch_parsed, ticket_indicators
+from functions.http_pool import HTTPPool
+from functions.ioc_extractor import KIND_LABELS, classify_indicator
+from functions.ip_ranges import IPRangeDB, format_result, import_csv
+from functions.osint_parsers import parse_abuseipdb
+from functions.osint_urls import build_url, relevant_tools
+from functions.request_scheduler import INTERACTIVE
+from modules.bulk_enrichment import BulkEnrichmentWindow
+from modules.tab_launcher import TabLauncher
+
+ISP_PROVIDER = "AbuseIPDB"
+ISP_URL = "https://www.abuseipdb.com/check/"
+CONFIRM_TABS = 8  # Más pestañas que esto piden confirmación
+
+
+def format_age(seconds):
+    if seconds < 60:
+        return f"{int(seconds)} s"
+    if seconds < 3600:
+        return f"{int(seconds // 60)} min"
+    return f"{seconds / 3600:.1f} h"
 
 
 class OSINTModule:
-    def __init__(self, parent, row_start, col_start, col_span, row_span, json_path="osint.json", editor_module=None):
+    def __init__(self, parent, row_start, col_start, col_span, row_span, json_path="osint.json", editor_module=None, executor=None, cache=None, http_pool=None, scheduler=None, ip_ranges_path=None):
         self.parent = parent
         self.row_start = row_start
         self.col_start = col_start
@@ -16,34 +36,86 @@ class OSINTModule:
         self.row_span = row_span
         self.json_path = json_path
         self.editor_module = editor_module
+        self.executor = executor
+        self.cache = cache  # EnrichmentCache opcional: evita repetir consultas a los proveedores
+        self.http = http_pool or HTTPPool()  # Conexiones keep-alive reutilizadas entre consultas
+        self.scheduler = scheduler  # RequestScheduler opcional: cuotas por proveedor y prioridades
+        self.ip_ranges_path = ip_ranges_path  # Base de rangos IP local para consultas sin red
+        self.ip_ranges = None
+        self.ip_ranges_lock = threading.Lock()
         self.osint_var = tk.StringVar()
         self.param_var = tk.StringVar()
-        self.osint_tools = self.load_osint_tools()
+        self.osint_tools = []
+        self.tool_combo = None
+        self.status_label = None
+        self.launcher = TabLauncher(parent)
 
     def load_osint_tools(self):
-        """Load OSINT tools from a JSON file. Create file if not exists."""
+        """Load OSINT tools from the JSON file in the background."""
+        self.executor.submit(self.read_osint_tools, on_done=self.set_osint_tools, on_error=self.on_load_error)
+
+    def read_osint_tools(self):
+        """Worker: read the tools file, creating the default one if missing. Returns (tools, created)."""
+        created = False
         if not os.path.exists(self.json_path):
             self.create_default_json()
-        try:
-            with open(self.json_path, "r") as file:
-                return json.load(file)
-        except (FileNotFoundError, json.JSONDecodeError):
+            created = True
+        with open(self.json_path, "r") as file:
+            return json.load(file), created
+
+    def set_osint_tools(self, result):
+        self.osint_tools, created = result
+        self.apply_tool_settings()
+        if self.tool_combo is not None:
+            self.tool_combo["values"] = [tool["name"] for tool in self.osint_tools]
+        if created:
+            messagebox.showinfo("Info", f"Default JSON created at '{self.json_path}'.")
+
+    def apply_tool_settings(self):
+        """Apply the optional cache TTLs (``cache_ttl`` / ``negative_cache_ttl``) and
+        rate limits (``rate_limit`` / ``max_retries``) of each tool."""
+        if self.cache is not None:
+            for tool in self.osint_tools:
+                self.cache.configure(tool["name"], tool.get("cache_ttl"), tool.get("negative_cache_ttl"))
+        if self.scheduler is not None:
+            self.scheduler.configure(self.osint_tools)
+
+    def on_load_error(self, error):
+        if isinstance(error, (FileNotFoundError, json.JSONDecodeError)):
             messagebox.showerror("Error", f"Error loading '{self.json_path}'. Resetting to default.")
-            self.create_default_json()
-            return self.load_osint_tools()
+            self.executor.submit(self.reset_osint_tools, on_done=self.set_osint_tools, on_error=self.on_load_error)
+        else:
+            messagebox.showerror("Error", f"Failed to create default JSON: {error}")
+
+    def reset_osint_tools(self):
+        self.create_default_json()
+        return self.read_osint_tools()[0], True
 
     def create_default_json(self):
         """Create a default JSON file if it doesn't exist."""
         default_data = [
-            {"name": "VirusTotal", "generate_url": "https://www.virustotal.com/gui/search/"},
-            {"name": "AbuseIPDB", "generate_url": "https://www.abuseipdb.com/check/"},
+            {
+                "name": "VirusTotal",
+                "generate_url": "https://www.virustotal.com/gui/search/",
+                "urls": {
+                    "ip": "https://www.virustotal.com/gui/ip-address/{0}",
+                    "domain": "https://www.virustotal.com/gui/domain/{0}",
+                    "url": "https://www.virustotal.com/gui/search/{0}",
+                    "hash": "https://www.virustotal.com/gui/file/{0}",
+                },
+            },
+            {
+                "name": "AbuseIPDB",
+                "generate_url": "https://www.abuseipdb.com/check/",
+                "urls": {"ip": "https://www.abuseipdb.com/check/{0}", "domain": "https://www.abuseipdb.com/check/{0}"},
+                "kinds": ["ip"],
+                "parser": "abuseipdb",
+                "concurrency": 2,
+                "timeout": 15,
+            },
         ]
-        try:
-            with open(self.json_path, "w") as file:
-                json.dump(default_data, file, indent=4)
-            messagebox.showinfo("Info", f"Default JSON created at '{self.json_path}'.")
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to create default JSON: {e}")
+        with open(self.json_path, "w") as file:
+            json.dump(default_data, file, indent=4)
 
     def build(self):
         frame = ttk.LabelFrame(self.parent, text="OSINT Tools")
@@ -61,13 +133,14 @@ class OSINTModule:
 
         # Combobox y entradas
         ttk.Label(frame, text="Select Tool:").grid(row=0, column=0, sticky="w", padx=5, pady=2)
-        ttk.Combobox(
+        self.tool_combo = ttk.Combobox(
             frame,
             textvariable=self.osint_var,
             values=[tool["name"] for tool in self.osint_tools],
             state="readonly",
             width=30
-        ).grid(row=0, column=1, sticky="ew", padx=5, pady=2)
+        )
+        self.tool_combo.grid(row=0, column=1, sticky="ew", padx=5, pady=2)
 
         ttk.Label(frame, text="Parameter:").grid(row=1, column=0, sticky="w", padx=5, pady=2)
         ttk.Entry(frame, textvariable=self.param_var, width=30).grid(row=1, column=1, sticky="ew", padx=5, pady=2)
@@ -78,10 +151,20 @@ class OSINTModule:
         button_frame.columnconfigure(0, weight=1)
         button_frame.columnconfigure(1, weight=1)
         button_frame.columnconfigure(2, weight=1)
+        button_frame.columnconfigure(3, weight=1)
 
         ttk.Button(button_frame, text="Search", command=self.search_tool).grid(row=0, column=0, padx=5, pady=5, sticky="ew")
         ttk.Button(button_frame, text="Manage", command=self.manage_osint_tools).grid(row=0, column=1, padx=5, pady=5, sticky="ew")
         ttk.Button(button_frame, text="ISP Info", command=self.fetch_isp_info).grid(row=0, column=2, padx=5, pady=5, sticky="ew")
+        ttk.Button(button_frame, text="Cache", command=self.show_cache_stats).grid(row=0, column=3, padx=5, pady=5, sticky="ew")
+        ttk.Button(button_frame, text="Open All", command=self.open_all_tools).grid(row=1, column=0, padx=5, pady=(0, 5), sticky="ew")
+        ttk.Button(button_frame, text="Bulk Enrich", command=self.bulk_enrich).grid(row=1, column=1, padx=5, pady=(0, 5), sticky="ew")
+        ttk.Button(button_frame, text="Offline ISP", command=self.offline_isp_info).grid(row=1, column=2, padx=5, pady=(0, 5), sticky="ew")
+        ttk.Button(button_frame, text="IP Ranges", command=self.import_ip_ranges).grid(row=1, column=3, padx=5, pady=(0, 5), sticky="ew")
+        self.status_label = ttk.Label(frame, text="")
+        self.status_label.grid(row=3, column=0, columnspan=2, sticky="w", padx=5)
+
+        self.load_osint_tools()
 
     def search_tool(self):
         """Perform a search using the selected OSINT tool."""
@@ -101,7 +184,35 @@ class OSINTModule:
             messagebox.showerror("Error", f"Tool '{selected_tool}' not found.")
             return
 
-        webbrowser.open(tool["generate_url"] + param)
+        # El tipo del indicador elige la URL de la herramienta (IP, dominio, hash...)
+        kind, value = classify_indicator(param) or (None, param)
+        webbrowser.open(build_url(tool, value, kind))
+
+    def open_all_tools(self):
+        """Open every tool that has a URL for the parameter's indicator kind, a few tabs at a time."""
+        param = self.param_var.get().strip()
+        if not param:
+            messagebox.showwarning("Warning", "Please enter a parameter.")
+            return
+        classified = classify_indicator(param)
+        if not classified:
+            messagebox.showwarning("Warning", f"'{param}' is not a recognized indicator (IP, domain, URL, hash...).")
+            return
+        kind, value = classified
+        tools = relevant_tools(self.osint_tools, kind)
+        label = KIND_LABELS.get(kind, kind)
+        if not tools:
+            messagebox.showinfo("Open All", f'No tool has a URL for {label} indicators. Add one under "urls" in osint.json.')
+            return
+        if len(tools) > CONFIRM_TABS and not messagebox.askyesno(
+            "Open All", f"Open {len(tools)} tabs for {label} {value}?"
+        ):
+            return
+        self.launcher.launch([build_url(tool, value, kind) for tool in tools], on_progress=self.show_launch_progress)
+
+    def show_launch_progress(self, opened, remaining):
+        if self.status_label is not None:
+            self.status_label.config(text=f"Opening tabs... {remaining} left" if remaining else "")
 
     def manage_osint_tools(self):
         """Open a manager to add, edit, and delete OSINT tools."""
@@ -138,7 +249,8 @@ class OSINTModule:
             url = tk.simpledialog.askstring("Edit Tool", "Edit tool URL:", initialvalue=selected_tool["generate_url"])
 
             if name and url:
-                self.osint_tools[selected_index[0]] = {"name": name, "generate_url": url}
+                # Se conservan las demás claves (kinds, parser, límites...)
+                self.osint_tools[selected_index[0]] = dict(selected_tool, name=name, generate_url=url)
                 tools_listbox.delete(selected_index)
                 tools_listbox.insert(selected_index, name)
                 self.save_tools()
@@ -165,52 +277,216 @@ class OSINTModule:
         ttk.Button(button_frame, text="Close", command=manager_window.destroy).pack(side="right", padx=5)
 
     def save_tools(self):
-        """Save the updated tools list to the JSON file."""
-        try:
-            with open(self.json_path, "w") as file:
-                json.dump(self.osint_tools, file, indent=4)
-            messagebox.showinfo("Success", "Changes saved successfully.")
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to save changes: {e}")
+        """Save the updated tools list to the JSON file in the background."""
+        if self.tool_combo is not None:
+            self.tool_combo["values"] = [tool["name"] for tool in self.osint_tools]
+        self.apply_tool_settings()
+        self.executor.submit(
+            self.write_tools,
+            list(self.osint_tools),
+            serial=True,
+            on_done=lambda result: messagebox.showinfo("Success", "Changes saved successfully."),
+            on_error=lambda e: messagebox.showerror("Error", f"Failed to save changes: {e}"),
+        )
+
+    def write_tools(self, tools):
+        with open(self.json_path, "w") as file:
+            json.dump(tools, file, indent=4)
 
     def fetch_isp_info(self):
-        """Fetch ISP information from AbuseIPDB using CURL and display results."""
+        """Fetch ISP information from AbuseIPDB and display results."""
         param = self.param_var.get().strip()
         if not param:
             messagebox.showwarning("Input Required", "Please enter an IP address.")
             return
 
-        try:
-            curl_command = ["curl", f"https://www.abuseipdb.com/check/{param}"]
-            output = subprocess.check_output(curl_command, stderr=subprocess.STDOUT).decode("utf-8")
-            info = self.parse_abuseipdb_data(output)
+        def show_info(result):
+            info, age = result
+            cached = f" (cached {format_age(age)} ago)" if age is not None else ""
             if not info:
-                messagebox.showinfo("No Data", f"No relevant data found for IP: {param}")
+                messagebox.showinfo("No Data", f"No relevant data found for IP: {param}{cached}")
                 return
-            self.show_results_popup(param, info)
-        except subprocess.CalledProcessError as e:
-            messagebox.showerror("Error", f"Failed to fetch data for IP: {param}\n{e.output.decode('utf-8')}")
+            self.show_results_popup(param + cached, info)
+
+        def show_error(error):
+            messagebox.showerror("Error", f"Failed to fetch data for IP: {param}\n{error}")
+
+        # La consulta corre en el pool de E/S; la interfaz sigue respondiendo mientras tanto
+        self.executor.submit(self.lookup_isp_info, param, on_done=show_info, on_error=show_error)
+
+    def lookup_isp_info(self, param):
+        """Worker: ``(info, age)`` for ``param``, from the cache or from AbuseIPDB (``age`` None if fetched)."""
+        if self.cache is None:
+            return self.download_isp_info(param), None
+        return self.cache.lookup(ISP_PROVIDER, param, self.download_isp_info)
+
+    def download_isp_info(self, param):
+        """Worker: stream the AbuseIPDB page for ``param``, stopping once its info table is parsed.
+
+        With a scheduler the request goes ahead of queued bulk lookups but
+        still within the provider's rate limit.
+        """
+        tool = next((tool for tool in self.osint_tools if tool["name"] == ISP_PROVIDER), None)
+        tool = dict(tool or {"name": ISP_PROVIDER, "generate_url": ISP_URL}, parser="abuseipdb")
+        kind, param = classify_indicator(param) or (None, param)
+        if self.scheduler is None:
+            return fetch_parsed(self.http, tool, param, kind)
+        future = self.scheduler.submit(
+            tool["name"], build_url(tool, param, kind), lambda: fetch_parsed(self.http, tool, param, kind), INTERACTIVE
+        )
+        return future.result()
+
+    def show_cache_stats(self):
+        """Show the enrichment cache hit rates and offer to clear it."""
+        if self.cache is None:
+            messagebox.showinfo("Cache", "Lookup cache is disabled.")
+            return
+
+        def show(stats):
+            lines = [f"Entries: {stats['entries']}", f"Hit rate (this session): {stats['hit_rate']:.0%}", ""]
+            for provider, counters in sorted(stats["providers"].items()):
+                lines.append(
+                    f"{provider}: {counters['entries']} cached ({counters['negative_entries']} without data), "
+                    f"{counters['hits'] + counters['negative_hits']} hits / {counters['misses']} misses"
+                )
+            if messagebox.askyesno("Lookup Cache", "\n".join(lines) + "\n\nClear the cache?"):
+                self.executor.submit(
+                    self.cache.invalidate,
+                    serial=True,
+                    on_error=lambda e: messagebox.showerror("Error", f"Failed to clear the cache: {e}"),
+                )
+
+        self.executor.submit(
+            self.cache.stats,
+            on_done=show,
+            on_error=lambda e: messagebox.showerror("Error", f"Failed to read cache stats: {e}"),
+        )
+
+    def offline_isp_info(self):
+        """Look up ASN, organization and country in the local IP range database.
+
+        With a parameter only that IP is looked up; with an empty one, every
+        IP address of the current ticket in one batch.
+        """
+        if not self.ip_ranges_path:
+            messagebox.showerror("Error", "The offline IP range database is not configured.")
+            return
+        if not os.path.exists(self.ip_ranges_path):
+            if messagebox.askyesno("Offline ISP", "No IP range database has been imported yet.\n\nImport one from a CSV file now?"):
+                self.import_ip_ranges()
+            return
+        param = self.param_var.get().strip()
+        if param:
+            kind, param = classify_indicator(param) or (None, param)
+            if kind not in ("ipv4", "ipv6"):
+                messagebox.showwarning("Input Required", "Please enter an IP address.")
+                return
+
+            def show_info(result):
+                if not result:
+                    messagebox.showinfo("No Data", f"IP {param} is not in the offline database.")
+                    return
+                self.show_results_popup(param + " (offline)", format_result(result))
+
+            self.executor.submit(self.lookup_ip_ranges, param, on_done=show_info, on_error=self.on_ip_ranges_error)
+            return
+
+        if not (self.editor_module and self.editor_module.editor_box):
+            messagebox.showwarning("Input Required", "Please enter an IP address.")
+            return
+        ips = [value for kind, value in ticket_indicators(self.editor_module.get_ticket_text()) if kind in ("ipv4", "ipv6")]
+        if not ips:
+            messagebox.showinfo("Offline ISP", "No IP addresses found in the current ticket.")
+            return
+
+        def show_batch(results):
+            info = {}
+            for ip in ips:
+                result = results.get(ip)
+                info[ip] = f"AS{result['asn']} {result['org']} ({result['country'] or 'N/A'})" if result else "Not found"
+            self.show_results_popup(f"{len(ips)} IPs (offline)", info)
+
+        self.executor.submit(self.lookup_ip_ranges_many, ips, on_done=show_batch, on_error=self.on_ip_ranges_error)
+
+    def open_ip_ranges(self):
+        """Worker (lock held): the memory-mapped database, opened on first use."""
+        if self.ip_ranges is None:
+            self.ip_ranges = IPRangeDB(self.ip_ranges_path)
+        return self.ip_ranges
+
+    def lookup_ip_ranges(self, ip):
+        with self.ip_ranges_lock:
+            return self.open_ip_ranges().lookup(ip)
+
+    def lookup_ip_ranges_many(self, ips):
+        with self.ip_ranges_lock:
+            return self.open_ip_ranges().lookup_many(ips)
+
+    def on_ip_ranges_error(self, error):
+        messagebox.showerror("Error", f"Offline lookup failed: {error}")
+
+    def import_ip_ranges(self):
+        """Build the offline database from an IP range CSV (start/end or CIDR, ASN, organization, country)."""
+        if not self.ip_ranges_path:
+            messagebox.showerror("Error", "The offline IP range database is not configured.")
+            return
+        csv_path = filedialog.askopenfilename(
+            title="Import IP Ranges", filetypes=[("IP range files", "*.csv *.tsv *.txt"), ("All files", "*.*")]
+        )
+        if not csv_path:
+            return
+
+        def done(summary):
+            self.status_label.config(text="")
+            messagebox.showinfo(
+                "IP Ranges",
+                f"Imported {summary['ipv4_ranges']} IPv4 and {summary['ipv6_ranges']} IPv6 ranges "
+                f"({summary['records']} networks) in {summary['seconds']:.1f} s.",
+            )
+
+        def failed(error):
+            self.status_label.config(text="")
+            messagebox.showerror("Error", f"Failed to import IP ranges: {error}")
+
+        self.status_label.config(text="Importing IP ranges...")
+        self.executor.submit(self.rebuild_ip_ranges, csv_path, serial=True, on_done=done, on_error=failed)
+
+    def rebuild_ip_ranges(self, csv_path):
+        """Worker: import ``csv_path`` over the database file.
+
+        The open database is closed first: Windows cannot replace a file that
+        is still memory-mapped. Lookups wait for the import and then open the
+        new file.
+        """
+        with self.ip_ranges_lock:
+            if self.ip_ranges is not None:
+                self.ip_ranges.close()
+                self.ip_ranges = None
+            return import_csv(csv_path, self.ip_ranges_path)
 
     def parse_abuseipdb_data(self, html):
         """Parse HTML data to extract ISP and related information."""
-        patterns = {
-            "ISP": r"<th>ISP<\/th>\s*<td>\s*(.*?)\s*<\/td>",
-            "Usage Type": r"<th>Usage Type<\/th>\s*<td>\s*(.*?)\s*<\/td>",
-            "ASN": r"<th>ASN<\/th>\s*<td>\s*(.*?)\s*<\/td>",
-            "Domain Name": r"<th>Domain Name<\/th>\s*<td>\s*(.*?)\s*<\/td>",
-            "Country": r"<th>Country<\/th>\s*<td>\s*(.*?)\s*<\/td>",
-            "City": r"<th>City<\/th>\s*<td>\s*(.*?)\s*<\/td>",
-        }
-
-        parsed_data = {}
-        for key, pattern in patterns.items():
-            match = re.search(pattern, html, re.IGNORECASE | re.DOTALL)
-            parsed_data[key] = match.group(1).strip() if match else "N/A"
-
-        if all(value == "N/A" for value in parsed_data.values()):
-            return None
-
-        return parsed_data
+        return parse_abuseipdb(html)
+
+    def bulk_enrich(self):
+        """Look up every indicator of the current ticket on all providers that declare ``kinds``."""
+        if not (self.editor_module and self.editor_module.editor_box):
+            messagebox.showerror("Error", "Editor module is not properly configured.")
+            return
+        indicators = ticket_indicators(self.editor_module.get_ticket_text())
+        if not indicators:
+            messagebox.showinfo("Bulk Enrichment", "No indicators found in the current ticket.")
+            return
+        tools = bulk_providers(self.osint_tools)
+        if not tools:
+            messagebox.showinfo(
+                "Bulk Enrichment",
+                'No tool supports bulk lookups. Add a "kinds" list (e.g. ["ip", "domain"]) to its entry in osint.json.',
+            )
+            return
+        BulkEnrichmentWindow(
+            self.parent, indicators, tools, self.executor, self.cache, self.editor_module, self.scheduler, self.http
+        )
 
     def show_results_popup(self, param, info):
         """Display the parsed information in a popup."""
@@ -3,20 +3,24 @@ from tkinter import ttk, messagebox
 import json
 import uuid
 from datetime import datetime
+from functions.event_bus import CollectionChanged
+from functions.snapshot_cache import thaw
+from modules.live_search import LiveSearch
 
 
 class QueriesModule:
-    def __init__(self, parent, row_start, col_start, col_span, row_span, data_manager, queries_path="data/queries.json"):
+    def __init__(self, parent, row_start, col_start, col_span, row_span, data_manager, executor):
         self.parent = parent
         self.row_start = row_start
         self.col_start = col_start
         self.col_span = col_span
         self.row_span = row_span
         self.data_manager = data_manager
-        self.queries_path = queries_path
+        self.executor = executor
         self.search_var = tk.StringVar()
 
         self.queries = []
+        self.filtered_queries = []
         self.sort_order = {}
 
     def build(self):
@@ -42,6 +46,8 @@ class QueriesModule:
         ttk.Button(search_frame, text="Search", command=self.update_queries_list).pack(side="left", padx=5)
         ttk.Button(search_frame, text="Add Query", command=self.new_query).pack(side="left", padx=5)
         ttk.Button(search_frame, text="Delete Query", command=self.delete_query).pack(side="left", padx=5)
+        # Filtrado en vivo mientras se escribe
+        self.live_search = LiveSearch(frame, self.search_var, self.match_queries, self.show_search_results, on_error=self.on_search_error)
 
         columns = ("name", "platform", "category", "objective", "timestamp")
         self.queries_tree = ttk.Treeview(frame, columns=columns, show="headings", height=8)
@@ -58,36 +64,60 @@ class QueriesModule:
         self.queries_tree.grid(row=1, column=0, sticky="nsew", padx=5, pady=5)
         self.queries_tree.bind("<Double-1>", self.on_query_double_click)
 
+        self.load_queries()
+        self.filtered_queries = list(self.queries)
+        self.render_queries_list()
+        self.data_manager.events.subscribe(CollectionChanged, self.on_queries_changed)
+
+    def on_queries_changed(self, event):
+        # Los guardados propios ya están en memoria; solo se recargan cambios de otros módulos
+        if event.source is self or event.collection != "queries":
+            return
         self.load_queries()
         self.update_queries_list()
 
     def load_queries(self):
         try:
-            with open(self.queries_path, "r", encoding="utf-8") as file:
-                self.queries = json.load(file)
+            self.queries = thaw(self.data_manager.get_queries())
         except (FileNotFoundError, json.JSONDecodeError):
             self.queries = []
 
     def update_queries_list(self):
+        """Re-run the current filter (in the background) and refresh the list."""
+        self.live_search.refresh()
+
+    def match_queries(self, search_text, candidates, cancelled):
+        """Worker-thread filter over ``candidates`` (previous results) or all queries."""
+        search_text = search_text.lower()
+        matches = []
+        for position, query_data in enumerate(list(self.queries if candidates is None else candidates)):
+            if position % 500 == 0 and cancelled():
+                return None
+            if any(search_text in str(value).lower() for value in query_data.values()):
+                matches.append(query_data)
+        return matches
+
+    def on_search_error(self, search_text, error):
+        messagebox.showerror("Error", f"Failed to search queries: {error}")
+
+    def show_search_results(self, search_text, results):
+        self.filtered_queries = results
+        self.render_queries_list()
+
+    def render_queries_list(self):
         self.queries_tree.delete(*self.queries_tree.get_children())
-        query = self.search_var.get().lower()
-
-        for query_data in self.queries:
-            if any(
-                query in str(value).lower()
-                for value in query_data.values()
-            ):
-                self.queries_tree.insert(
-                    "",
-                    "end",
-                    values=(
-                        query_data.get("name", ""),
-                        query_data.get("platform", ""),
-                        query_data.get("category", ""),
-                        query_data.get("objective", ""),
-                        query_data.get("timestamp", ""),
-                    ),
-                )
+        for query_data in self.filtered_queries:
+            self.queries_tree.insert(
+                "",
+                "end",
+                values=(
+                    query_data.get("name", ""),
+                    query_data.get("platform", ""),
+                    query_data.get("category", ""),
+                    query_data.get("objective", ""),
+                    query_data.get("timestamp", ""),
+                ),
+            )
 
     def sort_by_column(self, col):
         if col not in self.sort_order:
@@ -129,9 +159,8 @@ class QueriesModule:
             return
 
         self.queries = [query for query in self.queries if query.get("name") != query_name]
-        self.save_queries()
+        self.save_queries(f"Query '{query_name}' deleted successfully!")
         self.update_queries_list()
-        messagebox.showinfo("Success", f"Query '{query_name}' deleted successfully!")
 
     def on_query_double_click(self, event):
         selected_item = self.queries_tree.selection()
@@ -213,11 +242,18 @@ class QueriesModule:
         if is_new:
             self.queries.append(query)
 
-        self.save_queries()
+        self.save_queries("Query saved successfully!")
         self.update_queries_list()
-        messagebox.showinfo("Success", "Query saved successfully!")
         editor_window.destroy()
 
-    def save_queries(self):
-        with open(self.queries_path, "w", encoding="utf-8") as file:
-            json.dump(self.queries, file, indent=4)
+    def save_queries(self, success_message=None):
+        # Se guarda una copia en segundo plano; el aviso se muestra al terminar
+        self.executor.submit(
+            self.data_manager._save_json,
+            self.data_manager.files["queries"],
+            [dict(query) for query in self.queries],
+            source=self,
+            serial=True,
+            on_done=lambda result: success_message and messagebox.showinfo("Success", success_message),
+            on_error=lambda e: messagebox.showerror("Error", f"Failed to save queries: {e}"),
+        )
@@ -0,0 +1,50 @@
+import webbrowser
+
+BATCH_SIZE = 4
+INTERVAL_MS = 1500
+
+
+class TabLauncher:
+    """Opens browser tabs a few at a time instead of all at once.
+
+    ``launch`` queues URLs; every ``interval_ms`` the next ``batch_size`` are
+    opened from a Tk ``after`` callback, so the browser (and the UI) are not
+    flooded by dozens of ``webbrowser`` calls in the same instant. URLs
+    already queued are not queued twice.
+    """
+
+    def __init__(self, widget, batch_size=BATCH_SIZE, interval_ms=INTERVAL_MS, open_url=webbrowser.open_new_tab):
+        self.widget = widget
+        self.batch_size = batch_size
+        self.interval_ms = interval_ms
+        self.open_url = open_url
+        self.queue = []
+        self.after_id = None
+        self.on_progress = None
+
+    def launch(self, urls, on_progress=None):
+        """Queue ``urls``; ``on_progress(opened, remaining)`` is called after each batch."""
+        if on_progress is not None:
+            self.on_progress = on_progress
+        self.queue.extend(url for url in dict.fromkeys(urls) if url not in self.queue)
+        if self.after_id is None:
+            self._open_batch()
+
+    def _open_batch(self):
+        self.after_id = None
+        batch, self.queue = self.queue[:self.batch_size], self.queue[self.batch_size:]
+        for url in batch:
+            self.open_url(url)
+        if self.on_progress:
+            self.on_progress(len(batch), len(self.queue))
+        if self.queue:
+            self.after_id = self.widget.after(self.interval_ms, self._open_batch)
+
+    def pending(self):
+        return len(self.queue)
+
+    def cancel(self):
+        if self.after_id is not None:
+            self.widget.after_cancel(self.after_id)
+            self.after_id = None
+        self.queue.clear()
@@ -0,0 +1,82 @@
+class TextChangeTracker:
+    """Line-level change notifications for a ``tk.Text`` widget.
+
+    The widget's Tcl command is wrapped by a proxy that records every
+    ``insert``/``delete``/``replace`` as a line splice ``(start, old_count,
+    new_count)`` (0-based lines). ``<<Modified>>`` is bound once; when it fires
+    the pending splices are handed to every listener as ``listener(splices)``
+    and the modified flag is cleared so the next edit fires it again.
+    ``splices`` is None when the change could not be tracked (undo/redo), and
+    listeners should then re-read the whole text.
+    """
+
+    def __init__(self, text):
+        self.text = text
+        self.listeners = []
+        self.pending = []
+        self.resync = False
+        self._original = text._w + "_original"
+        text.tk.call("rename", text._w, self._original)
+        text.tk.createcommand(text._w, self._proxy)
+        text.bind("<<Modified>>", self._on_modified, add="+")
+
+    def add_listener(self, callback):
+        self.listeners.append(callback)
+
+    def remove_listener(self, callback):
+        if callback in self.listeners:
+            self.listeners.remove(callback)
+
+    # Líneas del documento
+    def line_count(self):
+        return int(self._call("index", "end-1c").split(".")[0])
+
+    def get_lines(self, start, end):
+        """Text of lines [start, end) (0-based) as a list of strings."""
+        return self._call("get", f"{start + 1}.0", f"{end}.0 lineend").split("\n")
+
+    # Proxy del comando Tcl del widget
+    def _call(self, *args):
+        return self.text.tk.call((self._original,) + args)
+
+    def _line(self, index):
+        # "end" apunta a una línea más allá del último carácter editable
+        if self.text.tk.getboolean(self._call("compare", index, ">", "end-1c")):
+            index = "end-1c"
+        return int(self._call("index", index).split(".")[0]) - 1
+
+    def _proxy(self, command, *args):
+        if command == "insert" and args:
+            start = self._line(args[0])
+            added = sum(chunk.count("\n") for chunk in args[1::2])
+            result = self._call(command, *args)
+            self.pending.append((start, 1, 1 + added))
+            return result
+        if command == "delete" and 1 <= len(args) <= 2:
+            start = self._line(args[0])
+            # Sin segundo índice se borra un carácter, que puede ser el salto de línea
+            end = self._line(args[1] if len(args) > 1 else f"{args[0]}+1c")
+            result = self._call(command, *args)
+            self.pending.append((start, end - start + 1, 1))
+            return result
+        if command == "replace" and len(args) >= 3:
+            start = self._line(args[0])
+            end = self._line(args[1])
+            added = sum(chunk.count("\n") for chunk in args[2::2])
+            result = self._call(command, *args)
+            self.pending.append((start, end - start + 1, 1 + added))
+            return result
+        if command in ("insert", "delete", "replace") or (command == "edit" and args and args[0] in ("undo", "redo")):
+            # Formas poco comunes y deshacer/rehacer (Tk lo aplica internamente): se relee todo
+            self.resync = True
+        return self._call(command, *args)
+
+    def _on_modified(self, event=None):
+        if not self.text.tk.getboolean(self._call("edit", "modified")):
+            return
+        splices = None if self.resync else self.pending
+        self.pending = []
+        self.resync = False
+        for callback in list(self.listeners):
+            callback(splices)
+        self._call("edit", "modified", 0)
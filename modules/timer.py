@@ -98,6 +98,33 @@ class TimerModule:
             return self.format_time(total_time)
         return self.format_time(self.time_worked_seconds)
 
+    def get_state(self):
+        """
+        Estado serializable del timer (para el journal de recuperación).
+        """
+        total = self.time_worked_seconds
+        if self.timer_running:
+            total += time.time() - self.start_time
+        return {
+            "seconds": int(total),
+            "running": self.timer_running,
+            "start_chile": self.start_time_chile,
+            "start_canada": self.start_time_canada,
+        }
+
+    def restore_state(self, state):
+        """
+        Restaura un estado guardado; el timer queda en pausa hasta que se pulse Start.
+        """
+        self.reset_timer()
+        self.time_worked_seconds = state.get("seconds", 0)
+        self.paused_time = self.time_worked_seconds
+        self.start_time_chile = state.get("start_chile")
+        self.start_time_canada = state.get("start_canada")
+        self.timer_var.set(self.format_time(self.time_worked_seconds))
+        if self.start_time_chile:
+            self.timestamp_var.set(f"Chile: {self.start_time_chile} | Canada: {self.start_time_canada}")
+
     def format_time(self, total_seconds):
         hours, remainder = divmod(int(total_seconds), 3600)
         minutes, seconds = divmod(remainder, 60)
@@ -0,0 +1,214 @@
+from tkinter import ttk
+
+
+class VirtualTreeview:
+    """ttk.Treeview that only materializes the visible window of rows.
+
+    The full result set lives in ``self.rows`` (any Python objects); only the rows
+    on screen plus ``overscan`` rows above and below exist as Tk items. Scrolling
+    re-renders that small window, so the cost of ``set_rows`` and of every scroll
+    step does not depend on how many rows there are.
+    """
+
+    def __init__(self, master, columns, row_values, row_iid, height=8, overscan=10):
+        self.row_values = row_values
+        self.row_iid = row_iid
+        self.overscan = overscan
+        self.rows = []
+        self.first = 0
+        self.visible = height
+        self.rendered = {}
+        # iid de cada fila y su posición; se arman al primer uso tras set_rows
+        self.iids = None
+        self.positions = {}
+
+        self.frame = ttk.Frame(master)
+        self.frame.columnconfigure(0, weight=1)
+        self.frame.rowconfigure(0, weight=1)
+        self.tree = ttk.Treeview(self.frame, columns=columns, show="headings", height=height)
+        self.tree.grid(row=0, column=0, sticky="nsew")
+        self.scrollbar = ttk.Scrollbar(self.frame, orient="vertical", command=self._on_scrollbar)
+        self.scrollbar.grid(row=0, column=1, sticky="ns")
+
+        self.tree.bind("<Configure>", self._on_configure)
+        self.tree.bind("<MouseWheel>", self._on_mousewheel)
+        self.tree.bind("<Button-4>", lambda e: self._scroll_units(-3))
+        self.tree.bind("<Button-5>", lambda e: self._scroll_units(3))
+        self.tree.bind("<Up>", lambda e: self._move_selection(-1))
+        self.tree.bind("<Down>", lambda e: self._move_selection(1))
+        self.tree.bind("<Prior>", lambda e: self._move_selection(-self.visible))
+        self.tree.bind("<Next>", lambda e: self._move_selection(self.visible))
+
+    def grid(self, **kwargs):
+        self.frame.grid(**kwargs)
+
+    # Datos
+    def set_rows(self, rows, keep_position=False):
+        """Replace the result set. With ``keep_position`` the scroll offset is kept."""
+        self.rows = rows
+        self.iids = None
+        self.positions = {}
+        if not keep_position:
+            self.first = 0
+        self._render()
+
+    def upsert_row(self, row, old_iid=None, sort_key=None, reverse=False):
+        """Replace the row whose iid is ``old_iid`` (or the row's own) or add it.
+
+        With ``sort_key`` the row goes to its sorted position (binary search);
+        otherwise it keeps its place, or is appended if new. Only the visible
+        window is re-rendered.
+        """
+        old_iid = old_iid or self.row_iid(row)
+        index = self._index_of(old_iid)
+        if sort_key is None and index is not None:
+            self.rows[index] = row
+            iid = self.row_iid(row)
+            if iid != old_iid:
+                del self.positions[old_iid]
+                self.iids[index] = iid
+                self.positions[iid] = index
+        else:
+            if index is not None:
+                self._delete(index)
+            self._insert(self._sorted_position(row, sort_key, reverse) if sort_key else len(self.rows), row)
+        self._render()
+
+    def remove_row(self, iid):
+        index = self._index_of(iid)
+        if index is not None:
+            self._delete(index)
+            self.first = max(0, min(self.first, len(self.rows) - self.visible))
+            self._render()
+
+    def _index_of(self, iid):
+        if self.iids is None:
+            self.iids = [self.row_iid(row) for row in self.rows]
+            self.positions = {}
+            for index, row_iid in enumerate(self.iids):
+                self.positions.setdefault(row_iid, index)
+        return self.positions.get(iid)
+
+    def _insert(self, index, row):
+        self.rows.insert(index, row)
+        if self.iids is not None:
+            self.iids.insert(index, self.row_iid(row))
+            self._reindex(index)
+
+    def _delete(self, index):
+        del self.rows[index]
+        if self.iids is not None:
+            self.positions.pop(self.iids.pop(index), None)
+            self._reindex(index)
+
+    def _reindex(self, start):
+        # Solo se corren las posiciones de las filas que están detrás
+        positions = self.positions
+        for index in range(start, len(self.iids)):
+            positions[self.iids[index]] = index
+
+    def _sorted_position(self, row, sort_key, reverse):
+        value = sort_key(row)
+        low, high = 0, len(self.rows)
+        while low < high:
+            middle = (low + high) // 2
+            current = sort_key(self.rows[middle])
+            if (current >= value) if reverse else (current <= value):
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def row_for_iid(self, iid):
+        index = self.rendered.get(iid)
+        return self.rows[index] if index is not None else None
+
+    # Posición de scroll
+    def get_scroll_position(self):
+        """Index of the first visible row."""
+        return self.first
+
+    def set_scroll_position(self, index):
+        self.first = max(0, min(index, max(0, len(self.rows) - self.visible)))
+        self._render()
+
+    def scroll_to_iid(self, iid):
+        """Bring the row with ``iid`` into view."""
+        index = self._index_of(iid)
+        if index is None:
+            return False
+        if not self.first <= index < self.first + self.visible:
+            self.set_scroll_position(index - self.visible // 2)
+        return True
+
+    # Render de la ventana visible
+    def _render(self):
+        selection = set(self.tree.selection())
+        self.tree.delete(*self.tree.get_children())
+        self.rendered = {}
+
+        start = max(0, self.first - self.overscan)
+        end = min(len(self.rows), self.first + self.visible + self.overscan)
+        for index in range(start, end):
+            row = self.rows[index]
+            iid = self.row_iid(row)
+            if iid in self.rendered:
+                continue
+            self.rendered[iid] = index
+            self.tree.insert("", "end", iid=iid, values=self.row_values(row))
+
+        reselect = [iid for iid in selection if iid in self.rendered]
+        if reselect:
+            self.tree.selection_set(reselect)
+        self.tree.yview_moveto(0)
+        self.tree.yview_scroll(self.first - start, "units")
+        self._update_scrollbar()
+
+    def _update_scrollbar(self):
+        total = len(self.rows)
+        if not total:
+            self.scrollbar.set(0.0, 1.0)
+            return
+        self.scrollbar.set(self.first / total, min(1.0, (self.first + self.visible) / total))
+
+    # Eventos
+    def _on_configure(self, event):
+        rowheight = ttk.Style().lookup("Treeview", "rowheight") or 20
+        visible = max(1, (event.height - 25) // int(rowheight))
+        if visible != self.visible:
+            self.visible = visible
+            self._render()
+
+    def _on_scrollbar(self, action, amount, unit=None):
+        if action == "moveto":
+            self.set_scroll_position(int(float(amount) * len(self.rows)))
+        elif unit == "pages":
+            self._scroll_units(int(amount) * self.visible)
+        else:
+            self._scroll_units(int(amount))
+
+    def _on_mousewheel(self, event):
+        self._scroll_units(-3 if event.delta > 0 else 3)
+        return "break"
+
+    def _scroll_units(self, units):
+        self.set_scroll_position(self.first + units)
+        return "break"
+
+    def _move_selection(self, step):
+        if not self.rows:
+            return "break"
+        selection = self.tree.selection()
+        index = self.first
+        if selection and selection[0] in self.rendered:
+            index = self.rendered[selection[0]] + step
+        index = max(0, min(index, len(self.rows) - 1))
+        if index < self.first:
+            self.set_scroll_position(index)
+        elif index >= self.first + self.visible:
+            self.set_scroll_position(index - self.visible + 1)
+        iid = self.row_iid(self.rows[index])
+        if iid in self.rendered:
+            self.tree.selection_set(iid)
+            self.tree.focus(iid)
+        return "break"
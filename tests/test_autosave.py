@@ -0,0 +1,53 @@
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from functions.recovery_journal import RecoveryJournal  # noqa: E402
+from modules.autosave import AutosaveManager  # noqa: E402
+from modules.editor import LARGE_PASTE_CHARS  # noqa: E402
+
+
+class RestoreTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def crashed_session(self, text, timer):
+        journal = RecoveryJournal(self.directory)
+        journal.record(text[: len(text) // 2], None)
+        journal.record(text, timer)
+        # Cierre abrupto: el journal y su lock quedan en disco (con el PID de otro proceso)
+        journal.close(discard=False)
+        path = os.path.join(self.directory, "session-20250101-000000-1.jsonl")
+        os.replace(journal.path, path)
+        os.replace(journal.path + ".lock", path + ".lock")
+        return path
+
+    def test_large_restore_is_journaled_before_leftovers_are_deleted(self):
+        text = "\n".join(f"line {i} 10.0.0.{i % 256}" for i in range(LARGE_PASTE_CHARS // 10))
+        self.assertGreater(len(text), LARGE_PASTE_CHARS)
+        leftover = self.crashed_session(text, {"elapsed": 42})
+
+        manager = AutosaveManager(None, None, None, None, directory=self.directory)
+        recovered, paths = manager.read_leftovers(RecoveryJournal.leftover_sessions(self.directory))
+        self.assertEqual(paths, [leftover])
+        self.assertTrue(os.path.exists(leftover))
+
+        manager.adopt_recovered(recovered[0], recovered[1], paths)
+        self.assertFalse(os.path.exists(leftover))
+        restored, timer, saved_at = RecoveryJournal.recover(manager.journal.path)
+        self.assertEqual(restored, text)
+        self.assertEqual(timer, {"elapsed": 42})
+        manager.journal.close()
+
+    def test_live_session_is_not_a_leftover(self):
+        live = RecoveryJournal(self.directory)
+        live.record("still typing", None)
+        self.assertEqual(RecoveryJournal.leftover_sessions(self.directory), [])
+        live.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,25 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from functions.ioc_extractor import extract_iocs  # noqa: E402
+
+
+class IPv6Test(unittest.TestCase):
+    def test_addresses(self):
+        text = "fe80::1 2001:db8::/32 ::1 2001:db8:0:0:0:0:0:1"
+        self.assertEqual(extract_iocs(text), {"ipv6": ["fe80::1", "2001:db8::/32", "::1", "2001:db8::1"]})
+
+    def test_scope_operators_are_not_addresses(self):
+        for text in ("std::vector<int> values;", "a::b", "Foo::Bar::baz", "call ::add(x)", "see :: below"):
+            with self.subTest(text=text):
+                self.assertNotIn("ipv6", extract_iocs(text))
+
+    def test_mapped_ipv4_keeps_the_ipv4(self):
+        self.assertEqual(extract_iocs("::ffff:10.0.0.1"), {"ipv4": ["10.0.0.1"]})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,51 @@
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from functions.ip_ranges import IPRangeDB, import_csv  # noqa: E402
+
+CSV = """network,asn,org,country
+10.0.0.0/8,64500,Outer Org,US
+10.1.0.0/16,64501,Inner Org,DE
+192.0.2.0/24,64502,Doc Org,NL
+2001:db8::/32,64503,V6 Outer,FR
+2001:db8:1::/48,64504,V6 Inner,FR
+"""
+
+
+class AllocationTest(unittest.TestCase):
+    def setUp(self):
+        folder = tempfile.mkdtemp()
+        csv_path = os.path.join(folder, "ranges.csv")
+        with open(csv_path, "w", encoding="utf-8") as file:
+            file.write(CSV)
+        import_csv(csv_path, os.path.join(folder, "ip_ranges.bin"))
+        self.db = IPRangeDB(os.path.join(folder, "ip_ranges.bin"))
+
+    def tearDown(self):
+        self.db.close()
+
+    def test_split_allocation_reports_the_original_network(self):
+        # 10.0.0.0/8 queda partido en dos tramos por el /16 anidado
+        for ip in ("10.0.0.1", "10.200.0.1"):
+            with self.subTest(ip=ip):
+                self.assertEqual(self.db.lookup(ip)["network"], "10.0.0.0/8")
+        self.assertEqual(self.db.lookup("10.1.2.3")["network"], "10.1.0.0/16")
+        self.assertEqual(self.db.lookup("2001:db8:2::1")["network"], "2001:db8::/32")
+        self.assertEqual(self.db.lookup("2001:db8:1::1")["org"], "V6 Inner")
+
+    def test_batch_matches_single_lookups(self):
+        ips = ["10.0.0.1", "10.1.0.1", "10.255.255.255", "192.0.2.9", "8.8.8.8", "not an ip", "2001:db8:1::5"]
+        batch = self.db.lookup_many(ips)
+        for ip in ips[:5] + ips[6:]:
+            with self.subTest(ip=ip):
+                self.assertEqual(batch[ip], self.db.lookup(ip))
+        self.assertIsNone(batch["not an ip"])
+        self.assertIsNone(batch["8.8.8.8"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from functions.data_manager import DataManager  # noqa: E402
+
+
+def ticket(number, content):
+    return {"ticket_number": number, "client": "ACME", "tuc": "TUC1", "content": content}
+
+
+class TicketRevisionsTest(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp() + os.sep
+        self.data_manager = DataManager(self.folder, backend="json")
+
+    def tearDown(self):
+        self.data_manager.close()
+
+    def reopen(self):
+        self.data_manager.close()
+        self.data_manager = DataManager(self.folder, backend="json")
+
+    def contents(self, number):
+        data_manager = self.data_manager
+        return [data_manager.get_ticket_revision(number, "ACME", entry["rev"])
+                for entry in data_manager.ticket_revisions(number, "ACME")]
+
+    def test_delete_then_add_same_key_starts_a_new_history(self):
+        self.data_manager.add_ticket(ticket("100", "old body"))
+        self.data_manager.update_ticket(ticket("100", "old body, edited"))
+        self.data_manager.delete_ticket("100", "ACME")
+        self.assertEqual(self.data_manager.ticket_revisions("100", "ACME"), [])
+
+        self.data_manager.add_ticket(ticket("100", "new body"))
+        self.assertEqual(self.contents("100"), ["new body"])
+        self.reopen()
+        self.assertEqual(self.contents("100"), ["new body"])
+
+    def test_rename_moves_the_history(self):
+        self.data_manager.add_ticket(ticket("100", "first"))
+        self.data_manager.update_ticket(ticket("200", "second"), key=("100", "ACME"))
+        self.assertEqual(self.data_manager.ticket_revisions("100", "ACME"), [])
+        self.reopen()
+        self.assertEqual(self.contents("200"), ["first", "second"])
+
+    def test_rename_onto_an_existing_ticket_replaces_its_history(self):
+        self.data_manager.add_ticket(ticket("100", "kept"))
+        self.data_manager.add_ticket(ticket("200", "replaced"))
+        self.data_manager.update_ticket({"ticket_number": "200", "client": "ACME"}, key=("100", "ACME"))
+        self.reopen()
+        self.assertEqual(self.contents("200"), ["kept"])
+
+
+if __name__ == "__main__":
+    unittest.main()